@@ -1,24 +1,32 @@
 import cmd
 import logging
 import os
+import subprocess
 import sys
-import pandas as pd
-import texttable
 import json
 
-from src.logic.cli_schema_reverse_translate import SchemaReverseTranslate
-from src.utils.config import get_config_value
-from src.utils.file_utils import map_files, list_files, file_exists, pick_a_file, pick_an_option, update_file_extension, write_to_output
+from contextlib import redirect_stdout
+
+from src.utils.config import get_config_value, get_performance_config
+from src.utils.file_utils import determine_file_type, map_files, list_files, file_exists, pick_a_file, pick_an_option, is_output_current, open_output, update_file_extension, write_to_output
+from src.utils.gen_utils import get_error_filters, get_int_opt, get_jobs_opt, get_opt_value
+from src.utils.import_utils import STARTUP_MODULES, measure_import_time
+from src.utils.metrics import CommandMetrics, merge_spans, span, spans_as_dict
 from src.utils.time_utils import get_err_report_filename, get_now
-from src.logic.cli_data_validation import CliDataValidation, CliSchemaValidation
-from src.logic.cli_data_conversion import CliDataConversion
-from src.utils.consts import DATA_DIR_PATH, JADN_SCHEMA_FILE_EXT, OUTPUT_DIR_PATH, SCHEMAS_DIR_PATH, VALID_SCHEMA_FORMATS, VALID_REV_SCHEMA_FORMATS, VALID_SCHEMA_VIS_FORMATS, VALID_SCHEMA_VIS_OPTIONS, GV_FILE_EXT, PLANT_UML_FILE_EXT, COMPACT_CONST, CONCISE_CONST
-from src.logic.cli_schema_conversion import CliSchemaConversion
+from src.utils.consts import DATA_DIR_PATH, JADN_SCHEMA_FILE_EXT, JSON_FILE_EXT, JSONL_FILE_EXT, NDJSON_FILE_EXT, OUTPUT_DIR_PATH, SCHEMAS_DIR_PATH, STDIN_FILENAME, VERBOSE_CONST, VALID_DATA_FORMATS, VALID_SCHEMA_FORMATS, VALID_REV_SCHEMA_FORMATS, VALID_SCHEMA_VIS_FORMATS, VALID_SCHEMA_VIS_OPTIONS, GV_FILE_EXT, PLANT_UML_FILE_EXT, COMPACT_CONST, CONCISE_CONST, STREAM_PROGRESS_INTERVAL, INCREMENTAL_DATA_FORMATS
+from src.logic.schema_registry import get_schema_registry
+from src.logic.schema_disk_cache import get_schema_disk_cache
+from src.logic.artifact_cache import get_artifact_cache
+from src.logic.error_store import DEFAULT_ERROR_PAGE_SIZE, ERROR_COLUMNS, get_error_store
 
 class JadnCLI(cmd.Cmd):
     
     logging.basicConfig(filename='jadn_cli_errors.log', level=logging.ERROR, format='%(asctime)s - %(levelname)s - %(message)s', force=True)
     error_list = []
+    payload_stdout = None # Where --stdout results go, while the status messages go to stderr
+    profiling = False # Set by profile on and --profile, each command then runs under cProfile
+    profile_memory = False
+    profile_top = None
     
     def __init__(self):
         super().__init__()
@@ -33,19 +41,42 @@ class JadnCLI(cmd.Cmd):
         self.do_help("") 
         super().cmdloop(intro="")
 
+    def onecmd(self, line):
+        command, args, _ = self.parseline(line)
+        if not command or command == 'profile' or not hasattr(self, f'do_{command}'):
+            return super().onecmd(line)
+        return self.run_command(command, args or "", super().onecmd, line)
+
+    def run_command(self, command, args, func=None, *func_args):
+        'Run a command, under the profiler when profiling and recording its stage spans when metrics are on.'
+        if func is None:
+            func, func_args = getattr(self, f'do_{command}'), (args,)
+        metrics = CommandMetrics(command, args)
+        error_count = len(self.error_list)
+        with metrics:
+            try:
+                if self.profiling:
+                    return self._run_profiled(command, args, func, *func_args)
+                return func(*func_args)
+            finally:
+                metrics.errors = len(self.error_list) - error_count
+
     def do_exit(self, arg):
         'Exit the JADN CLI.'
         print('Thank you for using JADN. ')
         return True      
         
     def do_schema_v(self, args): 
-        'Validate a JADN Schema. \n\nFirst, load your schema into the schemas directory, \nnext run the command: \n\npython jadn_cli.py schema_v <schema_filename> [--output]'        
+        'Validate a JADN Schema. \n\nFirst, load your schema into the schemas directory, \nnext run the command: \n\npython jadn_cli.py schema_v <schema_filename or -> [--output] [--stdout]\n\nOptions:\n-: read the schema from stdin\n--output: print the validated schema\n--stdout: write the validated schema to stdout, messages go to stderr'        
         if isinstance(args, str):
             args = args.strip().split()
 
         j_schema = args[0] if len(args) > 0 else None
         opts = args[1:] if len(args) > 1 else []
         output = True if '--output' in opts else False
+        to_stdout = '--stdout' in opts
+        if to_stdout and self.payload_stdout is None:
+            return self._stdout_mode(self.do_schema_v, args)
 
         if not j_schema:
             list_files(SCHEMAS_DIR_PATH)
@@ -61,7 +92,7 @@ class JadnCLI(cmd.Cmd):
                 return
 
         if j_schema is not None:      
-            does_exist = file_exists(SCHEMAS_DIR_PATH, j_schema)
+            does_exist = j_schema == STDIN_FILENAME or file_exists(SCHEMAS_DIR_PATH, j_schema)
 
             if not does_exist:
                 print(f"Schema {j_schema} not found.")
@@ -72,24 +103,26 @@ class JadnCLI(cmd.Cmd):
             return
         
         try:
+            from src.logic.cli_schema_validation import CliSchemaValidation
             schema_validation = CliSchemaValidation(j_schema)
             is_valid = schema_validation.validate()
             
             if is_valid:
                 print(f'Schema {j_schema} is valid.')
                 if output:
-                    os.system('cat ' + os.path.join(OUTPUT_DIR_PATH, j_schema))
-                    print("\n")
+                    print(json.dumps(is_valid, indent=4))
+                if to_stdout:
+                    self._write_result(j_schema, json.dumps(is_valid, indent=4), to_stdout)
             else:
                 print(f'Schema {j_schema} is invalid.')
             
         except Exception as e:
             print(f'An error occurred while validating the schema: {e}')
             logging.error(f"An error occurred: {str(e)}", exc_info=True)
-            self.error_list.append({'timestamp': get_now(), 'error_type': type(e).__name__, 'err message': str(e)})
+            self._record_error('schema_v', type(e).__name__, str(e), schema=j_schema)
             
     def do_data_c(self, args):
-        'Convert JSON Verbose Data into JSON Compact or Concise Data.\n\npython jadn_cli.py data_c <schema_filename> <data_filename> [option]\n\nOptions:\n--compact: Convert to JSON Compact\n--concise: Convert to JSON Concise\n--output: Output resulting conversion to CLI.'
+        'Convert JSON Verbose Data into JSON Compact or Concise Data.\n\npython jadn_cli.py data_c <schema_filename or -> <data_filename or -> [option]\n\nOptions:\n-: read the schema or the data from stdin\n--compact: Convert to JSON Compact\n--concise: Convert to JSON Concise\n--output: Output resulting conversion to CLI.\n--pretty: indent the converted JSON (default = compact, no whitespace)\n--stdout: write the converted data to stdout instead of the output directory, messages go to stderr\n\nNDJSON / JSON Lines files (.ndjson, .jsonl) are converted one record per line, keeping their extension.'
         if isinstance(args, str):
             args = args.strip().split()
 
@@ -99,6 +132,12 @@ class JadnCLI(cmd.Cmd):
         compact = '--compact' in opts or '1' in opts
         concise = '--concise' in opts or '2' in opts
         output = True if '--output' in opts else False
+        pretty = '--pretty' in opts
+        to_stdout = '--stdout' in opts
+        if to_stdout and self.payload_stdout is None:
+            return self._stdout_mode(self.do_data_c, args)
+        if not self._check_stdin_args('data_c', schema_filename, data_filename):
+            return
 
         data_map = {}
 
@@ -139,23 +178,259 @@ class JadnCLI(cmd.Cmd):
             compact = option == COMPACT_CONST
             concise = option == CONCISE_CONST
 
+        compact_or_concise = COMPACT_CONST if compact else CONCISE_CONST
+        if determine_file_type(data_filename) in [NDJSON_FILE_EXT, JSONL_FILE_EXT]:
+            self._data_c_stream(schema_filename, data_filename, compact_or_concise, to_stdout)
+            return
+
         try:
-            compact_or_concise = COMPACT_CONST if compact else CONCISE_CONST
-            converter = CliDataConversion(schema_filename, data_filename, convert_to=compact_or_concise)
+            from src.logic.cli_data_conversion import CliDataConversion
+            converter = CliDataConversion(schema_filename, data_filename, convert_to=compact_or_concise, pretty=pretty)
             new_data = converter.convert()
             new_filename = update_file_extension(data_filename, 'json')
-            write_to_output(new_filename, new_data)
+            self._write_result(new_filename, new_data, to_stdout)
             print(f' - Data {data_filename} has been converted to {compact_or_concise} format.')
             if output:
-               os.system('cat ' + os.path.join(OUTPUT_DIR_PATH, new_filename))
-               print("\n")
+               print(new_data)
+        except Exception as e:
+            print(f' - An error occurred while converting the data: {e}')
+            logging.error(f"An error occurred: {str(e)}", exc_info=True)
+            self._record_error('data_c', type(e).__name__, str(e), schema=schema_filename, data_file=data_filename)
+
+    def _data_c_stream(self, schema_filename, data_filename, convert_to, to_stdout = False):
+        'Convert an NDJSON / JSON Lines file record by record, writing one converted record per line.'
+        try:
+            from src.logic.cli_data_conversion import CliDataConversion
+            from src.logic.cli_data_conversion_bulk import get_output_filename
+            converter = CliDataConversion(schema_filename, data_filename, convert_to=convert_to)
+            out = self.payload_stdout if to_stdout else open_output(get_output_filename(data_filename))
+            try:
+                for line_no, error in converter.convert_stream(out):
+                    print(f' - Line {line_no} could not be converted: {error}')
+            finally:
+                if not to_stdout:
+                    out.close()
+                    print(f" - Data written to {out.name}")
+
+            print(f' - Data {data_filename}: {converter.converted_count} records converted to {convert_to} format, {converter.failed_count} failed.')
+            if converter.failed_count:
+                self._record_error('data_c', 'ValueError', f'{data_filename}: {converter.failed_count} records could not be converted', schema=schema_filename, data_file=data_filename)
         except Exception as e:
             print(f' - An error occurred while converting the data: {e}')
             logging.error(f"An error occurred: {str(e)}", exc_info=True)
-            self.error_list.append({'timestamp': get_now(), 'error_type': type(e).__name__, 'err message': str(e)})
+            self._record_error('data_c', type(e).__name__, str(e), schema=schema_filename, data_file=data_filename)
+
+    def do_data_c_bulk(self, args):
+        'Convert all data files in the data directory into JSON Compact or Concise Data, in parallel. \n\npython jadn_cli.py data_c_bulk <schema_filename> [glob] <--compact or --concise> [--jobs N] [--pretty]\n\nOptions:\nglob: data files to convert, relative to the data directory (default = all json, ndjson and jsonl files)\n--compact: Convert to JSON Compact\n--concise: Convert to JSON Concise\n--jobs N: number of worker processes (default = number of cores)\n--pretty: indent the converted JSON files (default = compact, no whitespace)\n\nEach worker writes its files to the output directory, NDJSON / JSON Lines files are converted one record per line.'
+
+        if isinstance(args, str):
+            args = args.strip().split()
+
+        schema_filename = args[0] if len(args) > 0 else None
+        pattern = args[1] if len(args) > 1 and not args[1].startswith('--') else None
+        opts = args[2:] if pattern else args[1:]
+        compact = '--compact' in opts
+        concise = '--concise' in opts
+        pretty = '--pretty' in opts
+
+        use_prompts = get_config_value("use_prompts", True)
+        if not use_prompts:
+            if not schema_filename or (not compact and not concise):
+                print("Error: Commands missing. Use 'python jadn_cli.py data_c_bulk <schema_filename> [glob] <--compact or --concise> [--jobs N]'")
+                sys.exit(1)
+
+        if not schema_filename:
+            list_files(SCHEMAS_DIR_PATH)
+            schema_filename = pick_a_file(SCHEMAS_DIR_PATH, prompt="Enter a number or schema filename (or type 'exit' to cancel): ")
+
+            if schema_filename is None:
+                return
+        elif schema_filename.isdigit():
+            schema_map = map_files(SCHEMAS_DIR_PATH)
+            try:
+                schema_filename = schema_map[int(schema_filename)].split('/')[-1]
+            except:
+                print(f"Schema {schema_filename} not found.")
+                self.do_data_c_bulk(args = [])
+                return
+
+        if not compact and not concise:
+            option = pick_an_option([COMPACT_CONST, CONCISE_CONST], opts_title="Conversion Options:", prompt="Enter an option for the data conversion: ")
+            if option is None:
+                return
+            compact = option == COMPACT_CONST
+
+        try:
+            compact_or_concise = COMPACT_CONST if compact else CONCISE_CONST
+            from src.logic.cli_data_conversion_bulk import CliDataConversionBulk
+            bulk_conversion = CliDataConversionBulk(schema_filename, pattern, compact_or_concise, jobs=get_jobs_opt(opts), pretty=pretty)
+            results = bulk_conversion.convert()
+
+            for result in results:
+                if result['converted']:
+                    print(f" - Data {result['filename']} has been converted to {compact_or_concise} format: output/{result['output_filename']} ({result['records']} records)")
+                else:
+                    print(f" - Data {result['filename']} could not be converted: {result['error']}")
+                    self._record_error('data_c_bulk', result['error_type'], f"{result['filename']}: {result['error']}", schema=schema_filename, data_file=result['filename'])
+
+            summary = bulk_conversion.throughput(results)
+            print(f" - Converted {summary['files']} files ({summary['records']} records) with {schema_filename}: {summary['passed']} passed, {summary['failed']} failed.")
+            print(f" - {summary['seconds']}s, {summary['files_per_sec']} files/s, {summary['mb_per_sec']} MB/s")
+            self._print_spans(results)
+
+        except Exception as e:
+            print(f' - An error occurred while converting the data: {e}')
+            logging.error(f"An error occurred: {str(e)}", exc_info=True)
+            self._record_error('data_c_bulk', type(e).__name__, str(e), schema=schema_filename)
+
+    def do_data_t(self, args):
+        'Transcode data between the JADN verbose, compact and concise encodings, as JSON or CBOR. \n\npython jadn_cli.py data_t <schema_filename or -> <data_filename or -> --to <verbose, compact or concise> [--from <verbose, compact or concise>] [--cbor] [--root <type_name>] [--format F] [--stdout]\n\nOptions:\n--to E: encoding to convert to\n--from E: encoding of the data (default = verbose)\n--cbor: write CBOR instead of JSON\n--root R: root type of the data (default = the schema root it is an instance of)\n--format F: format of the data, json, cbor, ndjson, jsonl or cborseq (default = file extension, json for stdin)\n-: read the schema or the data from stdin\n--stdout: write the converted data to stdout instead of the output directory, messages go to stderr\n\nJSON and CBOR input are read by extension, NDJSON / JSON Lines files and CBOR Sequences are converted one record at a time into NDJSON or a CBOR Sequence.\nEach record is validated as verbose data, given or expanded from compact or concise data, before it is written, a record that is not valid is reported instead.\nThe input and output sizes, their ratio and the throughput are reported.'
+
+        if isinstance(args, str):
+            args = args.strip().split()
+
+        schema_filename = args[0] if len(args) > 0 else None
+        data_filename = args[1] if len(args) > 1 else None
+        opts = args[2:] if len(args) > 2 else []
+        convert_to = get_opt_value(opts, '--to')
+        convert_from = get_opt_value(opts, '--from')
+        root = get_opt_value(opts, '--root')
+        data_format = get_opt_value(opts, '--format')
+        to_cbor = '--cbor' in opts
+        to_stdout = '--stdout' in opts
+        if to_stdout and self.payload_stdout is None:
+            return self._stdout_mode(self.do_data_t, args)
+        if not self._check_stdin_args('data_t', schema_filename, data_filename):
+            return
+
+        use_prompts = get_config_value("use_prompts", True)
+        if not use_prompts:
+            if not schema_filename or not data_filename or not convert_to:
+                print("Error: Commands missing. Use 'python jadn_cli.py data_t <schema_filename> <data_filename> --to <verbose, compact or concise>'")
+                sys.exit(1)
+
+        if not schema_filename:
+            list_files(SCHEMAS_DIR_PATH)
+            schema_filename = pick_a_file(SCHEMAS_DIR_PATH, prompt="Enter a number or schema filename (or type 'exit' to cancel): ")
+        elif schema_filename.isdigit():
+            schema_map = map_files(SCHEMAS_DIR_PATH)
+            try:
+                schema_filename = schema_map[int(schema_filename)].split('/')[-1]
+            except:
+                print(f"Schema {schema_filename} not found.")
+                self.do_data_t(args = [])
+                return
+
+        if not data_filename:
+            list_files(DATA_DIR_PATH, is_jadn_only=False)
+            data_filename = pick_a_file(DATA_DIR_PATH, is_jadn_only=False, prompt="Enter a number or data filename (or type 'exit' to cancel): ")
+        elif data_filename.isdigit():
+            data_map = map_files(DATA_DIR_PATH, is_jadn_only=False)
+            try:
+                data_filename = data_map[int(data_filename)].split('/')[-1]
+            except:
+                print(f"Data {data_filename} not found.")
+                self.do_data_t(args = [])
+                return
+
+        if not convert_to:
+            convert_to = pick_an_option([VERBOSE_CONST, COMPACT_CONST, CONCISE_CONST], opts_title="Encodings:", prompt="Enter the encoding to convert to: ")
+            if convert_to is None:
+                return
+
+        try:
+            from src.logic.cli_data_transcode import CliDataTranscode
+            transcoder = CliDataTranscode(schema_filename, data_filename, convert_to, convert_from, to_cbor, data_format, root)
+            if to_stdout:
+                self.payload_stdout.flush()
+                out = self.payload_stdout.buffer
+            else:
+                out = open_output(transcoder.output_filename(), binary=True)
+            try:
+                for record_no, error in transcoder.transcode(out):
+                    print(f' - Record {record_no} could not be converted: {error}')
+            finally:
+                if not to_stdout:
+                    out.close()
+                    print(f" - Data written to {out.name}")
+                else:
+                    out.flush()
+
+            summary = transcoder.summary()
+            print(f" - Data {data_filename}: {summary['converted']} records converted from {transcoder.convert_from} {transcoder.data_format} to {convert_to} {transcoder.output_format()}, {summary['failed']} failed.")
+            ratio = f"ratio {summary['ratio']}" if summary['ratio'] is not None else "ratio n/a"
+            throughput = f", {summary['mb_per_sec']} MB/s" if summary['mb_per_sec'] is not None else ""
+            print(f" - {summary['bytes_in'] if summary['bytes_in'] is not None else '?'} bytes in, {summary['bytes_out']} bytes out ({ratio}), {summary['seconds']}s, {summary['records_per_sec']} records/s{throughput}")
+            if summary['failed']:
+                self._record_error('data_t', 'ValueError', f"{data_filename}: {summary['failed']} records could not be converted", schema=schema_filename, data_file=data_filename)
+        except Exception as e:
+            print(f' - An error occurred while transcoding the data: {e}')
+            logging.error(f"An error occurred: {str(e)}", exc_info=True)
+            self._record_error('data_t', type(e).__name__, str(e), schema=schema_filename, data_file=data_filename)
+
+    def do_data_gen(self, args):
+        'Generate synthetic data from a schema, for load testing. \n\npython jadn_cli.py data_gen <schema_filename or -> [root_type] [--count N] [--seed S] [--format F] [--invalid FRACTION] [--stdout]\n\nOptions:\nroot_type: type the records are instances of (default = the first schema root)\n--count N: number of records (default = 1)\n--seed S: seed of the generator, the same seed always gives the same records (default = random)\n--format F: json, ndjson, jsonl, cbor or cborseq (default = json)\n--invalid FRACTION: fraction of records, from 0 to 1, with one value broken so they fail validation (default = 0)\n-: read the schema from stdin\n--stdout: write the records to stdout instead of the output directory, messages go to stderr\n\nRecords are written as they are generated: more than one record is a JSON array or CBOR indefinite-length array, NDJSON / JSON Lines hold one record per line and a CBOR Sequence concatenates them.\nField cardinality, enumerations, choices, ArrayOf / MapOf bounds, numeric and length bounds, formats and patterns are honoured.'
+
+        if isinstance(args, str):
+            args = args.strip().split()
+
+        value_flags = ['--count', '--seed', '--format', '--invalid']
+        positional = [arg for idx, arg in enumerate(args) if not arg.startswith('--') and not (idx > 0 and args[idx - 1] in value_flags)]
+        schema_filename = positional[0] if len(positional) > 0 else None
+        root = positional[1] if len(positional) > 1 else None
+        data_format = get_opt_value(args, '--format')
+        to_stdout = '--stdout' in args
+        if to_stdout and self.payload_stdout is None:
+            return self._stdout_mode(self.do_data_gen, args)
+
+        use_prompts = get_config_value("use_prompts", True)
+        if not use_prompts:
+            if not schema_filename:
+                print("Error: Commands missing. Use 'python jadn_cli.py data_gen <schema_filename> [root_type] --count N'")
+                sys.exit(1)
+
+        if not schema_filename:
+            list_files(SCHEMAS_DIR_PATH)
+            schema_filename = pick_a_file(SCHEMAS_DIR_PATH, prompt="Enter a number or schema filename (or type 'exit' to cancel): ")
+        elif schema_filename.isdigit():
+            schema_map = map_files(SCHEMAS_DIR_PATH)
+            try:
+                schema_filename = schema_map[int(schema_filename)].split('/')[-1]
+            except:
+                print(f"Schema {schema_filename} not found.")
+                self.do_data_gen(args = [])
+                return
+
+        try:
+            from src.logic.cli_data_gen import CliDataGen
+            generator = CliDataGen(schema_filename, root, get_int_opt(args, '--count'), get_int_opt(args, '--seed'), data_format,
+                                   float(get_opt_value(args, '--invalid', 0)))
+            if to_stdout:
+                self.payload_stdout.flush()
+                out = self.payload_stdout.buffer
+            else:
+                out = open_output(generator.output_filename(), binary=True)
+            try:
+                for record_no in generator.generate(out):
+                    if record_no % STREAM_PROGRESS_INTERVAL == 0:
+                        print(f" - {record_no} of {generator.count} records generated...")
+            finally:
+                if not to_stdout:
+                    out.close()
+                    print(f" - Data written to {out.name}")
+                else:
+                    out.flush()
+
+            summary = generator.summary()
+            print(f" - Schema {schema_filename}: {summary['records']} {generator.root} records generated as {generator.data_format}, {summary['valid']} valid and {summary['invalid']} invalid.")
+            print(f" - {summary['bytes_out']} bytes, {summary['seconds']}s, {summary['records_per_sec']} records/s, {summary['mb_per_sec']} MB/s")
+        except Exception as e:
+            print(f' - An error occurred while generating the data: {e}')
+            logging.error(f"An error occurred: {str(e)}", exc_info=True)
+            self._record_error('data_gen', type(e).__name__, str(e), schema=schema_filename)
 
     def do_data_v(self, args):
-        'Validate data against a JADN schema. \n\nFirst, load your schema into the schemas directory, \nnext load your data file to the data directory, and \nthen, run the command: \n\npython jadn_cli.py data_v <schema_filename> <data_filename> [--output]'
+        'Validate data against a JADN schema. \n\nFirst, load your schema into the schemas directory, \nnext load your data file to the data directory, and \nthen, run the command: \n\npython jadn_cli.py data_v <schema_filename or -> <data_filename or -> [--output] [--root <type_name>] [--format F] [--stdout]\n\nThe data is checked against the schema roots it could be an instance of, pick one with --root.\nWith -, the schema or the data is read from stdin, give the data format with --format (default = json).\n--stdout writes the verdict to stdout as a JSON object, messages go to stderr.\nNDJSON / JSON Lines files (.ndjson, .jsonl) are validated one record per line, \nCBOR Sequences (.cborseq) one data item at a time \nand XML files one child element of the root at a time, with errors reported by line and column.'
         
         if isinstance(args, str):
             args = args.strip().split()
@@ -164,16 +439,21 @@ class JadnCLI(cmd.Cmd):
         data_filename = args[1] if len(args) > 1 else None
         opts = args[2:] if len(args) > 2 else []
         output = True if '--output' in opts else False
+        root = get_opt_value(opts, '--root')
+        data_format = get_opt_value(opts, '--format')
+        to_stdout = '--stdout' in opts
+        if to_stdout and self.payload_stdout is None:
+            return self._stdout_mode(self.do_data_v, args)
+        if not self._check_stdin_args('data_v', schema_filename, data_filename):
+            return
+        if data_format and data_format not in VALID_DATA_FORMATS:
+            print(f" - Invalid --format value: {data_format}. Expected any of {', '.join(VALID_DATA_FORMATS)}.")
+            self._record_error('data_v', 'ValueError', f"Invalid --format value: {data_format}", schema=schema_filename, data_file=data_filename)
+            return
 
         schema_map = {}
         data_map = {}
         
-        use_prompts = get_config_value("use_prompts", True)
-        if not use_prompts: 
-            if not schema_filename or not data_filename:
-                print("Error: Commands missing. Use 'python jadn_cli.py data_v <schema_file> <data_filename>'")
-                sys.exit(1)          
-        
         use_prompts = get_config_value("use_prompts", True)
         if not use_prompts: 
             if not schema_filename or not data_filename:
@@ -204,40 +484,142 @@ class JadnCLI(cmd.Cmd):
                 self.do_data_v(args = [])
                 return
             
+        if data_format is None:
+            data_format = JSON_FILE_EXT if data_filename == STDIN_FILENAME else determine_file_type(data_filename)
+
+        if data_format in INCREMENTAL_DATA_FORMATS:
+            self._data_v_stream(schema_filename, data_filename, root, data_format, to_stdout)
+            return
+
+        verdict = {'data': data_filename, 'schema': schema_filename, 'valid': False, 'root': None, 'error': None}
         try:
-            data_validation = CliDataValidation(schema_filename, data_filename)
+            from src.logic.cli_data_validation import CliDataValidation
+            data_validation = CliDataValidation(schema_filename, data_filename, root, data_format)
             is_valid = data_validation.validate()
             
             if is_valid:
-                print(f' - Data {data_filename} is valid.')
-                if output:
-                    os.system('cat ' + os.path.join(OUTPUT_DIR_PATH, data_filename))
-                    print("\n")
+                print(f' - Data {data_filename} is valid against root {data_validation.matched_root}.')
+                verdict.update(valid=True, root=data_validation.matched_root)
+                if output and isinstance(is_valid, str):
+                    print(is_valid)
             else:
                 print(f' - Data {data_filename} is invalid.')
             
         except Exception as e:
             print(f' - An error occurred while validating the data: {e}')
             logging.error(f"An error occurred: {str(e)}", exc_info=True)
-            self.error_list.append({'timestamp': get_now(), 'error_type': type(e).__name__, 'err message': str(e)})
+            self._record_error('data_v', type(e).__name__, str(e), schema=schema_filename, data_file=data_filename)
+            verdict['error'] = str(e)
+
+        if to_stdout:
+            self._write_result(data_filename, json.dumps(verdict), to_stdout)
+
+    def _data_v_stream(self, schema_filename, data_filename, root = None, data_format = None, to_stdout = False):
+        'Validate an NDJSON / JSON Lines file, CBOR Sequence or XML file record by record, reporting errors per record.'
+        verdict = {'data': data_filename, 'schema': schema_filename, 'valid': False, 'valid_records': 0, 'invalid_records': 0, 'error': None}
+        try:
+            from src.logic.cli_data_validation import CliDataValidation
+            data_validation = CliDataValidation(schema_filename, data_filename, root, data_format)
+            label = data_validation.record_label()
+            for record_no, is_valid, error in data_validation.validate_stream():
+                if not is_valid:
+                    print(f' - {data_validation.record_position(record_no)} is invalid: {error}')
+
+                record_count = data_validation.valid_count + data_validation.invalid_count
+                if record_count % STREAM_PROGRESS_INTERVAL == 0:
+                    print(f' - {record_count} {label}s checked: {data_validation.valid_count} valid, {data_validation.invalid_count} invalid')
+
+            print(f' - Data {data_filename}: {data_validation.valid_count} valid {label}s, {data_validation.invalid_count} invalid {label}s.')
+            verdict.update(valid=not data_validation.invalid_count, valid_records=data_validation.valid_count, invalid_records=data_validation.invalid_count)
+            if data_validation.invalid_count:
+                print(f' - Data {data_filename} is invalid.')
+                self._record_error('data_v', 'ValueError', f'{data_filename}: {data_validation.invalid_count} invalid {label}s', schema=schema_filename, data_file=data_filename)
+            else:
+                print(f' - Data {data_filename} is valid.')
+
+        except Exception as e:
+            print(f' - An error occurred while validating the data: {e}')
+            logging.error(f"An error occurred: {str(e)}", exc_info=True)
+            self._record_error('data_v', type(e).__name__, str(e), schema=schema_filename, data_file=data_filename)
+            verdict['error'] = str(e)
+
+        if to_stdout:
+            self._write_result(data_filename, json.dumps(verdict), to_stdout)
+
+    def do_data_v_bulk(self, args):
+        'Validate all data files in the data directory against a JADN schema, in parallel. \n\npython jadn_cli.py data_v_bulk <schema_filename> [glob] [--jobs N]\n\nOptions:\nglob: data files to validate, relative to the data directory (default = all json, ndjson, cbor, cborseq and xml files)\n--jobs N: number of worker processes (default = number of cores)'
+
+        if isinstance(args, str):
+            args = args.strip().split()
+
+        schema_filename = args[0] if len(args) > 0 else None
+        pattern = args[1] if len(args) > 1 and not args[1].startswith('--') else None
+        opts = args[2:] if pattern else args[1:]
+
+        use_prompts = get_config_value("use_prompts", True)
+        if not use_prompts:
+            if not schema_filename:
+                print("Error: Commands missing. Use 'python jadn_cli.py data_v_bulk <schema_filename> [glob] [--jobs N]'")
+                sys.exit(1)
+
+        if not schema_filename:
+            list_files(SCHEMAS_DIR_PATH)
+            schema_filename = pick_a_file(SCHEMAS_DIR_PATH, prompt="Enter a number or schema filename (or type 'exit' to cancel): ")
+
+            if schema_filename is None:
+                return
+        elif schema_filename.isdigit():
+            schema_map = map_files(SCHEMAS_DIR_PATH)
+            try:
+                schema_filename = schema_map[int(schema_filename)].split('/')[-1]
+            except:
+                print(f"Schema {schema_filename} not found.")
+                self.do_data_v_bulk(args = [])
+                return
+
+        try:
+            from src.logic.cli_data_validation_bulk import CliDataValidationBulk
+            bulk_validation = CliDataValidationBulk(schema_filename, pattern, jobs=get_jobs_opt(opts))
+            results = bulk_validation.validate()
+
+            for result in results:
+                if result['valid']:
+                    print(f" - Data {result['filename']} is valid.")
+                else:
+                    print(f" - Data {result['filename']} is invalid: {result['error']}")
+                    self._record_error('data_v_bulk', result['error_type'], f"{result['filename']}: {result['error']}", schema=schema_filename, data_file=result['filename'])
+
+            summary = bulk_validation.throughput(results)
+            print(f" - Validated {summary['files']} files against {schema_filename}: {summary['passed']} passed, {summary['failed']} failed.")
+            print(f" - {summary['seconds']}s, {summary['files_per_sec']} files/s, {summary['mb_per_sec']} MB/s")
+            self._print_spans(results)
+
+        except Exception as e:
+            print(f' - An error occurred while validating the data: {e}')
+            logging.error(f"An error occurred: {str(e)}", exc_info=True)
+            self._record_error('data_v_bulk', type(e).__name__, str(e), schema=schema_filename)
 
     def do_schema_t(self, args):
-        'Translate a JADN Schema to a JIDL, JSON Schema or an XSD. \n\nFirst, load your schema into the schemas directory, \nnext run the command: \n\npython jadn_cli.py schema_t <schema_filename> <jidl, json, or xsd>'
+        'Translate a JADN Schema to a JIDL, JSON Schema or an XSD. \n\nFirst, load your schema into the schemas directory, \nnext run the command: \n\npython jadn_cli.py schema_t <schema_filename or -> <jidl, json, or xsd> [--force] [--stdout]\n\nTo translate to several formats in one pass, give a comma separated list of formats, or all: \n\npython jadn_cli.py schema_t <schema_filename> <jidl,json,xsd,md,html,gv,puml or all> [--detail D] [--jobs N] [--force]\n\nOptions:\n--all: same as giving all as the format list\n--detail D: information, logical or conceptual, used by gv and puml (default = information)\n--jobs N: number of worker processes (default = number of cores)\n--force: rebuild the output even if a cached translation of the unchanged schema exists\n-: read the schema from stdin\n--stdout: write the translation of a single format to stdout instead of the output directory, messages go to stderr'
 
         if isinstance(args, str):
             args = args.strip().split()
 
+        to_stdout = '--stdout' in args
+        if to_stdout and self.payload_stdout is None:
+            return self._stdout_mode(self.do_schema_t, args)
+
+        force = '--force' in args
+        args = [arg for arg in args if arg not in ('--force', '--stdout')]
+
         schema_filename = args[0] if len(args) > 0 else None
-        convert_to = args[1] if len(args) > 1 else None
+        convert_to = args[1] if len(args) > 1 and not args[1].startswith('--') else None
+        opts = args[2:] if convert_to else args[1:]
+        if '--all' in opts:
+            convert_to = 'all'
 
         schema_map = {}
         
-        use_prompts = get_config_value("use_prompts", True)
-        if not use_prompts: 
-            if not schema_filename or not convert_to:
-                print("Error: Commands missing. Use 'python jadn_cli.py schema_t <schema_file> <convert_to>'")
-                sys.exit(1)            
-        
         use_prompts = get_config_value("use_prompts", True)
         if not use_prompts: 
             if not schema_filename or not convert_to:
@@ -258,6 +640,14 @@ class JadnCLI(cmd.Cmd):
                 print(f"Schema {schema_filename} not found.")
                 self.do_schema_t(args = [])
                 return
+
+        if convert_to == 'all' or (convert_to and ',' in convert_to):
+            if to_stdout:
+                print(" - --stdout takes a single format, the translations of several formats are written to the output directory.")
+                self._record_error('schema_t', 'ValueError', "--stdout takes a single format", schema=schema_filename)
+                return
+            self._schema_t_multi(schema_filename, convert_to, opts, force)
+            return
         
         if not convert_to:
             convert_to = pick_an_option(VALID_SCHEMA_FORMATS, opts_title="Schema Formats:", prompt="Enter a format to convert the schema to: ")
@@ -272,35 +662,40 @@ class JadnCLI(cmd.Cmd):
                 return
             
         try:
-            schema_conversion = CliSchemaConversion(schema_filename, convert_to)
+            from src.logic.cli_schema_conversion import CliSchemaConversion
+            schema_conversion = CliSchemaConversion(schema_filename, convert_to, force)
             schema_converted = schema_conversion.convert()
             
             if schema_converted:
-                print(f' - Schema {schema_filename} has been converted to {convert_to}.')
+                print(f' - Schema {schema_filename} has been converted to {convert_to}.{" (cached)" if schema_conversion.from_cache else ""}')
                 new_filename = update_file_extension(schema_filename, convert_to)
-                write_to_output(new_filename, schema_converted)
+                self._write_result(new_filename, schema_converted, to_stdout, schema_conversion.from_cache)
             else: 
                 print(f' - Schema {schema_filename} could not be converted to {convert_to}.')
             
         except Exception as e:
             print(f' - An error occurred while converting {schema_filename} to {convert_to}: {e}')
             logging.error(f"An error occurred: {str(e)}", exc_info=True)
-            self.error_list.append({'timestamp': get_now(), 'error_type': type(e).__name__, 'err message': str(e)})
+            self._record_error('schema_t', type(e).__name__, str(e), schema=schema_filename)
 
     def do_schema_t_bulk(self, args):
-        'Translate all JADN Schemas to JIDL, JSON Schemas or XSD. \n\nFirst, load your schemas into the schemas directory, \nnext run the command: \n\npython jadn_cli.py schema_t_bulk <jidl, json, or xsd>'
+        'Translate all JADN Schemas to JIDL, JSON Schemas or XSD, in parallel. \n\nFirst, load your schemas into the schemas directory, \nnext run the command: \n\npython jadn_cli.py schema_t_bulk <jidl, json, or xsd> [--jobs N] [--force]\n\nOptions:\n--jobs N: number of worker processes (default = number of cores)\n--force: rebuild every output even if a cached translation of the unchanged schema exists'
 
         if isinstance(args, str):
             args = args.strip().split()
 
-        convert_to = args[0] if len(args) > 0 else None
+        force = '--force' in args
+        args = [arg for arg in args if arg != '--force']
+
+        convert_to = args[0] if len(args) > 0 and not args[0].startswith('--') else None
+        opts = args[1:] if convert_to else args
 
         schema_map = {} 
 
         use_prompts = get_config_value("use_prompts", True)
         if not use_prompts: 
             if not convert_to:
-                print("Error: Commands missing. Use 'python jadn_cli.py schema_t_bulk <convert_to>'")
+                print("Error: Commands missing. Use 'python jadn_cli.py schema_t_bulk <convert_to> [--jobs N]'")
                 sys.exit(1)                    
         
         if not convert_to:
@@ -315,29 +710,35 @@ class JadnCLI(cmd.Cmd):
                 self.do_schema_t(args = [])
                 return
 
-        directory = SCHEMAS_DIR_PATH
-        extension = JADN_SCHEMA_FILE_EXT
+        try:
+            from src.logic.cli_schema_conversion_bulk import CliSchemaConversionBulk
+            bulk_conversion = CliSchemaConversionBulk(convert_to, jobs=get_jobs_opt(opts), force=force)
+            results = bulk_conversion.convert()
+        except Exception as e:
+            print(f' - An error occurred while converting schemas to {convert_to}: {e}')
+            logging.error(f"An error occurred: {str(e)}", exc_info=True)
+            self._record_error('schema_t_bulk', type(e).__name__, str(e))
+            return
 
-        for schema_filename in os.listdir(directory):
-            if schema_filename.endswith(extension):
-                try:
-                    schema_conversion = CliSchemaConversion(schema_filename, convert_to)
-                    schema_converted = schema_conversion.convert()
-                    
-                    if schema_converted:
-                        print(f' - Schema {schema_filename} has been converted to {convert_to}.')
-                        new_filename = update_file_extension(schema_filename, convert_to)
-                        write_to_output(new_filename, schema_converted)
-                    else: 
-                        print(f' - Schema {schema_filename} could not be converted to {convert_to}.')
-            
-                except Exception as e:
-                    print(f' - An error occurred while converting {schema_filename} to {convert_to}: {e}')
-                    logging.error(f"An error occurred: {str(e)}", exc_info=True)
-                    self.error_list.append({'timestamp': get_now(), 'error_type': type(e).__name__, 'err message': str(e)})
+        # Results come back in filename order, so output and errors are the same whatever the worker count
+        for result in results:
+            schema_filename = result['filename']
+            print(result['console'], end='')
+            if result['error']:
+                print(f" - An error occurred while converting {schema_filename} to {convert_to}: {result['error']}")
+                logging.error(f"An error occurred: {result['error']}")
+                self._record_error('schema_t_bulk', result['error_type'], result['error'], schema=schema_filename)
+            elif result['converted']:
+                timing = 'cached' if result['cached'] else f"{result['elapsed']:.3f}s"
+                print(f" - Schema {schema_filename} has been converted to {convert_to}. ({timing})")
+                self._write_artifact(result['output_filename'], result['converted'], result['cached'])
+            else: 
+                print(f' - Schema {schema_filename} could not be converted to {convert_to}.')
+
+        self._print_bulk_summary(results, bulk_conversion.elapsed, bulk_conversion.jobs)
                     
     def do_schema_rev_t(self, args):
-        'Reverse translate JIDL or JSON Schema into a JADN Schema. \n\nFirst, load your schema into the schemas directory, \nnext run the command: \n\npython jadn_cli.py schema_rev_t <schema_filename>'
+        'Reverse translate JIDL or JSON Schema into a JADN Schema. \n\nFirst, load your schema into the schemas directory, \nnext run the command: \n\npython jadn_cli.py schema_rev_t <schema_filename or -> [--format jidl|json] [--output] [--stdout]\n\nOptions:\n-: read the schema from stdin, give its format with --format (default = jidl)\n--output: print the JADN Schema\n--stdout: write the JADN Schema to stdout instead of the output directory, messages go to stderr'
 
         if isinstance(args, str):
             args = args.strip().split()
@@ -345,14 +746,12 @@ class JadnCLI(cmd.Cmd):
         filename = args[0] if len(args) > 0 else None
         opts = args[1:] if len(args) > 1 else []
         output = True if '--output' in opts else False
+        schema_format = get_opt_value(opts, '--format')
+        to_stdout = '--stdout' in opts
+        if to_stdout and self.payload_stdout is None:
+            return self._stdout_mode(self.do_schema_rev_t, args)
         schemas_map = {}
         
-        use_prompts = get_config_value("use_prompts", True)
-        if not use_prompts: 
-            if not filename:
-                print("Error: Commands missing. Use 'python jadn_cli.py schema_rev_t <schema_file>'")
-                sys.exit(1)          
-        
         use_prompts = get_config_value("use_prompts", True)
         if not use_prompts: 
             if not filename:
@@ -375,38 +774,39 @@ class JadnCLI(cmd.Cmd):
                 return
             
         try:
-            rev_translate = SchemaReverseTranslate(filename)
+            from src.logic.cli_schema_reverse_translate import SchemaReverseTranslate
+            rev_translate = SchemaReverseTranslate(filename, schema_format)
             file_translated = rev_translate.translate()
             
             if file_translated:
                 print(f'  - {filename} has been reverse translated into a JADN Schema.')
                 new_filename = update_file_extension(filename, JADN_SCHEMA_FILE_EXT)
-                write_to_output(new_filename, file_translated)
+                self._write_result(new_filename, file_translated, to_stdout)
                 if output:
-                    os.system('cat ' + os.path.join(OUTPUT_DIR_PATH, new_filename))
-                    print("\n")
+                    print(file_translated)
             else: 
                 print(f'  - {filename} could not be reverse translated into a JADN Schema.')
             
         except Exception as e:
             print(f'  - An error occurred while reverse translating {filename} to {JADN_SCHEMA_FILE_EXT}: {e}')
             logging.error(f"An error occurred: {str(e)}", exc_info=True)
-            self.error_list.append({'timestamp': get_now(), 'error_type': type(e).__name__, 'err message': str(e)})  
+            self._record_error('schema_rev_t', type(e).__name__, str(e), schema=filename)
 
     def do_schema_rev_t_bulk(self, args):
-        'Reverse translate all JIDL or JSON Schemas into a JADN Schema. \n\nFirst, load your schema into the data directory, \nnext run the command: \n\npython jadn_cli.py schema_rev_t <jidl, json>'
+        'Reverse translate all JIDL or JSON Schemas into a JADN Schema, in parallel. \n\nFirst, load your schema into the data directory, \nnext run the command: \n\npython jadn_cli.py schema_rev_t_bulk <jidl, json> [--jobs N]\n\nOptions:\n--jobs N: number of worker processes (default = number of cores)'
 
         if isinstance(args, str):
             args = args.strip().split()
 
-        convert_to = args[0] if len(args) > 0 else None
+        convert_to = args[0] if len(args) > 0 and not args[0].startswith('--') else None
+        opts = args[1:] if convert_to else args
 
         schema_map = {} 
 
         use_prompts = get_config_value("use_prompts", True)
         if not use_prompts: 
             if not convert_to:
-                print("Error: Commands missing. Use 'python jadn_cli.py schema_rev_t_bulk <convert_to>'")
+                print("Error: Commands missing. Use 'python jadn_cli.py schema_rev_t_bulk <convert_to> [--jobs N]'")
                 sys.exit(1)                    
         
         if not convert_to:
@@ -421,33 +821,136 @@ class JadnCLI(cmd.Cmd):
                 self.do_schema_t(args = [])
                 return
 
-        directory = SCHEMAS_DIR_PATH
-        extension = f'.{convert_to}'
+        try:
+            from src.logic.cli_schema_reverse_translate_bulk import SchemaReverseTranslateBulk
+            bulk_translate = SchemaReverseTranslateBulk(convert_to, jobs=get_jobs_opt(opts))
+            results = bulk_translate.translate()
+        except Exception as e:
+            print(f'  - An error occurred while reverse translating {convert_to} schemas: {e}')
+            logging.error(f"An error occurred: {str(e)}", exc_info=True)
+            self._record_error('schema_rev_t_bulk', type(e).__name__, str(e))
+            return
 
-        for schema_filename in os.listdir(directory):
-            if schema_filename.endswith(extension):
-                try:
-                    rev_translate = SchemaReverseTranslate(schema_filename)
-                    file_translated = rev_translate.translate()
-                    
-                    if file_translated:
-                        print(f'  - {schema_filename} has been reverse translated into a JADN Schema.')
-                        new_filename = update_file_extension(schema_filename, JADN_SCHEMA_FILE_EXT)
-                        write_to_output(new_filename, file_translated)
-                    else: 
-                        print(f'  - {schema_filename} could not be reverse translated into a JADN Schema.')
-
-                except Exception as e:
-                    print(f'  - An error occurred while reverse translating {schema_filename} to {JADN_SCHEMA_FILE_EXT}: {e}')
-                    logging.error(f"An error occurred: {str(e)}", exc_info=True)
-                    self.error_list.append({'timestamp': get_now(), 'error_type': type(e).__name__, 'err message': str(e)})       
+        for result in results:
+            schema_filename = result['filename']
+            print(result['console'], end='')
+            if result['error']:
+                print(f"  - An error occurred while reverse translating {schema_filename} to {JADN_SCHEMA_FILE_EXT}: {result['error']}")
+                logging.error(f"An error occurred: {result['error']}")
+                self._record_error('schema_rev_t_bulk', result['error_type'], result['error'], schema=result['filename'])
+            elif result['converted']:
+                print(f"  - {schema_filename} has been reverse translated into a JADN Schema. ({result['elapsed']:.3f}s)")
+                write_to_output(result['output_filename'], result['converted'])
+            else: 
+                print(f'  - {schema_filename} could not be reverse translated into a JADN Schema.')
+
+        self._print_bulk_summary(results, bulk_translate.elapsed, bulk_translate.jobs)
+
+    def _schema_t_multi(self, schema_filename, formats, opts, force):
+        'Translate one schema to several formats, loading and fixing it once.'
+        try:
+            from src.logic.cli_schema_conversion_multi import CliSchemaConversionMulti, parse_formats
+            multi_conversion = CliSchemaConversionMulti(schema_filename, parse_formats(formats), opt=get_opt_value(opts, '--detail'),
+                                                        jobs=get_jobs_opt(opts), force=force)
+            if multi_conversion.opt not in VALID_SCHEMA_VIS_OPTIONS:
+                raise ValueError(f"Invalid --detail value: {multi_conversion.opt}. Expected any of {', '.join(VALID_SCHEMA_VIS_OPTIONS)}.")
+            results = multi_conversion.convert()
+        except Exception as e:
+            print(f' - An error occurred while converting {schema_filename} to {formats}: {e}')
+            logging.error(f"An error occurred: {str(e)}", exc_info=True)
+            self._record_error('schema_t', type(e).__name__, str(e), schema=schema_filename)
+            return
+
+        for result in results:
+            convert_to = result['format']
+            print(result['console'], end='')
+            if result['error']:
+                print(f" - An error occurred while converting {schema_filename} to {convert_to}: {result['error']}")
+                logging.error(f"An error occurred: {result['error']}")
+                self._record_error('schema_t', result['error_type'], result['error'], schema=schema_filename)
+            elif result['converted']:
+                timing = 'cached' if result['cached'] else f"{result['elapsed']:.3f}s"
+                print(f" - Schema {schema_filename} has been converted to {convert_to}. ({timing})")
+                self._write_artifact(result['output_filename'], result['converted'], result['cached'])
+            else:
+                print(f' - Schema {schema_filename} could not be converted to {convert_to}.')
+
+        print(f" - Schema prepared once in {multi_conversion.load_elapsed:.3f}s")
+        self._print_bulk_summary(results, multi_conversion.elapsed, multi_conversion.jobs, label='formats')
+
+    def _stdout_mode(self, method, args):
+        'Run a command with its status messages on stderr, so stdout only carries the result.'
+        self.payload_stdout = sys.stdout
+        try:
+            with redirect_stdout(sys.stderr):
+                method(args)
+        finally:
+            self.payload_stdout = None
+
+    def _write_result(self, filename, data, to_stdout, from_cache=False):
+        'Stream a command result to stdout, or write it to the output directory.'
+        if not isinstance(data, str):
+            with span("serialization"):
+                data = json.dumps(data, indent=4)
+        if to_stdout:
+            with span("write_output"):
+                self.payload_stdout.write(data if data.endswith('\n') else data + '\n')
+                self.payload_stdout.flush()
+        else:
+            self._write_artifact(filename, data, from_cache)
+
+    def _check_stdin_args(self, command, *filenames):
+        'Only one argument can be read from stdin, returns False and records an error otherwise.'
+        if sum(1 for filename in filenames if filename == STDIN_FILENAME) > 1:
+            message = "Only one of the schema and data can be read from stdin ('-')."
+            print(f' - {message}')
+            self._record_error(command, 'ValueError', message)
+            return False
+        return True
+
+    def _record_error(self, command, error_type, message, schema=None, data_file=None):
+        'Add an error to the session list and the error store.'
+        timestamp = get_now()
+        self.error_list.append({'timestamp': timestamp, 'error_type': error_type, 'err message': message})
+        get_error_store().add(timestamp, command, error_type, message, schema=schema, data_file=data_file)
+
+    def _write_artifact(self, filename, data, from_cache):
+        'Write a converted schema to the output directory, skipping a cached translation the output already holds.'
+        if from_cache and is_output_current(filename, data):
+            print(f' - Output {filename} is up to date.')
+        else:
+            write_to_output(filename, data)
+
+    def _print_bulk_summary(self, results, elapsed, jobs, label='schemas'):
+        'Print the totals and wall clock timings of a bulk schema command.'
+        failed = sum(1 for result in results if result['error'] or not result['converted'])
+        cpu_seconds = sum(result['elapsed'] for result in results)
+        print(f" - {len(results)} {label}: {len(results) - failed} converted, {failed} failed.")
+        print(f" - {elapsed:.3f}s wall clock ({cpu_seconds:.3f}s summed over {label}) with {min(jobs, len(results)) or 1} worker(s)")
+        self._print_spans(results, label)
+
+    def _print_spans(self, results, label='files'):
+        'Print the stage spans of a bulk command summed over its results, when metrics are on.'
+        totals = {}
+        for result in results:
+            merge_spans(totals, result.get('spans'))
+        if totals:
+            stages = ", ".join(f"{stage} {value['seconds']:.3f}s ({value['count']}x)" for stage, value in spans_as_dict(totals).items())
+            print(f" - Stages summed over {label}: {stages}")
             
     def do_schema_vis(self, args):
-        'Convert a JADN Schema into a visual representation, such as MarkDown, HTML, GraphViz or PlantUML. \n\nFirst, load your schema into the schemas directory, \nnext, run the command: \n\npython jadn_cli.py schema_vis <schema_filename> <md, html, gv, or puml>'
+        'Convert a JADN Schema into a visual representation, such as MarkDown, HTML, GraphViz or PlantUML. \n\nFirst, load your schema into the schemas directory, \nnext, run the command: \n\npython jadn_cli.py schema_vis <schema_filename or -> <md, html, gv, or puml> [information, logical, conceptual] [--force] [--stdout]\n\nOptions:\n--force: rebuild the output even if a cached translation of the unchanged schema exists\n-: read the schema from stdin\n--stdout: write the result to stdout instead of the output directory, messages go to stderr'
 
         if isinstance(args, str):
             args = args.strip().split()
 
+        to_stdout = '--stdout' in args
+        if to_stdout and self.payload_stdout is None:
+            return self._stdout_mode(self.do_schema_vis, args)
+
+        force = '--force' in args
+        args = [arg for arg in args if arg not in ('--force', '--stdout')]
+
         schema_filename = args[0] if len(args) > 0 else None
         convert_to = args[1] if len(args) > 1 else None
         vis_opt = args[2] if len(args) > 2 else None
@@ -503,42 +1006,346 @@ class JadnCLI(cmd.Cmd):
             vis_opt = None
             
         try:
-            schema_conversion = CliSchemaConversion(schema_filename, convert_to)
+            from src.logic.cli_schema_conversion import CliSchemaConversion
+            schema_conversion = CliSchemaConversion(schema_filename, convert_to, force)
             schema_converted = schema_conversion.convert(vis_opt)
             
             if schema_converted:
-                print(f' - Schema {schema_filename} has been converted to {convert_to}.')
+                print(f' - Schema {schema_filename} has been converted to {convert_to}.{" (cached)" if schema_conversion.from_cache else ""}')
                 new_filename = update_file_extension(schema_filename, convert_to)
-                write_to_output(new_filename, schema_converted)
+                self._write_result(new_filename, schema_converted, to_stdout, schema_conversion.from_cache)
             else: 
                 print(f' - Schema {schema_filename} could not be converted to {convert_to}.')
             
         except Exception as e:
             print(f' - An error occurred while converting {schema_filename} to {convert_to}: {e}')
             logging.error(f"An error occurred: {str(e)}", exc_info=True)
-            self.error_list.append({'timestamp': get_now(), 'error_type': type(e).__name__, 'err message': str(e)})              
-            
-    def do_err_report_gen(self, arg):
-        'This command will generate a CSV file in the output directory with all errors logged during the session.'
-        if self.error_list:
-            df = pd.DataFrame(self.error_list)
-            filename = get_err_report_filename()
+            self._record_error('schema_vis', type(e).__name__, str(e), schema=schema_filename)
+
+    def do_watch(self, args):
+        'Watch the schemas and data directories and redo only the work a change affects, until Ctrl+C. \n\npython jadn_cli.py watch [--formats fmt,fmt|all] [--poll] [--once]\n\nA changed schema is validated, translated to the watch formats and the data files bound to it are revalidated.\nA changed data file is revalidated against the schemas it is bound to.\nFormats, bindings and the debounce delay are set in the [watch] section of config.toml.\n\nOptions:\n--formats: output formats to regenerate, overrides the config\n--poll: scan the directories instead of using inotify\n--once: process every schema once and exit'
+
+        if isinstance(args, str):
+            args = args.strip().split()
+
+        try:
+            from src.logic.cli_watch import CliWatch
+            watch = CliWatch(get_opt_value(args, '--formats'), use_polling='--poll' in args)
+        except Exception as e:
+            print(f' - An error occurred while starting the watch: {e}')
+            logging.error(f"An error occurred: {str(e)}", exc_info=True)
+            self._record_error('watch', type(e).__name__, str(e))
+            return
+
+        if '--once' in args:
+            from src.utils.dir_catalog import get_dir_catalog
+            schema_paths = get_dir_catalog(SCHEMAS_DIR_PATH).paths((JADN_SCHEMA_FILE_EXT,))
+            self._print_watch_results(watch.process(schema_paths))
+            return
+
+        watch.start()
+        print(f" - Watching {SCHEMAS_DIR_PATH} and {DATA_DIR_PATH} ({watch.mode}), formats: {', '.join(watch.formats) or 'none'}. Press Ctrl+C to stop.")
+        try:
+            while True:
+                self._print_watch_results(watch.next_changes())
+        except KeyboardInterrupt:
+            print("\n - Watch stopped.")
+        finally:
+            watch.stop()
+
+    def _print_watch_results(self, results):
+        'Print the outcome of a watch cycle, writing regenerated outputs and recording failures.'
+        for result in results:
+            action = result['action']
+            if not result['ok']:
+                print(f" - {action} {result['filename']} failed: {result['error']}")
+                data_file = result['filename'] if action == 'data_v' else None
+                self._record_error('watch', result['error_type'] or action, result['error'] or 'failed', schema=result['schema'], data_file=data_file)
+            elif action == 'schema_t':
+                timing = 'cached' if result['cached'] else f"{result['elapsed']:.3f}s"
+                print(f" - Schema {result['schema']} has been converted to {result['filename']}. ({timing})")
+                self._write_artifact(result['filename'], result['converted'], result['cached'])
+            elif action == 'schema_v':
+                print(f" - Schema {result['filename']} is valid. ({result['elapsed']:.3f}s)")
+            else:
+                print(f" - Data {result['filename']} is valid against {result['schema']}. ({result['elapsed']:.3f}s)")
+
+    def do_serve(self, args):
+        'Keep a warm process with the libraries loaded and the schemas parsed, serving requests until Ctrl+C. \n\npython jadn_cli.py serve [--host H] [--port N] [--socket PATH] [--verbose]\n\nWhile it runs, jadn_cli.py commands are forwarded to it (add --local to run one in its own process).\nRequests are JSON over HTTP: POST /validate, /convert, /translate and /command, GET /status.\nEvery request needs the X-Jadn-Token header, with the token the server writes to the token_file of the [serve] section (default .jadn_cache/serve.token).\nOnly schema_v, data_v, data_v_bulk, err_report_out, cache_stats and version are run by the server.\nThe address defaults to the [serve] section of config.toml.\n\nOptions:\n--host H / --port N: localhost TCP address to listen on\n--socket PATH: listen on a Unix socket instead\n--verbose: log every request'
+
+        if isinstance(args, str):
+            args = args.strip().split()
+
+        try:
+            from src.logic.cli_server import create_server
+            server = create_server(self, get_opt_value(args, '--host'), get_int_opt(args, '--port'),
+                                   get_opt_value(args, '--socket'), verbose='--verbose' in args)
+        except Exception as e:
+            print(f' - An error occurred while starting the server: {e}')
+            logging.error(f"An error occurred: {str(e)}", exc_info=True)
+            self._record_error('serve', type(e).__name__, str(e))
+            return
+
+        # Pay the library imports and schema parsing once, before the first request
+        import jadnvalidation
+        from src.logic import cli_data_conversion, cli_schema_conversion
+        from src.utils.dir_catalog import get_dir_catalog
+        registry = get_schema_registry()
+        for schema_filename in get_dir_catalog(SCHEMAS_DIR_PATH).files((JADN_SCHEMA_FILE_EXT,)):
+            try:
+                registry.validate(registry.load(SCHEMAS_DIR_PATH, schema_filename))
+            except Exception:
+                pass # Reported by the requests that use the schema
+
+        address = server.server_address if isinstance(server.server_address, str) else f"http://{server.server_address[0]}:{server.server_address[1]}"
+        print(f" - Serving on {address} with {registry.stats()['entries']} schemas loaded. Press Ctrl+C to stop.")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n - Server stopped.")
+        finally:
+            server.server_close()
+            if isinstance(server.server_address, str) and os.path.exists(server.server_address):
+                os.unlink(server.server_address)
+
+    def do_err_report_gen(self, args):
+        'Export logged errors to a CSV file in the output directory. \n\npython jadn_cli.py err_report_gen [filters] [--file filename]\n\nWith no filters, the errors logged today are exported to the daily report file, when this session logged any.\n\nFilters:\n--from D / --to D: first / last date or timestamp, e.g. 2025-01-31 or 2025-01-31T12:00:00\n--command C: command name, e.g. data_v\n--schema S: schema filename\n--data F: data filename\n--type T: error type, e.g. ValueError'
+        if isinstance(args, str):
+            args = args.strip().split()
+
+        try:
+            filters = get_error_filters(args)
+            if not filters:
+                if not self.error_list:
+                    return
+                filters = {'date_from': get_now('%Y-%m-%d')}
+
+            filename = get_opt_value(args, '--file', get_err_report_filename())
+            if os.path.basename(filename) != filename or filename in ('.', '..'):
+                raise ValueError(f"Invalid report filename: {filename}. Expected a filename, reports are written to {OUTPUT_DIR_PATH}.")
             filepath = os.path.join(OUTPUT_DIR_PATH, filename)
-            df.to_csv(filepath, index=False, mode='a', header=False)
-            print(f"Error report generated: {filepath}")
-        return
+            count = get_error_store().export_csv(filepath, **filters)
+            print(f"Error report generated: {filepath} ({count} errors)")
+
+        except Exception as e:
+            print(f' - An error occurred while generating the error report: {e}')
+            logging.error(f"An error occurred: {str(e)}", exc_info=True)
             
-    def do_err_report_out(self, arg):
-        'Display the error report generated by the last session.'
-        filename = get_err_report_filename()
-        filepath = os.path.join(OUTPUT_DIR_PATH, filename)
-        
-        if os.path.exists(filepath):
-            df = pd.read_csv(filepath)
-            print(df)
-        else:
-            print("No error report found.")
+    def do_err_report_out(self, args):
+        'Display logged errors, newest first, one page at a time. \n\npython jadn_cli.py err_report_out [filters] [--page N] [--page-size N]\n\nFilters:\n--from D / --to D: first / last date or timestamp, e.g. 2025-01-31 or 2025-01-31T12:00:00\n--command C: command name, e.g. data_v\n--schema S: schema filename\n--data F: data filename\n--type T: error type, e.g. ValueError\n\nOptions:\n--page N: page to show (default = 1)\n--page-size N: errors per page (default = 20)'
+        import texttable
+
+        if isinstance(args, str):
+            args = args.strip().split()
+
+        try:
+            filters = get_error_filters(args)
+            page = get_int_opt(args, '--page', 1)
+            page_size = get_int_opt(args, '--page-size', DEFAULT_ERROR_PAGE_SIZE)
+
+            error_store = get_error_store()
+            count = error_store.count(**filters)
+            if not count:
+                print("No error report found.")
+                return
+
+            table = texttable.Texttable(max_width=0)
+            table.set_cols_dtype(['t'] * len(ERROR_COLUMNS))
+            table.header(["Timestamp", "Command", "Schema", "Data File", "Error Type", "Message"])
+            for error in error_store.query(page, page_size, **filters):
+                table.add_row([error[column] or "" for column in ERROR_COLUMNS])
+            print(table.draw())
+            print(f" - Page {page} of {(count + page_size - 1) // page_size}, {count} errors.")
+
+        except Exception as e:
+            print(f' - An error occurred while reading the error report: {e}')
+            logging.error(f"An error occurred: {str(e)}", exc_info=True)
             
+    def do_cache_stats(self, arg):
+        'Show hit/miss counters and size of the in-process and on-disk schema caches and the translation artifact cache.'
+        import texttable
+        table = texttable.Texttable()
+        table.set_cols_dtype(['t', 't'])
+        table.header(["Schema Cache", "Value"])
+        for key, value in get_schema_registry().stats().items():
+            table.add_row([f"memory {key}", value])
+
+        disk_cache = get_schema_disk_cache()
+        if disk_cache:
+            for key, value in disk_cache.stats().items():
+                table.add_row([f"disk {key}", value])
+        else:
+            table.add_row(["disk", "disabled"])
+
+        artifact_cache = get_artifact_cache()
+        if artifact_cache:
+            for key, value in artifact_cache.stats().items():
+                table.add_row([f"artifacts {key}", value])
+        else:
+            table.add_row(["artifacts", "disabled"])
+        print(table.draw())
+
+    def do_config(self, arg):
+        'Show the performance settings in effect, after config.toml and any JADN_CLI_<KEY> environment overrides.'
+        import texttable
+
+        table = texttable.Texttable()
+        table.set_cols_dtype(['t', 't'])
+        table.header(["Performance Setting", "Value"])
+        for key, value in get_performance_config().as_dict().items():
+            table.add_row([key, "auto" if value is None else value])
+        print(table.draw())
+
+    def do_cache_clear(self, arg):
+        'Clear the in-process and on-disk schema caches and the translation artifact cache. \n\npython jadn_cli.py cache_clear [--stale]\n\nOptions:\n--stale: only remove stale or over-budget disk entries'
+        opts = arg.strip().split() if isinstance(arg, str) else arg
+        disk_cache = get_schema_disk_cache()
+        artifact_cache = get_artifact_cache()
+
+        if '--stale' in opts:
+            removed = disk_cache.prune() if disk_cache else 0
+            removed_artifacts = artifact_cache.prune() if artifact_cache else 0
+            print(f" - Removed {removed} stale schema cache entries and {removed_artifacts} artifacts.")
+            return
+
+        get_schema_registry().clear()
+        removed = disk_cache.clear() if disk_cache else 0
+        removed_artifacts = artifact_cache.clear() if artifact_cache else 0
+        print(f" - Schema cache cleared, removed {removed} disk entries and {removed_artifacts} artifacts.")
+
+    def do_profile(self, args):
+        'Profile the commands that follow, writing a .pstats file and a summary of the top functions by cumulative time per command. \n\nprofile [on, off or status] [--memory] [--top N]\n\nOptions:\n--memory: also trace memory allocations with tracemalloc, reporting the peak and the top allocation sites\n--top N: functions and allocation sites in the summary (default = 25)\n\nThe profiles are written to output/profiles as <command>_<timestamp>.pstats, readable with pstats or snakeviz, and <command>_<timestamp>.txt.\nOne-shot commands are profiled with python jadn_cli.py <command> ... --profile [--profile-memory] [--profile-top N].\nOnly the CLI process is profiled, not the worker processes of the bulk commands.'
+        from src.utils.profile_utils import DEFAULT_PROFILE_TOP
+
+        if isinstance(args, str):
+            args = args.strip().split()
+
+        action = args[0] if args and not args[0].startswith('--') else 'status'
+        try:
+            if action == 'on':
+                self.profiling = True
+                self.profile_memory = '--memory' in args
+                self.profile_top = get_int_opt(args, '--top', DEFAULT_PROFILE_TOP)
+            elif action == 'off':
+                self.profiling = False
+            elif action != 'status':
+                raise ValueError(f"Invalid profile option: {action}. Expected on, off or status.")
+        except ValueError as e:
+            print(f" - {e}")
+            self._record_error('profile', 'ValueError', str(e))
+            return
+
+        if self.profiling:
+            memory = ", with memory allocations" if self.profile_memory else ""
+            print(f" - Profiling is on{memory}, the top {self.profile_top} functions are summarized.")
+        else:
+            print(" - Profiling is off.")
+
+    def _run_profiled(self, command, args, func, *func_args):
+        'Run a command under the profiler, writing its stats and summary to the output directory.'
+        from src.utils.profile_utils import CommandProfiler
+        profiler = CommandProfiler(command, args, self.profile_top, self.profile_memory)
+        try:
+            with profiler:
+                return func(*func_args)
+        finally:
+            # On stderr, so the result of a --stdout command stays clean
+            print(f" - Profile of {command} written to {profiler.stats_path}, summary in {profiler.summary_path}", file=sys.stderr)
+
+    def do_startup(self, args):
+        'Benchmark start up, reporting the cold import time of the CLI and each library its commands load. \n\npython jadn_cli.py startup [module ...] [--runs N]\n\nOptions:\n--runs N: import each module N times in a fresh interpreter and keep the best (default = 3)'
+        import texttable
+
+        if isinstance(args, str):
+            args = args.strip().split()
+
+        modules = [arg for idx, arg in enumerate(args) if not arg.startswith('--') and not (idx > 0 and args[idx - 1] == '--runs')]
+
+        try:
+            runs = get_int_opt(args, '--runs', 3)
+
+            table = texttable.Texttable()
+            table.set_cols_dtype(['t', 't', 't'])
+            table.header(["Module", "Self (ms)", "Total (ms)"])
+            for module_name in modules or STARTUP_MODULES:
+                result = measure_import_time(module_name, runs)
+                if result['error']:
+                    table.add_row([module_name, "-", result['error']])
+                else:
+                    table.add_row([module_name, result['self_ms'], result['total_ms']])
+            print(table.draw())
+
+        except Exception as e:
+            print(f' - An error occurred while measuring start up: {e}')
+            logging.error(f"An error occurred: {str(e)}", exc_info=True)
+            self._record_error('startup', type(e).__name__, str(e))
+
+    def do_bench(self, args):
+        'Benchmark the commands on workloads of increasing size, reporting timings and peak memory as JSON. \n\npython jadn_cli.py bench [workload ...] [--cases C] [--runs N] [--records N] [--no-memory] [--save FILE] [--compare BASELINE] [--threshold PCT]\n\nWorkloads: music, oscal, synthetic-1k, synthetic-5k or all (default = music, oscal and synthetic-1k)\n\nOptions:\n--cases C: comma separated cases, e.g. schema_v,schema_t:xsd,data_v; a command name selects all of its formats (default = all cases)\n--runs N: timed runs per case, the median and best are reported (default = 3)\n--records N: data records validated and converted by the data cases (default = 1000)\n--no-memory: skip the extra run measuring peak memory with tracemalloc\n--save FILE: write the report to FILE, e.g. a baseline (default = output/bench_<timestamp>.json)\n--compare BASELINE: compare the median timings with a saved report, regressions are logged as errors\n--threshold PCT: slow down, in percent, reported as a regression (default = 10)'
+        import texttable
+        from src.logic.benchmark import BENCH_WORKLOADS, DEFAULT_REGRESSION_PCT, Benchmark, compare_reports
+
+        if isinstance(args, str):
+            args = args.strip().split()
+
+        value_flags = ['--cases', '--runs', '--records', '--save', '--compare', '--threshold']
+        workloads = [arg for idx, arg in enumerate(args) if not arg.startswith('--') and not (idx > 0 and args[idx - 1] in value_flags)]
+        if 'all' in workloads:
+            workloads = list(BENCH_WORKLOADS)
+        cases = get_opt_value(args, '--cases')
+        save_path = get_opt_value(args, '--save')
+        baseline_path = get_opt_value(args, '--compare')
+
+        try:
+            threshold = float(get_opt_value(args, '--threshold', DEFAULT_REGRESSION_PCT))
+            benchmark = Benchmark(workloads, cases.split(',') if cases else None, get_int_opt(args, '--runs'),
+                                  get_int_opt(args, '--records'), measure_memory='--no-memory' not in args)
+
+            def progress(result):
+                status = result['error'] or f"{result['median_s']:.4f}s"
+                print(f" - {result['workload']} {result['case']}: {status}")
+
+            report = benchmark.run(progress)
+
+            table = texttable.Texttable(max_width=120)
+            table.set_cols_dtype(['t', 't', 't', 't', 't', 't'])
+            table.header(["Workload", "Case", "Types", "Median (s)", "Best (s)", "Peak (KB)"])
+            for result in report['results']:
+                if result['error']:
+                    table.add_row([result['workload'], result['case'], result['types'], "-", "-", result['error'][:40]])
+                else:
+                    table.add_row([result['workload'], result['case'], result['types'], result['median_s'], result['min_s'], result['peak_kb'] if result['peak_kb'] is not None else "-"])
+            print(table.draw())
+
+            save_path = save_path or os.path.join(OUTPUT_DIR_PATH, f"bench_{get_now('%Y%m%d_%H%M%S')}.json")
+            os.makedirs(os.path.dirname(os.path.abspath(save_path)), exist_ok=True)
+            with open(save_path, 'w') as file:
+                json.dump(report, file, indent=4)
+            print(f" - Benchmark report written to {save_path}")
+
+            if baseline_path:
+                with open(baseline_path, 'r') as file:
+                    baseline = json.load(file)
+                rows = compare_reports(report, baseline, threshold)
+
+                table = texttable.Texttable(max_width=120)
+                table.set_cols_dtype(['t', 't', 't', 't', 't', 't'])
+                table.header(["Workload", "Case", "Baseline (s)", "Current (s)", "Ratio", "Status"])
+                for row in rows:
+                    table.add_row([row['workload'], row['case'], row['baseline_s'] if row['baseline_s'] is not None else "-",
+                                   row['current_s'] if row['current_s'] is not None else "-", row['ratio'] if row['ratio'] is not None else "-", row['status']])
+                print(table.draw())
+
+                regressions = [row for row in rows if row['status'] == 'regression']
+                print(f" - {len(regressions)} regression(s) over {threshold}% against {baseline_path}.")
+                for row in regressions:
+                    self._record_error('bench', 'Regression', f"{row['workload']} {row['case']}: {row['baseline_s']}s -> {row['current_s']}s (x{row['ratio']})")
+
+        except Exception as e:
+            print(f' - An error occurred while benchmarking: {e}')
+            logging.error(f"An error occurred: {str(e)}", exc_info=True)
+            self._record_error('bench', type(e).__name__, str(e))
+
     def do_version(self, arg):
         'Show the version of the JADN CLI.'
         print('JADN CLI version 1.0.0')                     
@@ -560,7 +1367,7 @@ class JadnCLI(cmd.Cmd):
             print("No error log found.")
     
     def do_clear_reports(self, arg = None):
-        'Clear all generated error reports.'
+        'Clear all generated error reports and the logged error history.'
         directory = OUTPUT_DIR_PATH
         extension = '.csv'
 
@@ -568,8 +1375,9 @@ class JadnCLI(cmd.Cmd):
             if filename.endswith(extension):
                 file_path = os.path.join(directory, filename)
                 os.remove(file_path)
-        
-        print("Cleared error reports.")
+
+        removed = get_error_store().clear()
+        print(f"Cleared error reports, removed {removed} logged errors.")
 
     def do_view_file(self, args):
         'View the contents of a schema or data file. Default method is \"cat filename\"\n\npython jadn_cli.py view_file <directory> <filename> [option]\n\nOptions:\n--code: open file in VSCode\n--vim: open file in Vim\n--head: display first 10 lines\n--tail: display last 10 lines'
@@ -622,24 +1430,25 @@ class JadnCLI(cmd.Cmd):
             if not option and prompt_option: #only ask for flag if going through manual prompts
                 option = pick_an_option(['None', '--code', '--vim', '--head', '--tail'], opts_title="View Options:", prompt="Enter an option to view the file (default = cat): ")
             
+            # Run without a shell, the filename is passed as it is and never interpreted
             if option == '--code':
-                os.system('code ' + filename)
+                subprocess.run(['code', filename])
             elif option == '--vim':
-                os.system('vim ' + filename)
+                subprocess.run(['vim', filename])
             elif option == '--head':
-                os.system('head -n 10 ' + filename)
+                subprocess.run(['head', '-n', '10', filename])
                 print("\n")
             elif option == '--tail':
-                os.system('tail -n 10 ' + filename)
+                subprocess.run(['tail', '-n', '10', filename])
                 print("\n")
             else:
-                os.system('cat ' + filename)
+                subprocess.run(['cat', filename])
                 print("\n")
 
         except Exception as e:
             print(f"An error occurred while trying to view the file: {e}")
             logging.error(f"An error occurred: {str(e)}", exc_info=True)
-            self.error_list.append({'timestamp': get_now(), 'error_type': type(e).__name__, 'err message': str(e)})
+            self._record_error('view_file', type(e).__name__, str(e))
         
         return
 
@@ -649,6 +1458,7 @@ class JadnCLI(cmd.Cmd):
     
     def do_help(self, arg):
       """List available commands in a table."""
+      import texttable
       table = texttable.Texttable()
       table.header(["Command", "Description"])
       commands = [attr for attr in dir(self) if attr.startswith('do_')]
@@ -660,6 +1470,7 @@ class JadnCLI(cmd.Cmd):
       
     def do_about(self, arg):
         """List information and references about the JADN CLI."""
+        import texttable
         table = texttable.Texttable()
         # table.header(["", ""])
         table.add_row(["JADN CLI", "A command-line interface for working with JADN schemas and data."])
@@ -677,15 +1488,33 @@ if __name__ == '__main__':
     if len(sys.argv) > 1:
         cmd_name = sys.argv[1]
         args = sys.argv[2:]
+        # --local runs the command in this process even when a serve process is running
+        run_local = '--local' in args
+        # --profile runs the command under cProfile, --profile-memory also traces its memory allocations
+        cli.profile_memory = '--profile-memory' in args
+        cli.profiling = '--profile' in args or cli.profile_memory
+        cli.profile_top = get_int_opt(args, '--profile-top')
+        if '--profile-top' in args:
+            del args[args.index('--profile-top'):args.index('--profile-top') + 2]
+        args = [arg for arg in args if arg not in ('--local', '--profile', '--profile-memory')]
+        # Join args as a string for consistency with cmd.Cmd
+        arg_str = " ".join(args)
+        response = None
+        # A profile is of this process, so a profiled command is not forwarded
+        if not run_local and not cli.profiling:
+            from src.utils.serve_client import forward_command
+            response = forward_command(cmd_name, arg_str)
         method = getattr(cli, f'do_{cmd_name}', None)
-        if method:
-            # Join args as a string for consistency with cmd.Cmd
-            arg_str = " ".join(args)
-            method(arg_str)
+        # The exit code reflects the outcome: 0 when the command logged no error (valid), 1 when it did, 2 for an unknown command
+        if response is not None:
+            print(response['output'], end='')
+            sys.exit(1 if response['errors'] else 0)
+        elif method:
+            cli.run_command(cmd_name, arg_str)
+            sys.exit(1 if cli.error_list else 0)
         else:
             print(f"Unknown command: {cmd_name}")
-        # Optionally, exit after running the command
-        # sys.exit(0)
+            sys.exit(2)
     else:
         use_prompts = get_config_value("use_prompts", True)
         if use_prompts:
@@ -0,0 +1,352 @@
+"""
+In-memory API for embedding the JADN CLI in other programs.
+
+Schemas are given as JSON text, bytes, a parsed dict or a SchemaEntry returned by load_schema, and data as
+decoded JSON / CBOR values or their raw text / bytes.  Nothing is read from the schemas or data directories
+or written to the output directory.  Parsed schemas, their meta-validation verdict and compiled validation
+plans are cached by content, so validating many messages against one schema only pays for the messages.
+
+Those schemas are kept in a registry of their own, which is not backed by the disk cache, and translations
+only go through the artifact cache when asked to.
+
+The public functions return result dicts and do not raise, a failure sets 'error' and 'error_type'.
+'elapsed' is the total seconds and 'timings' the seconds per stage.  The CLI commands are built on the
+raising helpers (check_schema, match_root, convert_instance, transcode_instance, translate_entry,
+reverse_translate).
+"""
+import time
+
+from src.logic.schema_registry import SchemaEntry, get_memory_registry, get_schema_registry
+from src.utils.config import get_performance_config
+from src.utils.consts import (CBOR_FILE_EXT, COMPACT_CONST, CONCISE_CONST, INFORMATION_OPTION, JIDL_FILE_EXT,
+                              JSON_FILE_EXT, VALID_REV_SCHEMA_FORMATS, VERBOSE_CONST, XML_FILE_EXT)
+from src.utils.json_utils import get_json_loads
+from src.utils.metrics import span
+
+# Decoded data formats the compiled validation plan handles, the rest are converted by jadnvalidation
+PLAN_DATA_FORMATS = [CBOR_FILE_EXT, JSON_FILE_EXT]
+API_DATA_FORMATS = [JSON_FILE_EXT, CBOR_FILE_EXT, XML_FILE_EXT]
+DATA_CONVERSIONS = [COMPACT_CONST, CONCISE_CONST]
+DATA_ENCODINGS = [VERBOSE_CONST] + DATA_CONVERSIONS
+
+
+def load_schema(schema) -> SchemaEntry:
+    """
+    Returns the registry entry of a schema, parsing it on first use.  Pass the entry to the other
+    functions to skip hashing the schema on every call.
+    """
+    if isinstance(schema, SchemaEntry):
+        return schema
+    return get_memory_registry().load_content(schema)
+
+def check_schema(entry: SchemaEntry, name: str = "") -> dict:
+    """
+    Meta-validates a schema entry, returning its schema data.  Raises a ValueError if it is invalid.
+    """
+    if not isinstance(entry.schema_data, dict):
+        raise ValueError(f"Schema {name} is not a valid JSON string." if name else "Schema is not a valid JSON string.")
+
+    if not (entry.registry or get_schema_registry()).validate(entry):
+        raise ValueError(f"Schema Invalid - {entry.error}")
+
+    return entry.schema_data
+
+def decode_data(data, data_format: str = JSON_FILE_EXT):
+    """
+    Decodes raw JSON text / bytes or CBOR bytes, other values are returned as they are.  XML stays text.
+    """
+    if data_format not in API_DATA_FORMATS:
+        raise ValueError(f"Unsupported data format: {data_format}. Supported formats are: {API_DATA_FORMATS}")
+
+    if data_format == CBOR_FILE_EXT and isinstance(data, (bytes, bytearray, memoryview)):
+        import cbor2
+        try:
+            with span("parse"):
+                return cbor2.loads(data)
+        except Exception as e:
+            raise ValueError(f"Failed to decode data as CBOR: {e}")
+
+    if data_format == JSON_FILE_EXT and isinstance(data, (str, bytes, bytearray, memoryview)):
+        try:
+            with span("parse"):
+                return get_json_loads()(bytes(data) if isinstance(data, memoryview) else data)
+        except Exception as e:
+            raise ValueError(f"Failed to parse data as JSON: {e}")
+
+    if data_format == XML_FILE_EXT and isinstance(data, (bytes, bytearray, memoryview)):
+        return bytes(data).decode('utf-8')
+
+    return data
+
+def match_root(entry: SchemaEntry, data, data_format: str = JSON_FILE_EXT, roots: list = None, use_plan: bool = None) -> str:
+    """
+    Validates decoded data against the roots it could be an instance of, returning the root it matched.
+    Without roots, the schema's roots are narrowed down by the shape of the data first.
+    Raises a ValueError if the data matches none of them.
+    """
+    registry = get_schema_registry()
+    if use_plan is None:
+        use_plan = get_performance_config().compiled_validation
+
+    candidates = roots
+    if not roots:
+        roots = entry.roots
+        if not roots:
+            raise ValueError("Schema does not have a valid root.  Cannot validate data without a valid root.")
+
+        # Unparsed (XML) data cannot be dispatched on, so it is tried against every root
+        candidates = roots
+        if not isinstance(data, str):
+            with span("root_selection"):
+                candidates = registry.get_root_index(entry).candidates(data)
+            if not candidates:
+                raise ValueError(f"Data Invalid - data does not match the shape of any root: {roots}")
+
+    errors = []
+    for root_item in candidates:
+        try:
+            # The compiled plan covers decoded JSON and CBOR, other formats are converted by jadnvalidation first
+            with span("data_validation"):
+                if use_plan and data_format in PLAN_DATA_FORMATS:
+                    registry.get_plan(entry, data_format).validate(data, root_item)
+                else:
+                    import jadnvalidation
+                    jadnvalidation.DataValidation(entry.schema_data, root_item, data, data_format).validate()
+            return root_item
+        except Exception as e:
+            errors.append(f"{root_item}: {e}" if len(candidates) > 1 else str(e))
+
+    raise ValueError(f"Data Invalid - {'; '.join(errors)}")
+
+def convert_instance(entry: SchemaEntry, data, convert_to: str, root: str = None):
+    """
+    Converts decoded verbose data to compact or concise data.  Compact data is converted from the root type, or
+    from the schema root the data is a valid instance of without one.  Raises a ValueError if it cannot be converted.
+    """
+    if convert_to not in DATA_CONVERSIONS:
+        raise ValueError(f"Invalid conversion: {convert_to}. Expected any of {', '.join(DATA_CONVERSIONS)}.")
+
+    if convert_to == COMPACT_CONST:
+        # Converted from the schema, jadnutils guesses the types of Records from their keys
+        if root is None:
+            root = match_root(entry, data)
+        try:
+            with span("conversion"):
+                return get_schema_registry().get_compact_codec(entry).compact(data, root)
+        except ValueError as e:
+            raise ValueError(f"Data Invalid - {e}")
+
+    try:
+        with span("conversion"):
+            from jadnutils.json.convert_concise import convert_to_concise
+            return convert_to_concise(entry.schema_data, data)
+    except Exception as e:
+        raise ValueError(f"Data Invalid - {e}")
+
+def expand_instance(entry: SchemaEntry, data, convert_from: str, root: str = None, data_format: str = JSON_FILE_EXT) -> tuple:
+    """
+    Converts decoded compact or concise data back to verbose data, as an instance of root or of the first of the
+    schema's roots it expands to a valid instance of.  Returns (verbose data, root).  Raises a ValueError if it
+    cannot be converted or the verbose data is not valid.
+    """
+    if convert_from not in DATA_CONVERSIONS:
+        raise ValueError(f"Cannot convert {convert_from} data to {VERBOSE_CONST}, only {' or '.join(DATA_CONVERSIONS)} data can be expanded.")
+
+    roots = [root] if root else entry.roots
+    if not roots:
+        raise ValueError("Schema does not have a valid root.  Cannot convert data without a valid root.")
+
+    codec = get_schema_registry().get_compact_codec(entry)
+    errors = []
+    for root_item in roots:
+        try:
+            with span("conversion"):
+                verbose = codec.expand(data, root_item, convert_from)
+            # Data that expands without error can still be an instance of another type
+            match_root(entry, verbose, data_format, [root_item])
+            return verbose, root_item
+        except ValueError as e:
+            message = str(e).removeprefix("Data Invalid - ")
+            errors.append(f"{root_item}: {message}" if len(roots) > 1 else message)
+
+    raise ValueError(f"Data Invalid - {'; '.join(errors)}")
+
+def transcode_instance(entry: SchemaEntry, data, convert_from: str, convert_to: str, root: str = None,
+                       data_format: str = JSON_FILE_EXT):
+    """
+    Converts decoded data between the verbose, compact and concise encodings, through verbose data when
+    neither side is verbose.  The verbose data, given or expanded, is validated before it is converted, so
+    nothing is written for data that does not convert to a valid instance.  Raises a ValueError if it cannot be
+    converted.
+    """
+    for encoding in (convert_from, convert_to):
+        if encoding not in DATA_ENCODINGS:
+            raise ValueError(f"Invalid encoding: {encoding}. Expected any of {', '.join(DATA_ENCODINGS)}.")
+
+    if convert_from == convert_to:
+        return data
+
+    if convert_from == VERBOSE_CONST:
+        root = match_root(entry, data, data_format, [root] if root else None)
+    else:
+        data, root = expand_instance(entry, data, convert_from, root, data_format)
+
+    if convert_to == VERBOSE_CONST:
+        return data
+    return convert_instance(entry, data, convert_to, root)
+
+def translate_entry(entry: SchemaEntry, convert_to: str, opt: str = INFORMATION_OPTION, force: bool = False,
+                    use_cache: bool = True) -> tuple:
+    """
+    Translates a schema entry to an output format, through the artifact cache with use_cache.
+    Returns (converted text, from cache).  Raises a ValueError if it cannot be translated.
+    """
+    from src.logic.artifact_cache import get_artifact_cache
+    from src.logic.cli_schema_conversion import build_schema_artifact, prepare_schema_data
+
+    # Unchanged schema, format and option, restore the last build unless forced to rebuild
+    artifact_cache = get_artifact_cache() if use_cache else None
+    if artifact_cache and not force:
+        converted = artifact_cache.get(entry.content_hash, convert_to, opt)
+        if converted is not None:
+            return converted, True
+
+    try:
+        with span("conversion"):
+            converted = build_schema_artifact(prepare_schema_data(entry), convert_to, opt)
+    except Exception as e:
+        raise ValueError(f"Schema Invalid - {e}")
+
+    if artifact_cache and converted:
+        artifact_cache.put(entry.content_hash, convert_to, opt, converted)
+
+    return converted, False
+
+def reverse_translate(schema_text: str, schema_format: str) -> str:
+    """
+    Translates JIDL or JSON Schema text back to a JADN schema.  Raises a ValueError if it cannot be translated.
+    """
+    if schema_format not in VALID_REV_SCHEMA_FORMATS:
+        raise ValueError(f"Unsupported schema format: {schema_format}. Supported formats are: {VALID_REV_SCHEMA_FORMATS}")
+
+    try:
+        with span("conversion"):
+            if schema_format == JIDL_FILE_EXT:
+                import jadn
+                return jadn.convert.jidl_loads(schema_text)
+
+            from jadnschema.convert import json_to_jadn_dumps
+            return json_to_jadn_dumps(get_json_loads()(schema_text), fmt=schema_format)
+    except Exception as e:
+        raise ValueError(f"Schema Invalid - {e}")
+
+
+def validate_schema(schema) -> dict:
+    """
+    Meta-validates a schema.  Returns {'valid', 'schema', 'error', 'error_type', 'elapsed', 'timings'},
+    where 'schema' is the entry to pass to the other functions.
+    """
+    result = _new_result(valid=False, schema=None)
+    with _Stages(result) as stages:
+        result['schema'] = stages.run('load', load_schema, schema)
+        stages.run('meta_validate', check_schema, result['schema'])
+        result['valid'] = True
+    return result
+
+def validate_data(schema, data, data_format: str = JSON_FILE_EXT, root: str = None) -> dict:
+    """
+    Validates one instance, decoded or as raw JSON text / bytes, CBOR bytes or XML text.
+    Returns {'valid', 'root', 'error', 'error_type', 'elapsed', 'timings'}, 'root' being the root matched.
+    """
+    result = _new_result(valid=False, root=None)
+    with _Stages(result) as stages:
+        entry = stages.run('load', load_schema, schema)
+        stages.run('meta_validate', check_schema, entry)
+        data = stages.run('parse', decode_data, data, data_format)
+        result['root'] = stages.run('validate', match_root, entry, data, data_format, [root] if root else None)
+        result['valid'] = True
+    return result
+
+def convert_data(schema, data, convert_to: str = COMPACT_CONST) -> dict:
+    """
+    Converts one verbose instance, decoded or as raw JSON text / bytes, to compact or concise data.
+    Returns {'converted', 'error', 'error_type', 'elapsed', 'timings'}, 'converted' being decoded data.
+    """
+    result = _new_result(converted=None)
+    with _Stages(result) as stages:
+        entry = stages.run('load', load_schema, schema)
+        data = stages.run('parse', decode_data, data, JSON_FILE_EXT)
+        result['converted'] = stages.run('convert', convert_instance, entry, data, convert_to)
+    return result
+
+def transcode_data(schema, data, convert_from: str, convert_to: str, data_format: str = JSON_FILE_EXT, root: str = None) -> dict:
+    """
+    Converts one instance, decoded or as raw JSON text / bytes or CBOR bytes, between the verbose, compact and
+    concise encodings.  Returns {'converted', 'error', 'error_type', 'elapsed', 'timings'}, 'converted' being decoded data.
+    """
+    result = _new_result(converted=None)
+    with _Stages(result) as stages:
+        entry = stages.run('load', load_schema, schema)
+        data = stages.run('parse', decode_data, data, data_format)
+        result['converted'] = stages.run('convert', transcode_instance, entry, data, convert_from, convert_to, root, data_format)
+    return result
+
+def translate_schema(schema, convert_to: str, opt: str = INFORMATION_OPTION, force: bool = False, cache: bool = False) -> dict:
+    """
+    Translates a schema to JIDL, JSON Schema, XSD, HTML, Markdown, GraphViz or PlantUML.  With cache, the
+    translation is kept in and restored from the artifact cache on disk.
+    Returns {'converted', 'cached', 'error', 'error_type', 'elapsed', 'timings'}, 'converted' being text.
+    """
+    result = _new_result(converted=None, cached=False)
+    with _Stages(result) as stages:
+        entry = stages.run('load', load_schema, schema)
+        stages.run('meta_validate', check_schema, entry)
+        result['converted'], result['cached'] = stages.run('convert', translate_entry, entry, convert_to, opt, force, cache)
+    return result
+
+def reverse_translate_schema(schema_text, schema_format: str) -> dict:
+    """
+    Translates JIDL or JSON Schema text or bytes back to a JADN schema.
+    Returns {'converted', 'error', 'error_type', 'elapsed', 'timings'}.
+    """
+    if isinstance(schema_text, (bytes, bytearray, memoryview)):
+        schema_text = bytes(schema_text).decode('utf-8')
+
+    result = _new_result(converted=None)
+    with _Stages(result) as stages:
+        result['converted'] = stages.run('convert', reverse_translate, schema_text, schema_format)
+    return result
+
+
+def _new_result(**fields) -> dict:
+    result = dict(fields)
+    result.update({'error': None, 'error_type': None, 'elapsed': 0.0, 'timings': {}})
+    return result
+
+
+class _Stages():
+    """
+    Times each stage of a call into the result's timings and turns an exception into the result's error.
+    """
+
+    def __init__(self, result: dict):
+        self.result = result
+
+    def run(self, stage: str, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.result['timings'][stage] = time.perf_counter() - start
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.result['elapsed'] = time.perf_counter() - self.start
+        if exc is not None and isinstance(exc, Exception):
+            self.result['error'] = str(exc)
+            self.result['error_type'] = exc_type.__name__
+            return True
+        return False
@@ -0,0 +1,177 @@
+import os
+
+from src.logic.schema_disk_cache import PRUNE_RATIO, file_size, get_lib_version
+from src.utils.config import get_performance_config
+from src.utils.consts import GV_FILE_EXT, HTML_FILE_EXT, PLANT_UML_FILE_EXT, XSD_FILE_EXT
+
+ARTIFACT_FORMAT_VERSION = 1
+ARTIFACT_ENTRY_EXT = ".artifact"
+ARTIFACTS_CACHE_SUBDIR = "artifacts"
+
+# The library that produces each target format, its version is part of the artifact key
+CONVERTER_LIBS = {
+    HTML_FILE_EXT: "jadnutils",
+    XSD_FILE_EXT: "jadnxml"
+}
+DEFAULT_CONVERTER_LIB = "jadn"
+
+# Formats whose output depends on the visualization option
+VIS_OPTION_FORMATS = [GV_FILE_EXT, PLANT_UML_FILE_EXT]
+
+
+class ArtifactCache():
+    """
+    Content addressed, on-disk cache of schema translation output.
+
+    Artifacts are keyed by the schema content hash, the target format, the visualization option
+    (for formats that use one) and the version of the converter library, so a changed schema,
+    option or library upgrade is a miss.  Artifacts are stored as the converted text, and the
+    least recently used ones are removed once the cache grows past its size cap.  The directory is
+    scanned by the first put, later puts keep a running total and only scan again to prune.
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        if cache_dir is None:
+            cache_dir = get_performance_config().cache_dir
+        if max_bytes is None:
+            max_bytes = get_performance_config().cache_max_mb * 1024 * 1024
+
+        self.cache_dir = os.path.join(cache_dir, ARTIFACTS_CACHE_SUBDIR)
+        self.max_bytes = max_bytes
+        self.current_bytes = None # Unknown until the first put scans the directory
+        self.lib_versions = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, content_hash: str, convert_to: str, opt: str = None) -> str:
+        """
+        Returns the cached artifact text, or None on a miss.
+        """
+        path = self._entry_path(content_hash, convert_to, opt)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                artifact = file.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, UnicodeDecodeError):
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path) # Mark as recently used for eviction
+        except OSError:
+            pass
+
+        self.hits += 1
+        return artifact
+
+    def put(self, content_hash: str, convert_to: str, opt: str, artifact: str):
+        """
+        Store an artifact, then enforce the size cap.  Only text artifacts are cached.
+        """
+        if not isinstance(artifact, str):
+            return
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._entry_path(content_hash, convert_to, opt)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                file.write(artifact)
+            added = os.path.getsize(tmp_path) - file_size(path)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Caching is best effort, the artifact was still built
+            return
+
+        self._track(added)
+
+    def prune(self, max_bytes: int = None) -> int:
+        """
+        Evict the least recently used artifacts until the cache is under max_bytes, its size cap by default.
+        Returns the number removed.
+        """
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        removed = 0
+        entries = []
+        total = 0
+        for entry in self._scan():
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        entries.sort()
+        while total > max_bytes and entries:
+            _, size, path = entries.pop(0)
+            self._remove(path)
+            total -= size
+            removed += 1
+
+        self.current_bytes = total
+        return removed
+
+    def clear(self) -> int:
+        """
+        Remove every cached artifact.  Returns the number removed.
+        """
+        removed = 0
+        for entry in self._scan():
+            self._remove(entry.path)
+            removed += 1
+        self.current_bytes = 0
+        return removed
+
+    def stats(self) -> dict:
+        entries = self._scan()
+        return {
+            'dir': self.cache_dir,
+            'entries': len(entries),
+            'bytes': sum(entry.stat().st_size for entry in entries),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def _entry_path(self, content_hash: str, convert_to: str, opt: str = None) -> str:
+        lib_name = CONVERTER_LIBS.get(convert_to, DEFAULT_CONVERTER_LIB)
+        lib_version = self.lib_versions.get(lib_name)
+        if lib_version is None:
+            lib_version = self.lib_versions[lib_name] = get_lib_version(lib_name)
+
+        opt = opt if convert_to in VIS_OPTION_FORMATS and opt else "none"
+        filename = f"{content_hash}-{convert_to}-{opt}-{lib_name}{lib_version}-f{ARTIFACT_FORMAT_VERSION}{ARTIFACT_ENTRY_EXT}"
+        return os.path.join(self.cache_dir, filename)
+
+    def _track(self, added: int):
+        # Entries written by other processes are only counted by the next scan
+        if self.current_bytes is None or self.current_bytes + added > self.max_bytes:
+            self.prune(int(self.max_bytes * PRUNE_RATIO))
+        else:
+            self.current_bytes += added
+
+    def _scan(self):
+        try:
+            with os.scandir(self.cache_dir) as it:
+                return [entry for entry in it if entry.is_file() and entry.name.endswith(ARTIFACT_ENTRY_EXT)]
+        except FileNotFoundError:
+            return []
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+_artifact_cache = None
+
+def get_artifact_cache() -> ArtifactCache:
+    """
+    Returns the process wide artifact cache, or None if it is disabled in the config.
+    """
+    global _artifact_cache
+    if _artifact_cache is None and get_performance_config().artifact_cache:
+        _artifact_cache = ArtifactCache()
+    return _artifact_cache
@@ -0,0 +1,272 @@
+"""
+Benchmark harness for the CLI commands.
+
+Each case times one command's work in memory, through the same helpers the commands use, on a workload:
+the music schema and data, or oscal-ssp.jadn or a synthetic schema with thousands of types and data generated
+from the schema.  Disk and artifact caches are bypassed and schema cases start from an empty schema registry,
+so the timings are of the work itself.  Every case is run a number of times for its timings, then once more under tracemalloc
+for its peak memory.  Results are plain dicts, saved as JSON and compared against a stored baseline.
+"""
+import io
+import json
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+
+from contextlib import redirect_stdout
+
+from src.api import check_schema, convert_instance, match_root, reverse_translate, translate_entry
+from src.logic.data_generator import DataGenerator
+from src.logic.schema_registry import SchemaRegistry, get_schema_registry
+from src.utils.consts import (COMPACT_CONST, CONCISE_CONST, DATA_DIR_PATH, INFORMATION_OPTION, JIDL_FILE_EXT, JSON_FILE_EXT,
+                              SCHEMA_OUTPUT_FORMATS, SCHEMAS_DIR_PATH, VALID_REV_SCHEMA_FORMATS)
+from src.utils.time_utils import get_now
+
+BENCH_VERSION = 1
+
+# Workload name -> schema file or synthetic type count, and the data file validated and converted, generated from the schema without one
+BENCH_WORKLOADS = {
+    'music': {'schema': "music-database.jadn", 'data': "music_library.json"},
+    'oscal': {'schema': "oscal-ssp.jadn", 'data': None},
+    'synthetic-1k': {'types': 1000, 'data': None},
+    'synthetic-5k': {'types': 5000, 'data': None}
+}
+DEFAULT_BENCH_WORKLOADS = ['music', 'oscal', 'synthetic-1k']
+
+BENCH_CASES = (['schema_v'] + [f"schema_t:{fmt}" for fmt in SCHEMA_OUTPUT_FORMATS]
+               + [f"schema_rev_t:{fmt}" for fmt in VALID_REV_SCHEMA_FORMATS]
+               + ['data_v', f"data_c:{COMPACT_CONST}", f"data_c:{CONCISE_CONST}"])
+
+DEFAULT_BENCH_RUNS = 3
+DEFAULT_BENCH_RECORDS = 1000
+# Distinct records generated for a workload without a data file, repeated up to the number of records
+BENCH_GENERATED_RECORDS = 10
+DEFAULT_REGRESSION_PCT = 10
+
+_PRIMITIVES = ["String", "Integer", "Number", "Boolean"]
+
+
+def make_synthetic_schema(type_count: int, seed: int = 0) -> dict:
+    """
+    Returns a valid JADN schema with the given number of types: Records, Choices, Enumerateds, ArrayOfs and
+    constrained Strings and Integers.  Compound types only reference types defined after them, so the schema is a
+    tree under its root Record.  The same type count and seed give the same schema.
+    """
+    rng = random.Random(seed)
+    type_count = max(2, type_count)
+    names = [f"Type-{idx}" for idx in range(type_count)]
+    names[0] = "Root"
+    types = []
+
+    for idx, name in enumerate(names):
+        later = names[idx + 1:]
+        kind = "Record" if idx == 0 else rng.choice(["Record", "Record", "Choice", "Enumerated", "ArrayOf", "String", "Integer"])
+        if kind in ("Record", "Choice", "ArrayOf") and not later:
+            kind = "String"
+
+        if kind in ("Record", "Choice"):
+            # The root reaches the first types, so every type is reachable from it
+            field_types = later[:8] if idx == 0 else [rng.choice(later + _PRIMITIVES) for _ in range(rng.randint(2, 6))]
+            fields = [[num, f"field_{num}", field_type, ['[0'] if rng.random() < 0.3 else [], f"Field {num} of {name}."]
+                      for num, field_type in enumerate(field_types, 1)]
+            types.append([name, kind, [], f"Synthetic {kind}.", fields])
+        elif kind == "Enumerated":
+            items = [[num, f"item_{num}", ""] for num in range(1, rng.randint(3, 12))]
+            types.append([name, kind, [], "Synthetic Enumerated.", items])
+        elif kind == "ArrayOf":
+            types.append([name, kind, [f"*{rng.choice(later)}", "{1", f"}}{rng.randint(2, 50)}"], "Synthetic ArrayOf.", []])
+        elif kind == "String":
+            types.append([name, kind, ["%^[a-z][a-z0-9-]{0,31}$"] if rng.random() < 0.5 else ["}255"], "Synthetic String.", []])
+        else:
+            types.append([name, kind, ["w0", f"x{rng.randint(10, 10000)}"], "Synthetic Integer.", []])
+
+    return {
+        'meta': {'package': f"http://example.com/synthetic/{type_count}", 'title': f"Synthetic schema, {type_count} types", 'roots': ["Root"],
+                 'config': {'$MaxElements': max(255, type_count)}},
+        'types': types
+    }
+
+def load_workload(name: str, records: int = DEFAULT_BENCH_RECORDS, with_data: bool = True) -> dict:
+    """
+    Returns a workload: its schema bytes and, with_data, the given number of records, the decoded data file repeated
+    or instances of the schema's root generated with a fixed seed.  Raises a ValueError for an unknown workload.
+    """
+    spec = BENCH_WORKLOADS.get(name)
+    if spec is None:
+        raise ValueError(f"Unknown workload: {name}. Expected any of {', '.join(BENCH_WORKLOADS)}.")
+
+    if 'types' in spec:
+        raw = json.dumps(make_synthetic_schema(spec['types'])).encode('utf-8')
+    else:
+        with open(f"{SCHEMAS_DIR_PATH}/{spec['schema']}", 'rb') as file:
+            raw = file.read()
+
+    data = None
+    if with_data and spec['data']:
+        with open(f"{DATA_DIR_PATH}/{spec['data']}", 'rb') as file:
+            data = [json.loads(file.read())] * records
+    elif with_data:
+        generator = DataGenerator(json.loads(raw), seed=0)
+        pool = [generator.generate() for _ in range(min(records, BENCH_GENERATED_RECORDS))]
+        data = [pool[idx % len(pool)] for idx in range(records)]
+
+    return {'name': name, 'schema': raw, 'data': data, 'schema_bytes': len(raw), 'types': len(json.loads(raw).get('types', []))}
+
+
+class Benchmark():
+
+    workloads: list = []
+    cases: list = []
+    runs: int = DEFAULT_BENCH_RUNS
+    records: int = DEFAULT_BENCH_RECORDS
+    measure_memory: bool = True
+
+    def __init__(self, workloads: list = None, cases: list = None, runs: int = None, records: int = None, measure_memory: bool = True):
+        self.workloads = workloads or DEFAULT_BENCH_WORKLOADS
+        self.cases = cases or BENCH_CASES
+        self.runs = runs or DEFAULT_BENCH_RUNS
+        self.records = records or DEFAULT_BENCH_RECORDS
+        self.measure_memory = measure_memory
+
+        unknown = [case for case in self.cases if case not in BENCH_CASES and case not in {name.split(':')[0] for name in BENCH_CASES}]
+        if unknown:
+            raise ValueError(f"Unknown benchmark case(s): {', '.join(unknown)}. Expected any of {', '.join(BENCH_CASES)}.")
+
+    def run(self, progress=None) -> dict:
+        """
+        Runs every case on every workload, returning the benchmark report.  A case that fails is reported with its
+        error, data cases are skipped on workloads without data.  progress is called with each result as it completes.
+        """
+        report = {
+            'version': BENCH_VERSION,
+            'timestamp': get_now(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'runs': self.runs,
+            'records': self.records,
+            'results': []
+        }
+        # A case name without a format selects every format of that command
+        cases = [case for case in BENCH_CASES if case in self.cases or case.split(':')[0] in self.cases]
+
+        # Records are only read or generated for the data cases
+        with_data = any(case.startswith('data_') for case in cases)
+        for workload_name in self.workloads:
+            workload = load_workload(workload_name, self.records, with_data)
+            for case in cases:
+                result = self.run_case(workload, case)
+                report['results'].append(result)
+                if progress:
+                    progress(result)
+
+        return report
+
+    def run_case(self, workload: dict, case: str) -> dict:
+        result = {'workload': workload['name'], 'case': case, 'types': workload['types'], 'schema_bytes': workload['schema_bytes'],
+                  'records': len(workload['data']) if case.startswith('data_') else None,
+                  'min_s': None, 'median_s': None, 'peak_kb': None, 'error': None}
+        # The converters print progress, which would be timed along with them
+        try:
+            with redirect_stdout(io.StringIO()):
+                self._measure(workload, case, result)
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+
+        return result
+
+    def _measure(self, workload: dict, case: str, result: dict):
+        func, args = self._prepare(workload, case)
+        # Untimed first run, for the libraries the case imports on first use
+        func(*args)
+        timings = []
+        for _ in range(self.runs):
+            start = time.perf_counter()
+            func(*args)
+            timings.append(time.perf_counter() - start)
+        result['min_s'] = round(min(timings), 6)
+        result['median_s'] = round(statistics.median(timings), 6)
+
+        if self.measure_memory:
+            tracemalloc.start()
+            try:
+                func(*args)
+                result['peak_kb'] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+            finally:
+                tracemalloc.stop()
+
+    def _prepare(self, workload: dict, case: str) -> tuple:
+        """
+        Returns the function timed for a case and its arguments, doing the untimed set up the case needs first.
+        """
+        command, _, fmt = case.partition(':')
+        if command == 'schema_v':
+            return _validate_schema_cold, (workload['schema'],)
+
+        # The other cases start from a parsed and meta-validated schema
+        entry = get_schema_registry().load_content(workload['schema'])
+        check_schema(entry)
+
+        if command == 'schema_t':
+            return _translate_schema, (entry, fmt)
+        if command == 'schema_rev_t':
+            text, _ = translate_entry(entry, JIDL_FILE_EXT if fmt == JIDL_FILE_EXT else JSON_FILE_EXT, INFORMATION_OPTION, True)
+            return reverse_translate, (text, fmt)
+        if command == 'data_v':
+            # Compiles the validation plan and root index outside the clock
+            match_root(entry, workload['data'][0])
+            return _validate_records, (entry, workload['data'])
+        return _convert_records, (entry, workload['data'], fmt)
+
+
+def _validate_schema_cold(raw: bytes):
+    # A registry of its own, without the disk cache, so the schema is parsed and meta-validated every run
+    registry = SchemaRegistry(disk_cache=None)
+    entry = registry.load_content(raw)
+    if not registry.validate(entry):
+        raise ValueError(f"Schema Invalid - {entry.error}")
+
+def _translate_schema(entry, convert_to: str):
+    converted, _ = translate_entry(entry, convert_to, INFORMATION_OPTION, True)
+    if not converted:
+        raise ValueError(f"Schema could not be converted to {convert_to}.")
+
+def _validate_records(entry, records: list):
+    for data in records:
+        match_root(entry, data)
+
+def _convert_records(entry, records: list, convert_to: str):
+    for data in records:
+        convert_instance(entry, data, convert_to)
+
+
+def compare_reports(report: dict, baseline: dict, threshold_pct: float = DEFAULT_REGRESSION_PCT) -> list:
+    """
+    Compares the median timings of a report with a baseline report, case by case, per record for the data cases.
+    Returns a row per case in the report: its baseline and current seconds, the ratio and a status of
+    'regression' (slower by more than threshold_pct), 'improvement' (faster by more than threshold_pct), 'ok',
+    'new' (not in the baseline) or 'error'.
+    """
+    baseline_results = {(result['workload'], result['case']): result for result in baseline.get('results', [])}
+    rows = []
+    for result in report['results']:
+        before = baseline_results.get((result['workload'], result['case']))
+        row = {'workload': result['workload'], 'case': result['case'], 'baseline_s': None, 'current_s': result['median_s'],
+               'ratio': None, 'status': 'ok'}
+        if result['error'] or (before and before['error']):
+            row['status'] = 'error'
+        elif before is None or not before['median_s']:
+            row['status'] = 'new'
+        else:
+            row['baseline_s'] = before['median_s']
+            # Data cases run with another record count are compared per record
+            scale = result['records'] / before['records'] if result['records'] and before['records'] else 1
+            row['ratio'] = round(result['median_s'] / (before['median_s'] * scale), 3)
+            if row['ratio'] > 1 + threshold_pct / 100:
+                row['status'] = 'regression'
+            elif row['ratio'] < 1 - threshold_pct / 100:
+                row['status'] = 'improvement'
+        rows.append(row)
+
+    return rows
@@ -1,48 +1,97 @@
-import json
-from src.utils.consts import COMPACT_CONST, CONCISE_CONST, DATA_DIR_PATH, SCHEMAS_DIR_PATH, JSON_FILE_EXT
-from src.utils.file_utils import get_file
-from jadnutils.json.convert_compact import convert_to_compact
-from jadnutils.json.convert_concise import convert_to_concise
+from src.utils.consts import DATA_DIR_PATH, SCHEMAS_DIR_PATH
+from src.utils.file_utils import get_filepath, iter_json_lines, open_input
+from src.utils.json_utils import get_json_dumps, get_json_loads
+from src.utils.metrics import span
+from src.logic.schema_registry import get_schema_registry
+from src.api import convert_instance
 
 class CliDataConversion():
     
     schema_filename: str = None
     data_filename: str = None
     convert_to: str = None
+    pretty: bool = False
+    converted_count: int = 0
+    failed_count: int = 0
     errors: list = []
     
-    def __init__(self, schema_filename: str, data_filename: str, convert_to: str = None):
+    def __init__(self, schema_filename: str, data_filename: str, convert_to: str = None, pretty: bool = False):
         self.schema_filename = schema_filename
         self.data_filename = data_filename
         self.convert_to = convert_to
+        self.pretty = pretty
 
     def convert(self, opt = None):
-        converted_data = None
+        """
+        Convert a JSON data file, returning the converted data as JSON text, compact unless pretty.
+        """
+        filepath = self._get_filepath()
+        try:
+            # Parsed straight from the file bytes, the raw text is not kept alongside the data
+            with open_input(filepath) as file:
+                with span("file_read"):
+                    raw = file.read()
+                with span("parse"):
+                    data_data = get_json_loads()(raw)
+        except Exception as e:
+            raise ValueError(f"Data Invalid - {e}")
 
-        schema_file_data = get_file(SCHEMAS_DIR_PATH, self.schema_filename)
-        if not schema_file_data:
-            raise ValueError(f"Schema {self.schema_filename} not found.  Double check the schemas folder and filename.")
+        converted_data = self.convert_data(data_data)
+
+        if not converted_data:
+            return None
+        with span("serialization"):
+            return get_json_dumps(self.pretty)(converted_data)
+
+    def convert_stream(self, out):
+        """
+        Convert an NDJSON / JSON Lines file one record at a time, writing one converted record per line to out.
+        Only the current record is held in memory.
+        Yields (line_no, error) for each record that could not be converted and keeps converted / failed counts.
+        """
+        filepath = self._get_filepath()
+        schema_entry = self._load_schema()
+        dumps = get_json_dumps()
+
+        self.converted_count = 0
+        self.failed_count = 0
+        for line_no, data, parse_error in iter_json_lines(filepath):
+            if parse_error is not None:
+                self.failed_count += 1
+                yield line_no, f"Failed to parse line as JSON: {parse_error}"
+                continue
 
-        data_file_data = get_file(DATA_DIR_PATH, self.data_filename)
-        if not data_file_data:
+            try:
+                converted = convert_instance(schema_entry, data, self.convert_to)
+                with span("serialization"):
+                    text = dumps(converted)
+                with span("write_output"):
+                    out.write(text)
+                    out.write('\n')
+                self.converted_count += 1
+            except Exception as e:
+                self.failed_count += 1
+                yield line_no, str(e)
+
+    def convert_data(self, data):
+        """
+        Convert verbose data that is already decoded, returning the compact or concise data.
+        """
+        return convert_instance(self._load_schema(), data, self.convert_to)
+
+    def _get_filepath(self):
+        filepath = get_filepath(DATA_DIR_PATH, self.data_filename)
+        if not filepath:
             raise ValueError(f"JSON Data {self.data_filename} not found.  Double check the data folder and filename.")
-        
+        return filepath
+
+    def _load_schema(self):
         try:
-            schema_data_str = schema_file_data[self.schema_filename]
-            schema_data = json.loads(schema_data_str) # Ensure it's a valid JSON string
-
-            data_data_str = data_file_data[self.data_filename]
-            data_data = json.loads(data_data_str) # Ensure it's a valid JSON string
-             
-            if self.convert_to == COMPACT_CONST:
-                converted_data = convert_to_compact(schema_data, data_data)
-            
-            elif self.convert_to == CONCISE_CONST:
-                converted_data = convert_to_concise(schema_data, data_data)
-
-            converted_data = json.dumps(converted_data, indent=4) if converted_data else None
-                
+            schema_entry = get_schema_registry().load(SCHEMAS_DIR_PATH, self.schema_filename)
         except Exception as e:
             raise ValueError(f"Data Invalid - {e}")
-        
-        return converted_data
\ No newline at end of file
+
+        if schema_entry is None:
+            raise ValueError(f"Schema {self.schema_filename} not found.  Double check the schemas folder and filename.")
+
+        return schema_entry
@@ -0,0 +1,126 @@
+import os
+import time
+
+from src.logic.cli_data_conversion import CliDataConversion
+from src.logic.cli_schema_validation import CliSchemaValidation
+from src.utils.consts import DATA_DIR_PATH, JSON_FILE_EXT, VALID_STREAM_DATA_FORMATS, CBOR_SEQ_FILE_EXT
+from src.utils.dir_catalog import get_dir_catalog
+from src.utils.file_utils import determine_file_type, open_output, update_file_extension
+from src.utils.metrics import span
+from src.utils.pool_utils import get_default_jobs, run_jobs
+
+# Data formats data_c converts, JSON files whole and NDJSON / JSON Lines files one record at a time
+CONVERSION_STREAM_FORMATS = [fmt for fmt in VALID_STREAM_DATA_FORMATS if fmt != CBOR_SEQ_FILE_EXT]
+CONVERSION_DATA_FORMATS = [JSON_FILE_EXT] + CONVERSION_STREAM_FORMATS
+
+
+def init_worker(schema_filename: str):
+    """
+    Process pool initializer, parses and meta-validates the schema once per worker.
+    """
+    try:
+        CliSchemaValidation(schema_filename).validate()
+    except Exception:
+        pass # Reported per file by convert_file
+
+def get_output_filename(data_filename: str) -> str:
+    """
+    Returns the output filename of a converted data file, NDJSON / JSON Lines files keep their extension.
+    """
+    if determine_file_type(data_filename) in CONVERSION_STREAM_FORMATS:
+        return data_filename
+    return update_file_extension(data_filename, JSON_FILE_EXT)
+
+def convert_file(schema_filename: str, data_filename: str, convert_to: str, pretty: bool = False) -> dict:
+    """
+    Convert a single data file and write it to the output directory, returning a result dict instead of raising
+    so it can cross process boundaries.  The converted data stays in the worker, only the counts are returned.
+    """
+    result = {'filename': data_filename, 'output_filename': get_output_filename(data_filename), 'converted': False,
+              'records': 0, 'failed_records': 0, 'error': None, 'error_type': None, 'size': 0, 'elapsed': 0.0}
+    start = time.perf_counter()
+    try:
+        result['size'] = os.path.getsize(os.path.join(DATA_DIR_PATH, data_filename))
+        data_conversion = CliDataConversion(schema_filename, data_filename, convert_to, pretty)
+        if determine_file_type(data_filename) in CONVERSION_STREAM_FORMATS:
+            with open_output(result['output_filename']) as out:
+                errors = [f"line {line_no}: {error}" for line_no, error in data_conversion.convert_stream(out)]
+            result['records'] = data_conversion.converted_count
+            result['failed_records'] = data_conversion.failed_count
+            if errors:
+                raise ValueError(f"{len(errors)} records could not be converted - {'; '.join(errors[:3])}")
+        else:
+            converted_data = data_conversion.convert()
+            if converted_data is None:
+                raise ValueError("Data could not be converted.")
+            with span("write_output"), open_output(result['output_filename']) as out:
+                out.write(converted_data)
+            result['records'] = 1
+        result['converted'] = True
+    except Exception as e:
+        result['error'] = str(e)
+        result['error_type'] = type(e).__name__
+    result['elapsed'] = time.perf_counter() - start
+
+    return result
+
+
+class CliDataConversionBulk():
+
+    schema_filename: str = None
+    pattern: str = None
+    convert_to: str = None
+    jobs: int = None
+    pretty: bool = False
+    elapsed: float = 0.0
+    total_bytes: int = 0
+
+    def __init__(self, schema_filename: str, pattern: str = None, convert_to: str = None, jobs: int = None, pretty: bool = False):
+        self.schema_filename = schema_filename
+        self.pattern = pattern
+        self.convert_to = convert_to
+        self.jobs = jobs or get_default_jobs()
+        self.pretty = pretty
+
+    def find_files(self) -> list:
+        """
+        Returns the data filenames (relative to the data directory) matching the pattern, sorted.
+        Without a pattern, every JSON, NDJSON and JSON Lines file is returned.
+        """
+        if self.pattern:
+            return list(get_dir_catalog(DATA_DIR_PATH, recursive='/' in self.pattern).files(pattern=self.pattern))
+
+        return list(get_dir_catalog(DATA_DIR_PATH).files(CONVERSION_DATA_FORMATS))
+
+    def convert(self) -> list:
+        """
+        Convert every matching data file across the worker pool, each worker writes its own output.
+        Returns a list of result dicts in filename order.
+        """
+        # Fail fast on a bad schema, this also seeds the disk cache the workers read from
+        CliSchemaValidation(self.schema_filename).validate()
+
+        filenames = self.find_files()
+        if not filenames:
+            raise ValueError(f"No data files found in {DATA_DIR_PATH} matching {self.pattern or CONVERSION_DATA_FORMATS}.")
+
+        start = time.perf_counter()
+        arg_lists = [(self.schema_filename, filename, self.convert_to, self.pretty) for filename in filenames]
+        results = run_jobs(convert_file, arg_lists, self.jobs, initializer=init_worker, initargs=(self.schema_filename,))
+
+        self.elapsed = time.perf_counter() - start
+        self.total_bytes = sum(result['size'] for result in results)
+
+        return results
+
+    def throughput(self, results: list) -> dict:
+        elapsed = self.elapsed or 1e-9
+        return {
+            'files': len(results),
+            'passed': sum(1 for result in results if result['converted']),
+            'failed': sum(1 for result in results if not result['converted']),
+            'records': sum(result['records'] for result in results),
+            'seconds': round(self.elapsed, 3),
+            'files_per_sec': round(len(results) / elapsed, 1),
+            'mb_per_sec': round(self.total_bytes / (1024 * 1024) / elapsed, 2)
+        }
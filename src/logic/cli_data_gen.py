@@ -0,0 +1,144 @@
+import os
+import time
+
+import cbor2
+
+from src.api import check_schema
+from src.logic.data_generator import DataGenerator
+from src.logic.schema_registry import SchemaEntry, get_schema_registry
+from src.utils.consts import (CBOR_FILE_EXT, CBOR_SEQ_FILE_EXT, JSON_FILE_EXT, JSONL_FILE_EXT, NDJSON_FILE_EXT, SCHEMAS_DIR_PATH)
+from src.utils.file_utils import update_file_extension
+from src.utils.json_utils import get_json_dumps
+from src.utils.metrics import span
+
+GEN_DATA_FORMATS = [JSON_FILE_EXT, NDJSON_FILE_EXT, JSONL_FILE_EXT, CBOR_FILE_EXT, CBOR_SEQ_FILE_EXT]
+DEFAULT_GEN_COUNT = 1
+
+# CBOR indefinite-length array header and its "break" terminator
+_CBOR_ARRAY_START = b'\x9f'
+_CBOR_BREAK = b'\xff'
+
+
+class CliDataGen():
+    """
+    Generates synthetic data from a schema, for load testing.  Records are written to the output one at a time, so
+    the size of what is generated is not bounded by memory: a JSON array or CBOR indefinite-length array when more
+    than one record is generated as JSON or CBOR, one record per line for NDJSON / JSON Lines, and a plain
+    concatenation of CBOR items for a CBOR Sequence.
+    """
+
+    schema_filename: str = None
+    root: str = None
+    count: int = DEFAULT_GEN_COUNT
+    seed: int = None
+    data_format: str = JSON_FILE_EXT
+    invalid_fraction: float = 0.0
+    generated_count: int = 0
+    invalid_count: int = 0
+    bytes_out: int = 0
+    elapsed: float = 0.0
+
+    def __init__(self, schema_filename: str, root: str = None, count: int = None, seed: int = None, data_format: str = None,
+                 invalid_fraction: float = None):
+        self.schema_filename = schema_filename
+        self.root = root
+        self.count = DEFAULT_GEN_COUNT if count is None else count
+        self.seed = seed
+        self.data_format = data_format or JSON_FILE_EXT
+        self.invalid_fraction = invalid_fraction or 0.0
+
+        if self.data_format not in GEN_DATA_FORMATS:
+            raise ValueError(f"Unsupported data format: {self.data_format}. Supported formats are: {GEN_DATA_FORMATS}")
+        if self.count < 0:
+            raise ValueError(f"Invalid record count: {self.count}. Expected 0 or more.")
+        if not 0 <= self.invalid_fraction <= 1:
+            raise ValueError(f"Invalid fraction of invalid records: {self.invalid_fraction}. Expected a number from 0 to 1.")
+
+    def output_filename(self) -> str:
+        """
+        Returns the name of the generated file: the schema's name, with the root type when one is chosen, and the format's extension.
+        """
+        name = os.path.splitext(update_file_extension(self.schema_filename, self.data_format))[0]
+        if self.root:
+            name = f"{name}_{self.root}"
+        return f"{name}.{self.data_format}"
+
+    def generate(self, out):
+        """
+        Generate the records, writing them to out, a binary file.
+        Yields the number of records written so far after each record, for progress, and keeps the counts, size and
+        elapsed seconds the summary reports.
+        """
+        schema_entry = self._load_schema()
+        generator = DataGenerator(schema_entry.schema_data, self.root, self.seed)
+        self.root = generator.root
+        encode = self._get_encoder()
+        # A single JSON or CBOR record is written as it is, more are wrapped in an array
+        wrapped = self.data_format in (JSON_FILE_EXT, CBOR_FILE_EXT) and self.count != 1
+
+        start = time.perf_counter()
+        self.generated_count = 0
+        self.invalid_count = 0
+        self.bytes_out = 0
+
+        if wrapped:
+            self._write(out, _CBOR_ARRAY_START if self.data_format == CBOR_FILE_EXT else b'[')
+        for record_no in range(1, self.count + 1):
+            if self.invalid_fraction and generator.rng.random() < self.invalid_fraction:
+                data = generator.generate_invalid()
+                self.invalid_count += 1
+            else:
+                data = generator.generate()
+
+            if wrapped and record_no > 1 and self.data_format == JSON_FILE_EXT:
+                self._write(out, b',\n')
+            with span("serialization"):
+                encoded = encode(data)
+            self._write(out, encoded)
+            self.generated_count += 1
+            yield record_no
+
+        if wrapped:
+            self._write(out, _CBOR_BREAK if self.data_format == CBOR_FILE_EXT else b']\n')
+        self.elapsed = time.perf_counter() - start
+
+    def summary(self) -> dict:
+        """
+        Returns the record counts, the output size and the throughput of the last generate.
+        """
+        elapsed = self.elapsed or 1e-9
+        return {
+            'records': self.generated_count,
+            'valid': self.generated_count - self.invalid_count,
+            'invalid': self.invalid_count,
+            'bytes_out': self.bytes_out,
+            'seconds': round(self.elapsed, 3),
+            'records_per_sec': round(self.generated_count / elapsed, 1),
+            'mb_per_sec': round(self.bytes_out / (1024 * 1024) / elapsed, 2)
+        }
+
+    def _write(self, out, chunk: bytes):
+        with span("write_output"):
+            out.write(chunk)
+        self.bytes_out += len(chunk)
+
+    def _get_encoder(self):
+        if self.data_format in (CBOR_FILE_EXT, CBOR_SEQ_FILE_EXT):
+            return cbor2.dumps
+
+        dumps = get_json_dumps()
+        if self.data_format in (NDJSON_FILE_EXT, JSONL_FILE_EXT) or self.count == 1:
+            return lambda data: (dumps(data) + '\n').encode('utf-8')
+        return lambda data: dumps(data).encode('utf-8')
+
+    def _load_schema(self) -> SchemaEntry:
+        try:
+            schema_entry = get_schema_registry().load(SCHEMAS_DIR_PATH, self.schema_filename)
+        except Exception as e:
+            raise ValueError(f"Schema Invalid - {e}")
+
+        if schema_entry is None:
+            raise ValueError(f"Schema {self.schema_filename} not found.  Double check the schemas folder and filename.")
+        check_schema(schema_entry, self.schema_filename)
+
+        return schema_entry
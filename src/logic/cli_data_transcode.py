@@ -0,0 +1,180 @@
+import os
+import time
+
+import cbor2
+
+from src.api import DATA_ENCODINGS, transcode_instance
+from src.logic.schema_registry import SchemaEntry, get_schema_registry
+from src.utils.consts import (CBOR_FILE_EXT, CBOR_SEQ_FILE_EXT, DATA_DIR_PATH, JSON_FILE_EXT, JSONL_FILE_EXT, NDJSON_FILE_EXT,
+                              SCHEMAS_DIR_PATH, STDIN_FILENAME, VALID_STREAM_DATA_FORMATS, VERBOSE_CONST)
+from src.utils.file_utils import determine_file_type, get_filepath, iter_cbor_seq, iter_json_lines, load_cbor, open_input, read_stdin, update_file_extension
+from src.utils.json_utils import get_json_dumps, get_json_loads
+from src.utils.metrics import span
+
+TRANSCODE_DATA_FORMATS = [JSON_FILE_EXT, CBOR_FILE_EXT] + VALID_STREAM_DATA_FORMATS
+
+
+class CliDataTranscode():
+    """
+    Converts a data file between the verbose, compact and concise encodings, reading and writing JSON or CBOR.
+    NDJSON / JSON Lines files and CBOR Sequences are converted one record at a time into NDJSON or a CBOR Sequence.
+    """
+
+    schema_filename: str = None
+    data_filename: str = None
+    convert_from: str = VERBOSE_CONST
+    convert_to: str = None
+    to_cbor: bool = False
+    data_format: str = None
+    root: str = None
+    converted_count: int = 0
+    failed_count: int = 0
+    bytes_in: int = None
+    bytes_out: int = 0
+    elapsed: float = 0.0
+
+    def __init__(self, schema_filename: str, data_filename: str, convert_to: str, convert_from: str = None,
+                 to_cbor: bool = False, data_format: str = None, root: str = None):
+        self.schema_filename = schema_filename
+        self.data_filename = data_filename
+        self.convert_to = convert_to
+        self.convert_from = convert_from or VERBOSE_CONST
+        self.to_cbor = to_cbor
+        self.root = root
+        # Taken from the file extension when not given, data read from stdin ('-') is JSON by default
+        self.data_format = data_format
+        if not data_format and data_filename:
+            self.data_format = JSON_FILE_EXT if data_filename == STDIN_FILENAME else determine_file_type(data_filename)
+
+    def is_stream(self) -> bool:
+        return self.data_format in VALID_STREAM_DATA_FORMATS
+
+    def output_format(self) -> str:
+        """
+        Returns the format written: CBOR or a CBOR Sequence with to_cbor, otherwise JSON or NDJSON.
+        NDJSON / JSON Lines input keeps its extension when written back as JSON.
+        """
+        if self.is_stream():
+            if self.to_cbor:
+                return CBOR_SEQ_FILE_EXT
+            return NDJSON_FILE_EXT if self.data_format == CBOR_SEQ_FILE_EXT else self.data_format
+        return CBOR_FILE_EXT if self.to_cbor else JSON_FILE_EXT
+
+    def output_filename(self) -> str:
+        return update_file_extension(self.data_filename, self.output_format())
+
+    def transcode(self, out):
+        """
+        Convert the data file, writing the converted data to out, a binary file.
+        Yields (record_no, error) for each record that could not be converted and keeps the counts, sizes and
+        elapsed seconds the summary reports.  A file that is not a stream is a single record.
+        """
+        for encoding in (self.convert_from, self.convert_to):
+            if encoding not in DATA_ENCODINGS:
+                raise ValueError(f"Invalid encoding: {encoding}. Expected any of {', '.join(DATA_ENCODINGS)}.")
+        if self.data_format not in TRANSCODE_DATA_FORMATS:
+            raise ValueError(f"Unsupported data format: {self.data_format}. Supported formats are: {TRANSCODE_DATA_FORMATS}")
+
+        filepath = get_filepath(DATA_DIR_PATH, self.data_filename)
+        if not filepath:
+            raise ValueError(f"Data {self.data_filename} not found.  Double check the data folder and filename.")
+        schema_entry = self._load_schema()
+
+        # Imported ahead of the clock, so the throughput covers the conversion only
+        import jadnutils.json.convert_compact, jadnutils.json.convert_concise, jadnutils.json.convert_verbose
+
+        start = time.perf_counter()
+        self.converted_count = 0
+        self.failed_count = 0
+        self.bytes_out = 0
+        # A stream on stdin is converted as it arrives, so its size is not known
+        self.bytes_in = os.path.getsize(filepath) if filepath != STDIN_FILENAME else None
+
+        encode = self._get_encoder()
+        # Records decoded from CBOR are validated as CBOR data
+        record_format = CBOR_FILE_EXT if self.data_format in (CBOR_FILE_EXT, CBOR_SEQ_FILE_EXT) else JSON_FILE_EXT
+        for record_no, data, error in self._iter_records(filepath):
+            if error is None:
+                try:
+                    transcoded = transcode_instance(schema_entry, data, self.convert_from, self.convert_to, self.root, record_format)
+                    with span("serialization"):
+                        converted = encode(transcoded)
+                    with span("write_output"):
+                        out.write(converted)
+                    self.bytes_out += len(converted)
+                    self.converted_count += 1
+                except Exception as e:
+                    error = e
+
+            if error is not None:
+                self.failed_count += 1
+                yield record_no, str(error)
+
+        if filepath == STDIN_FILENAME and not self.is_stream():
+            self.bytes_in = len(read_stdin())
+        self.elapsed = time.perf_counter() - start
+
+    def summary(self) -> dict:
+        """
+        Returns the record counts, the input and output sizes, their ratio and the throughput of the last transcode.
+        The ratio and MB/s are None when the input size is not known.
+        """
+        elapsed = self.elapsed or 1e-9
+        records = self.converted_count + self.failed_count
+        return {
+            'records': records,
+            'converted': self.converted_count,
+            'failed': self.failed_count,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'ratio': round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else None,
+            'seconds': round(self.elapsed, 3),
+            'records_per_sec': round(records / elapsed, 1),
+            'mb_per_sec': round(self.bytes_in / (1024 * 1024) / elapsed, 2) if self.bytes_in is not None else None
+        }
+
+    def _iter_records(self, filepath: str):
+        if self.data_format in (NDJSON_FILE_EXT, JSONL_FILE_EXT):
+            yield from iter_json_lines(filepath)
+        elif self.data_format == CBOR_SEQ_FILE_EXT:
+            yield from iter_cbor_seq(filepath)
+        elif self.data_format == CBOR_FILE_EXT:
+            try:
+                yield 1, load_cbor(filepath), None
+            except Exception as e:
+                yield 1, None, ValueError(f"Failed to decode data as CBOR: {e}")
+        else:
+            try:
+                with open_input(filepath) as file:
+                    with span("file_read"):
+                        raw = file.read()
+                    with span("parse"):
+                        data = get_json_loads()(raw)
+            except Exception as e:
+                yield 1, None, ValueError(f"Failed to parse data as JSON: {e}")
+                return
+            yield 1, data, None
+
+    def _get_encoder(self):
+        """
+        Returns a function encoding one converted record to bytes.  A CBOR Sequence is a plain concatenation of
+        CBOR items and NDJSON one compact JSON value per line.
+        """
+        if self.to_cbor:
+            return cbor2.dumps
+
+        dumps = get_json_dumps()
+        if self.is_stream():
+            return lambda data: (dumps(data) + '\n').encode('utf-8')
+        return lambda data: dumps(data).encode('utf-8')
+
+    def _load_schema(self) -> SchemaEntry:
+        try:
+            schema_entry = get_schema_registry().load(SCHEMAS_DIR_PATH, self.schema_filename)
+        except Exception as e:
+            raise ValueError(f"Data Invalid - {e}")
+
+        if schema_entry is None:
+            raise ValueError(f"Schema {self.schema_filename} not found.  Double check the schemas folder and filename.")
+
+        return schema_entry
@@ -1,57 +1,184 @@
-import json
-import jadnvalidation
-
-from src.utils.consts import DATA_DIR_PATH, VALID_DATA_FORMATS
-from src.utils.file_utils import determine_file_type, get_file
-from src.utils.gen_utils import get_schema_roots
+from src.utils.config import get_performance_config
+from src.utils.json_utils import get_json_loads
+from src.utils.metrics import span
+from src.utils.consts import CBOR_FILE_EXT, CBOR_SEQ_FILE_EXT, DATA_DIR_PATH, INCREMENTAL_DATA_FORMATS, JSON_FILE_EXT, STDIN_FILENAME, VALID_DATA_FORMATS, XML_FILE_EXT
+from src.utils.file_utils import determine_file_type, get_file, get_filepath, iter_cbor_seq, iter_json_lines, load_cbor, read_stdin
 from src.logic.cli_schema_validation import CliSchemaValidation
+from src.logic.schema_registry import SchemaEntry
+from src.api import match_root
 
 
 class CliDataValidation():
-    
+
     schema_filename: str = None
     data_filename: str = None
+    valid_count: int = 0
+    invalid_count: int = 0
+    root: str = None
+    data_format: str = None
+    matched_root: str = None
+    schema_entry: SchemaEntry = None
+    use_plan: bool = False
     errors: list = []
-    
-    def __init__(self, schema_filename, data_filename):
+
+    def __init__(self, schema_filename, data_filename, root = None, data_format = None):
         self.schema_filename = schema_filename
         self.data_filename = data_filename
+        self.root = root
+        # Taken from the file extension when not given, data read from stdin ('-') is JSON by default
+        self.data_format = data_format
+        if not data_format and data_filename:
+            self.data_format = JSON_FILE_EXT if data_filename == STDIN_FILENAME else determine_file_type(data_filename)
 
     def validate(self):
-        schema_validation = CliSchemaValidation(self.schema_filename)
-        schema_data = schema_validation.validate() 
-        
-        if schema_data is None:
-            raise ValueError(f"Schema {self.schema_filename} is not valid.  Cannot validate data without a valid schema.")
-        
+        file_format = self.data_format
+        if file_format in INCREMENTAL_DATA_FORMATS:
+            return self._validate_all_records()
+
+        schema_data, roots = self._load_schema()
+
+        if file_format == CBOR_FILE_EXT:
+            return self._validate_cbor(schema_data, roots)
+
         file_data = get_file(DATA_DIR_PATH, self.data_filename)
         if not file_data:
             raise ValueError(f"data for {self.data_filename} not found.  Double check the data folder and filename.")
-        
-        roots = get_schema_roots(schema_data)
-        if not roots:
-            raise ValueError(f"Schema {self.schema_filename} does not have a valid root.  Cannot validate data without a valid root.")
-        
-        file_format = determine_file_type(self.data_filename)
+
         if file_format not in VALID_DATA_FORMATS:
-            raise ValueError(f"Unsupported data format: {format}. Supported formats are: {VALID_DATA_FORMATS}")
-        
+            raise ValueError(f"Unsupported data format: {file_format}. Supported formats are: {VALID_DATA_FORMATS}")
+
         data = file_data[self.data_filename]
         if(isinstance(data, str)):
-            
+
             try:
-                data = json.loads(data)
+                with span("parse"):
+                    data = get_json_loads()(data)
             except Exception as e:
-                raise ValueError(f"Failed to parse data as JSON: {e}")            
-            
-            for root_item in roots:
-                try :
-                    j_validation = jadnvalidation.DataValidation(schema_data, root_item, data, file_format)
-                    j_validation.validate()
-                except Exception as e:
-                    raise ValueError(f"Data Invalid - {e}")
+                raise ValueError(f"Failed to parse data as JSON: {e}")
+
+            self._validate_data(schema_data, roots, data, file_format)
 
         else:
             raise ValueError(f"Data from {self.data_filename} is not a valid.")
-        
+
         return file_data[self.data_filename]
+
+    def validate_stream(self):
+        """
+        Validate a newline delimited JSON (NDJSON / JSON Lines) file or a CBOR Sequence one record at a time.
+        Each line / CBOR data item is one root instance, blank lines are skipped.
+        XML files are one root instance, validated one child element of the root at a time.
+        Yields (record_no, is_valid, error) per record, the line number for NDJSON and XML and the item number for CBOR,
+        and keeps a running valid / invalid count, only one record is held in memory at a time.
+        """
+        schema_data, roots = self._load_schema()
+
+        filepath = get_filepath(DATA_DIR_PATH, self.data_filename)
+        if not filepath:
+            raise ValueError(f"data for {self.data_filename} not found.  Double check the data folder and filename.")
+
+        self.valid_count = 0
+        self.invalid_count = 0
+        if self.data_format == XML_FILE_EXT:
+            yield from self._validate_xml_stream(schema_data, filepath, roots)
+            return
+
+        if self.data_format == CBOR_SEQ_FILE_EXT:
+            records, data_format, parse_message = iter_cbor_seq(filepath), CBOR_FILE_EXT, "Failed to decode item as CBOR"
+        else:
+            records, data_format, parse_message = iter_json_lines(filepath), JSON_FILE_EXT, "Failed to parse line as JSON"
+
+        for record_no, data, parse_error in records:
+            if parse_error is not None:
+                self.invalid_count += 1
+                yield record_no, False, f"{parse_message}: {parse_error}"
+                continue
+
+            try:
+                self._validate_data(schema_data, roots, data, data_format)
+                self.valid_count += 1
+                yield record_no, True, None
+            except Exception as e:
+                self.invalid_count += 1
+                yield record_no, False, str(e)
+
+    def _validate_xml_stream(self, schema_data, filepath, roots):
+        from src.logic.xml_stream_validation import XmlStreamValidation
+        if filepath == STDIN_FILENAME:
+            read_stdin() # Kept, a document the stream cannot handle is validated whole in a second pass
+        xml_validation = XmlStreamValidation(schema_data, filepath, roots)
+        for line_no, is_valid, error in xml_validation.validate():
+            self.matched_root = xml_validation.matched_root
+            if is_valid:
+                self.valid_count += 1
+            else:
+                self.invalid_count += 1
+                error = f"Data Invalid - {error}"
+            yield line_no, is_valid, error
+
+    def record_label(self) -> str:
+        """
+        Returns what the records of a stream are, 'item' for CBOR Sequences, 'element' for XML and 'line' for NDJSON.
+        """
+        if self.data_format == CBOR_SEQ_FILE_EXT:
+            return "item"
+        return "element" if self.data_format == XML_FILE_EXT else "line"
+
+    def record_position(self, record_no: int) -> str:
+        """
+        Returns where a streamed record is, e.g. 'Line 3', XML elements are numbered by the line they start on.
+        """
+        if self.data_format == XML_FILE_EXT:
+            return f"Element at line {record_no}"
+        return f"{self.record_label().capitalize()} {record_no}"
+
+    def _validate_cbor(self, schema_data, roots):
+        filepath = get_filepath(DATA_DIR_PATH, self.data_filename)
+        if not filepath:
+            raise ValueError(f"data for {self.data_filename} not found.  Double check the data folder and filename.")
+
+        try:
+            data = load_cbor(filepath)
+        except Exception as e:
+            raise ValueError(f"Failed to decode data as CBOR: {e}")
+
+        self._validate_data(schema_data, roots, data, CBOR_FILE_EXT)
+
+        return True
+
+    def _validate_all_records(self):
+        first_error = None
+        for record_no, is_valid, error in self.validate_stream():
+            if not is_valid and first_error is None:
+                first_error = f"{self.record_label()} {record_no}: {error}"
+
+        if first_error is not None:
+            raise ValueError(f"{self.invalid_count} of {self.valid_count + self.invalid_count} records invalid, first at {first_error}")
+
+        return {'valid': self.valid_count, 'invalid': self.invalid_count}
+
+    def _load_schema(self):
+        schema_validation = CliSchemaValidation(self.schema_filename)
+        schema_data = schema_validation.validate()
+
+        if schema_data is None:
+            raise ValueError(f"Schema {self.schema_filename} is not valid.  Cannot validate data without a valid schema.")
+
+        if self.root:
+            roots = [self.root]
+        else:
+            roots = schema_validation.entry.roots
+            if not roots:
+                raise ValueError(f"Schema {self.schema_filename} does not have a valid root.  Cannot validate data without a valid root.")
+
+        self.schema_entry = schema_validation.entry
+        self.use_plan = get_performance_config().compiled_validation
+
+        return schema_data, roots
+
+    def _validate_data(self, schema_data, roots, data, file_format):
+        """
+        Validate the data against the roots it could be an instance of, the data is valid if any of them match.
+        The matching root is kept in matched_root.
+        """
+        self.matched_root = match_root(self.schema_entry, data, file_format, [self.root] if self.root else None, self.use_plan)
@@ -0,0 +1,93 @@
+import os
+import time
+
+from src.logic.cli_data_validation import CliDataValidation
+from src.logic.cli_schema_validation import CliSchemaValidation
+from src.utils.consts import DATA_DIR_PATH, VALID_DATA_FORMATS
+from src.utils.dir_catalog import get_dir_catalog
+from src.utils.pool_utils import get_default_jobs, run_jobs
+
+
+def init_worker(schema_filename: str):
+    """
+    Process pool initializer, parses and meta-validates the schema once per worker.
+    Every file the worker validates afterwards hits the worker's schema registry.
+    """
+    try:
+        CliSchemaValidation(schema_filename).validate()
+    except Exception:
+        pass # Reported per file by validate_file
+
+def validate_file(schema_filename: str, data_filename: str) -> dict:
+    """
+    Validate a single data file, returning a result dict instead of raising so it can cross process boundaries.
+    """
+    result = {'filename': data_filename, 'valid': False, 'error': None, 'error_type': None, 'size': 0, 'elapsed': 0.0}
+    start = time.perf_counter()
+    try:
+        result['size'] = os.path.getsize(os.path.join(DATA_DIR_PATH, data_filename))
+        CliDataValidation(schema_filename, data_filename).validate()
+        result['valid'] = True
+    except Exception as e:
+        result['error'] = str(e)
+        result['error_type'] = type(e).__name__
+    result['elapsed'] = time.perf_counter() - start
+
+    return result
+
+
+class CliDataValidationBulk():
+
+    schema_filename: str = None
+    pattern: str = None
+    jobs: int = None
+    elapsed: float = 0.0
+    total_bytes: int = 0
+
+    def __init__(self, schema_filename: str, pattern: str = None, jobs: int = None):
+        self.schema_filename = schema_filename
+        self.pattern = pattern
+        self.jobs = jobs or get_default_jobs()
+
+    def find_files(self) -> list:
+        """
+        Returns the data filenames (relative to the data directory) matching the pattern, sorted.
+        Without a pattern, every file with a supported data format is returned.
+        """
+        if self.pattern:
+            # Sub directories are only scanned when the pattern reaches into them
+            return list(get_dir_catalog(DATA_DIR_PATH, recursive='/' in self.pattern).files(pattern=self.pattern))
+
+        return list(get_dir_catalog(DATA_DIR_PATH).files(VALID_DATA_FORMATS))
+
+    def validate(self) -> list:
+        """
+        Validate every matching data file against the schema.
+        Returns a list of result dicts in filename order.
+        """
+        # Fail fast on a bad schema, this also seeds the disk cache the workers read from
+        CliSchemaValidation(self.schema_filename).validate()
+
+        filenames = self.find_files()
+        if not filenames:
+            raise ValueError(f"No data files found in {DATA_DIR_PATH} matching {self.pattern or VALID_DATA_FORMATS}.")
+
+        start = time.perf_counter()
+        arg_lists = [(self.schema_filename, filename) for filename in filenames]
+        results = run_jobs(validate_file, arg_lists, self.jobs, initializer=init_worker, initargs=(self.schema_filename,))
+
+        self.elapsed = time.perf_counter() - start
+        self.total_bytes = sum(result['size'] for result in results)
+
+        return results
+
+    def throughput(self, results: list) -> dict:
+        elapsed = self.elapsed or 1e-9
+        return {
+            'files': len(results),
+            'passed': sum(1 for result in results if result['valid']),
+            'failed': sum(1 for result in results if not result['valid']),
+            'seconds': round(self.elapsed, 3),
+            'files_per_sec': round(len(results) / elapsed, 1),
+            'mb_per_sec': round(self.total_bytes / (1024 * 1024) / elapsed, 2)
+        }
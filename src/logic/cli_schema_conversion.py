@@ -1,101 +1,136 @@
-import json
-import jadn
+import copy
+import logging
 
-from jadnxml.builder.xsd_builder import XSDBuilder
-from jadnutils.html.html_converter import HtmlConverter
 from src.utils.consts import GV_FILE_EXT, HTML_FILE_EXT, JIDL_FILE_EXT, JSON_FILE_EXT, MARKDOWN_FILE_EXT, PLANT_UML_FILE_EXT, SCHEMAS_DIR_PATH, XSD_FILE_EXT
-from src.utils.file_utils import get_file
+from src.logic.schema_registry import get_schema_registry
+from src.api import translate_entry
+
+logger = logging.getLogger(__name__)
 
 class CliSchemaConversion():
     
     schema_filename: str = None
     convert_to: str = None
+    force: bool = False
+    from_cache: bool = False
     errors: list = []
     
-    def __init__(self, schema_filename: str, convert_to: str = None):
+    def __init__(self, schema_filename: str, convert_to: str = None, force: bool = False):
         self.schema_filename = schema_filename
         self.convert_to = convert_to
+        self.force = force
 
     def convert(self, opt = 'information'):
-        converted_schema = None
-        
-        schema_file_data = get_file(SCHEMAS_DIR_PATH, self.schema_filename)
-        if not schema_file_data:
-            raise ValueError(f"jadn schema {self.schema_filename} not found.  Double check the schema folder and filename.")
-        
         try:
-            schema_data_str = schema_file_data[self.schema_filename]
-            schema_data = json.loads(schema_data_str) # Ensure it's a valid JSON string
-            
-            # Validate and fix schema structure before conversion
-            self._validate_and_fix_schema(schema_data)
-            
-            if self.convert_to == GV_FILE_EXT:
-                gv_style = jadn.convert.diagram_style()
-                gv_style['format'] = 'graphviz'
-                gv_style['detail'] = opt
-                gv_style['attributes'] = True
-                gv_style['enums'] = 100
-                
-                converted_schema = jadn.convert.diagram_dumps(schema_data, gv_style)
-            
-            elif self.convert_to == HTML_FILE_EXT:
-                converter = HtmlConverter(schema_data)
-                converted_schema = converter.jadn_to_html(run_validation=False)    
-            
-            elif self.convert_to == JSON_FILE_EXT:
-                converted_schema = jadn.translate.json_schema_dumps(schema_data)
-            
-            elif self.convert_to == JIDL_FILE_EXT:
-                jidl_style = jadn.convert.jidl_style()
-                converted_schema = jadn.convert.jidl_dumps(schema_data, jidl_style)
-                
-            elif self.convert_to == MARKDOWN_FILE_EXT:
-                converted_schema = jadn.convert.markdown_dumps(schema_data)
-                
-            elif self.convert_to == PLANT_UML_FILE_EXT:
-                puml_style = jadn.convert.diagram_style()
-                puml_style['format'] = 'plantuml'
-                puml_style['detail'] = opt
-                puml_style['attributes'] = True
-                puml_style['enums'] = 100
-                converted_schema = jadn.convert.diagram_dumps(schema_data, puml_style)
-                
-            elif self.convert_to == XSD_FILE_EXT:
-                xsd_builder = XSDBuilder()
-                result = xsd_builder.convert_xsd_from_dict(schema_data)
-                if result and isinstance(result, tuple):
-                    converted_schema = result[0]
-                
+            schema_entry = get_schema_registry().load(SCHEMAS_DIR_PATH, self.schema_filename)
         except Exception as e:
             raise ValueError(f"Schema Invalid - {e}")
-        
+
+        if schema_entry is None:
+            raise ValueError(f"jadn schema {self.schema_filename} not found.  Double check the schema folder and filename.")
+
+        converted_schema, self.from_cache = translate_entry(schema_entry, self.convert_to, opt, self.force)
+
         return converted_schema
+
+
+def prepare_schema_data(schema_entry):
+    """
+    Returns the schema data ready for the converters, fixing up a private copy when needed.
+    """
+    # The parsed schema is shared through the registry, only fix up a private copy
+    schema_data = schema_entry.schema_data
+    if _needs_fix(schema_data):
+        schema_data = copy.deepcopy(schema_data)
+
+    # Validate and fix schema structure before conversion
+    return _validate_and_fix_schema(schema_data)
+
+def _needs_fix(schema_data):
+    """
+    Check if any type definition is missing elements that _validate_and_fix_schema would add.
+    """
+    types = schema_data.get('types', []) if isinstance(schema_data, dict) else []
+    return isinstance(types, list) and any(isinstance(type_def, list) and len(type_def) < 5 for type_def in types)
+
+def _validate_and_fix_schema(schema_data):
+    """
+    Validate and fix common schema structure issues that can cause conversion errors.
+    """
+    if not isinstance(schema_data, dict) or 'types' not in schema_data:
+        raise ValueError("Schema must be a dictionary with a 'types' key")
     
-    def _validate_and_fix_schema(self, schema_data):
-        """
-        Validate and fix common schema structure issues that can cause conversion errors.
-        """
-        if not isinstance(schema_data, dict) or 'types' not in schema_data:
-            raise ValueError("Schema must be a dictionary with a 'types' key")
-        
-        types = schema_data.get('types', [])
-        if not isinstance(types, list):
-            raise ValueError("Schema 'types' must be a list")
+    types = schema_data.get('types', [])
+    if not isinstance(types, list):
+        raise ValueError("Schema 'types' must be a list")
+    
+    # Fix type definitions that are missing the Fields array (index 4)
+    for i, type_def in enumerate(types):
+        if not isinstance(type_def, list):
+            raise ValueError(f"Type definition {i} must be a list")
         
-        # Fix type definitions that are missing the Fields array (index 4)
-        for i, type_def in enumerate(types):
-            if not isinstance(type_def, list):
-                raise ValueError(f"Type definition {i} must be a list")
+        # Each type definition should have at least 5 elements:
+        # [name, base_type, options, description, fields]
+        if len(type_def) < 5:
+            # Add missing elements with appropriate defaults
+            while len(type_def) < 4:
+                type_def.append('')  # Add empty description if missing
+            type_def.append([])  # Add empty fields array
             
-            # Each type definition should have at least 5 elements:
-            # [name, base_type, options, description, fields]
-            if len(type_def) < 5:
-                # Add missing elements with appropriate defaults
-                while len(type_def) < 4:
-                    type_def.append('')  # Add empty description if missing
-                type_def.append([])  # Add empty fields array
-                
-                print(f"Warning: Fixed malformed type definition '{type_def[0] if len(type_def) > 0 else 'Unknown'}' - added missing fields array")
-        
-        return schema_data
\ No newline at end of file
+            logger.warning(f"Fixed malformed type definition '{type_def[0] if len(type_def) > 0 else 'Unknown'}' - added missing fields array")
+    
+    return schema_data
+
+
+def build_schema_artifact(schema_data: dict, convert_to: str, opt: str = 'information'):
+    """
+    Convert fixed up schema data to a single output format, returns the converted text or None.
+    """
+    converted_schema = None
+
+    # The converter libraries are slow to import, each is only loaded for the formats that use it
+    if convert_to == GV_FILE_EXT:
+        import jadn
+        gv_style = jadn.convert.diagram_style()
+        gv_style['format'] = 'graphviz'
+        gv_style['detail'] = opt
+        gv_style['attributes'] = True
+        gv_style['enums'] = 100
+
+        converted_schema = jadn.convert.diagram_dumps(schema_data, gv_style)
+
+    elif convert_to == HTML_FILE_EXT:
+        from jadnutils.html.html_converter import HtmlConverter
+        converter = HtmlConverter(schema_data)
+        converted_schema = converter.jadn_to_html(run_validation=False)
+
+    elif convert_to == JSON_FILE_EXT:
+        import jadn
+        converted_schema = jadn.translate.json_schema_dumps(schema_data)
+
+    elif convert_to == JIDL_FILE_EXT:
+        import jadn
+        jidl_style = jadn.convert.jidl_style()
+        converted_schema = jadn.convert.jidl_dumps(schema_data, jidl_style)
+
+    elif convert_to == MARKDOWN_FILE_EXT:
+        import jadn
+        converted_schema = jadn.convert.markdown_dumps(schema_data)
+
+    elif convert_to == PLANT_UML_FILE_EXT:
+        import jadn
+        puml_style = jadn.convert.diagram_style()
+        puml_style['format'] = 'plantuml'
+        puml_style['detail'] = opt
+        puml_style['attributes'] = True
+        puml_style['enums'] = 100
+        converted_schema = jadn.convert.diagram_dumps(schema_data, puml_style)
+
+    elif convert_to == XSD_FILE_EXT:
+        from jadnxml.builder.xsd_builder import XSDBuilder
+        xsd_builder = XSDBuilder()
+        result = xsd_builder.convert_xsd_from_dict(schema_data)
+        if result and isinstance(result, tuple):
+            converted_schema = result[0]
+
+    return converted_schema
@@ -0,0 +1,65 @@
+import io
+import time
+
+from contextlib import redirect_stdout
+
+from src.logic.cli_schema_conversion import CliSchemaConversion
+from src.utils.consts import JADN_SCHEMA_FILE_EXT, SCHEMAS_DIR_PATH
+from src.utils.dir_catalog import get_dir_catalog
+from src.utils.file_utils import update_file_extension
+from src.utils.pool_utils import get_default_jobs, run_jobs
+
+
+def convert_file(schema_filename: str, convert_to: str, force: bool = False) -> dict:
+    """
+    Convert a single schema, returning a result dict instead of raising so it can cross process boundaries.
+    """
+    result = {'filename': schema_filename, 'output_filename': update_file_extension(schema_filename, convert_to),
+              'converted': None, 'cached': False, 'console': '', 'error': None, 'error_type': None, 'elapsed': 0.0}
+    start = time.perf_counter()
+    # The converters print progress, capture it so the caller can replay it in file order
+    console = io.StringIO()
+    try:
+        with redirect_stdout(console):
+            schema_conversion = CliSchemaConversion(schema_filename, convert_to, force)
+            result['converted'] = schema_conversion.convert()
+            result['cached'] = schema_conversion.from_cache
+    except Exception as e:
+        result['error'] = str(e)
+        result['error_type'] = type(e).__name__
+    result['console'] = console.getvalue()
+    result['elapsed'] = time.perf_counter() - start
+
+    return result
+
+
+class CliSchemaConversionBulk():
+
+    convert_to: str = None
+    jobs: int = None
+    force: bool = False
+    elapsed: float = 0.0
+
+    def __init__(self, convert_to: str, jobs: int = None, force: bool = False):
+        self.convert_to = convert_to
+        self.jobs = jobs or get_default_jobs()
+        self.force = force
+
+    def find_files(self) -> list:
+        """
+        Returns the JADN schema filenames in the schemas directory, sorted.
+        """
+        return list(get_dir_catalog(SCHEMAS_DIR_PATH).files((JADN_SCHEMA_FILE_EXT,)))
+
+    def convert(self) -> list:
+        """
+        Convert every JADN schema across the worker pool.
+        Returns a list of result dicts in filename order, the converted text is written by the caller.
+        """
+        filenames = self.find_files()
+
+        start = time.perf_counter()
+        results = run_jobs(convert_file, [(filename, self.convert_to, self.force) for filename in filenames], self.jobs)
+        self.elapsed = time.perf_counter() - start
+
+        return results
@@ -0,0 +1,125 @@
+import io
+import time
+
+from contextlib import redirect_stdout
+
+from src.logic.artifact_cache import VIS_OPTION_FORMATS, get_artifact_cache
+from src.logic.cli_schema_conversion import build_schema_artifact, prepare_schema_data
+from src.logic.schema_registry import get_schema_registry
+from src.utils.consts import INFORMATION_OPTION, SCHEMA_OUTPUT_FORMATS, SCHEMAS_DIR_PATH
+from src.utils.file_utils import update_file_extension
+from src.utils.pool_utils import get_default_jobs, run_jobs
+
+
+def emit_format(schema_data: dict, convert_to: str, opt: str) -> dict:
+    """
+    Run a single emitter on schema data that has already been fixed up, returning a result dict.
+    """
+    result = {'format': convert_to, 'converted': None, 'cached': False, 'console': '',
+              'error': None, 'error_type': None, 'elapsed': 0.0}
+    start = time.perf_counter()
+    console = io.StringIO()
+    try:
+        with redirect_stdout(console):
+            result['converted'] = build_schema_artifact(schema_data, convert_to, opt)
+    except Exception as e:
+        result['error'] = f"Schema Invalid - {e}"
+        result['error_type'] = type(e).__name__
+    result['console'] = console.getvalue()
+    result['elapsed'] = time.perf_counter() - start
+
+    return result
+
+
+def parse_formats(formats: str) -> list:
+    """
+    Returns the output formats named in a comma separated list, or every format for 'all'.
+    Raises a ValueError for an unknown format.
+    """
+    if formats == 'all':
+        return list(SCHEMA_OUTPUT_FORMATS)
+
+    names = [name.strip() for name in formats.split(',') if name.strip()]
+    unknown = [name for name in names if name not in SCHEMA_OUTPUT_FORMATS]
+    if unknown or not names:
+        raise ValueError(f"Invalid schema format(s): {', '.join(unknown) or formats}. Expected any of {', '.join(SCHEMA_OUTPUT_FORMATS)}.")
+
+    return list(dict.fromkeys(names))
+
+
+class CliSchemaConversionMulti():
+
+    schema_filename: str = None
+    formats: list = []
+    opt: str = INFORMATION_OPTION
+    jobs: int = None
+    force: bool = False
+    load_elapsed: float = 0.0
+    elapsed: float = 0.0
+
+    def __init__(self, schema_filename: str, formats: list, opt: str = None, jobs: int = None, force: bool = False):
+        self.schema_filename = schema_filename
+        self.formats = formats
+        self.opt = opt or INFORMATION_OPTION
+        self.jobs = jobs or get_default_jobs()
+        self.force = force
+
+    def convert(self) -> list:
+        """
+        Load, validate and fix the schema once, then emit every format from that copy across the worker pool.
+        Returns a list of result dicts in format order, the converted text is written by the caller.
+        """
+        start = time.perf_counter()
+        schema_registry = get_schema_registry()
+        try:
+            schema_entry = schema_registry.load(SCHEMAS_DIR_PATH, self.schema_filename)
+        except Exception as e:
+            raise ValueError(f"Schema Invalid - {e}")
+
+        if schema_entry is None:
+            raise ValueError(f"jadn schema {self.schema_filename} not found.  Double check the schema folder and filename.")
+
+        if not schema_registry.validate(schema_entry):
+            raise ValueError(f"Schema Invalid - {schema_entry.error}")
+
+        results = {}
+        artifact_cache = get_artifact_cache()
+        if artifact_cache and not self.force:
+            for convert_to in self.formats:
+                converted = artifact_cache.get(schema_entry.content_hash, convert_to, self.opt)
+                if converted is not None:
+                    results[convert_to] = {'format': convert_to, 'converted': converted, 'cached': True, 'console': '',
+                                           'error': None, 'error_type': None, 'elapsed': 0.0}
+
+        pending = [convert_to for convert_to in self.formats if convert_to not in results]
+        console = ''
+        if pending:
+            fix_console = io.StringIO()
+            with redirect_stdout(fix_console):
+                schema_data = prepare_schema_data(schema_entry)
+            console = fix_console.getvalue()
+        self.load_elapsed = time.perf_counter() - start
+
+        # The emitters are independent, each gets the same fixed up schema
+        emitted = run_jobs(emit_format, [(schema_data, convert_to, self._opt_for(convert_to)) for convert_to in pending], self.jobs) if pending else []
+        for result in emitted:
+            results[result['format']] = result
+            if artifact_cache and result['converted']:
+                artifact_cache.put(schema_entry.content_hash, result['format'], self.opt, result['converted'])
+        self.elapsed = time.perf_counter() - start
+
+        ordered = []
+        for convert_to in self.formats:
+            result = results[convert_to]
+            result['filename'] = self.schema_filename
+            result['output_filename'] = update_file_extension(self.schema_filename, convert_to)
+            ordered.append(result)
+
+        # The fix up warnings are shown once, ahead of the first format's output
+        if ordered:
+            ordered[0]['console'] = console + ordered[0]['console']
+
+        return ordered
+
+    def _opt_for(self, convert_to: str) -> str:
+        return self.opt if convert_to in VIS_OPTION_FORMATS else None
@@ -0,0 +1,61 @@
+import io
+import time
+
+from contextlib import redirect_stdout
+
+from src.logic.cli_schema_reverse_translate import SchemaReverseTranslate
+from src.utils.consts import JADN_SCHEMA_FILE_EXT, SCHEMAS_DIR_PATH
+from src.utils.dir_catalog import get_dir_catalog
+from src.utils.file_utils import update_file_extension
+from src.utils.pool_utils import get_default_jobs, run_jobs
+
+
+def translate_file(schema_filename: str) -> dict:
+    """
+    Reverse translate a single schema, returning a result dict instead of raising so it can cross process boundaries.
+    """
+    result = {'filename': schema_filename, 'output_filename': update_file_extension(schema_filename, JADN_SCHEMA_FILE_EXT),
+              'converted': None, 'console': '', 'error': None, 'error_type': None, 'elapsed': 0.0}
+    start = time.perf_counter()
+    # The converters print progress, capture it so the caller can replay it in file order
+    console = io.StringIO()
+    try:
+        with redirect_stdout(console):
+            result['converted'] = SchemaReverseTranslate(schema_filename).translate()
+    except Exception as e:
+        result['error'] = str(e)
+        result['error_type'] = type(e).__name__
+    result['console'] = console.getvalue()
+    result['elapsed'] = time.perf_counter() - start
+
+    return result
+
+
+class SchemaReverseTranslateBulk():
+
+    convert_from: str = None
+    jobs: int = None
+    elapsed: float = 0.0
+
+    def __init__(self, convert_from: str, jobs: int = None):
+        self.convert_from = convert_from
+        self.jobs = jobs or get_default_jobs()
+
+    def find_files(self) -> list:
+        """
+        Returns the schema filenames in the schemas directory with the given extension, sorted.
+        """
+        return list(get_dir_catalog(SCHEMAS_DIR_PATH).files((self.convert_from,)))
+
+    def translate(self) -> list:
+        """
+        Reverse translate every matching schema across the worker pool.
+        Returns a list of result dicts in filename order, the translated text is written by the caller.
+        """
+        filenames = self.find_files()
+
+        start = time.perf_counter()
+        results = run_jobs(translate_file, [(filename,) for filename in filenames], self.jobs)
+        self.elapsed = time.perf_counter() - start
+
+        return results
@@ -0,0 +1,254 @@
+import hmac
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import time
+
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from src.logic.schema_registry import get_schema_registry
+from src.api import convert_data, validate_data
+from src.utils.consts import CBOR_FILE_EXT, INFORMATION_OPTION, JSON_FILE_EXT, SCHEMAS_DIR_PATH
+from src.utils.serve_client import SERVE_COMMANDS, TOKEN_HEADER, get_serve_address, get_token_path, is_local_host, write_token
+
+MAX_REJECTED_BODY = 64 * 1024
+
+
+class JadnRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON over HTTP/1.1, connections are kept alive so a client can send many requests over one.
+
+    GET  /status     server, registry and request counters
+    POST /validate   {"schema", "data_file"} or {"schema", "data", "format"}
+    POST /convert    {"schema", "data_file"} or {"schema", "data"}, with "to": compact or concise
+    POST /translate  {"schema", "to", "detail", "force"}
+    POST /command    {"command", "args", "cwd"}, runs one of the SERVE_COMMANDS and returns its console output
+
+    Every request must name localhost in its Host header and carry the server's token in X-Jadn-Token, and a POST
+    must be application/json, so neither a page in a browser nor another local user can reach the endpoints.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        # Headers and body are written separately, without TCP_NODELAY small responses wait on delayed ACKs
+        self.disable_nagle_algorithm = self.server.address_family != socket.AF_UNIX
+        super().setup()
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        if self.path != "/status":
+            return self._send(404, {'error': f"Unknown path {self.path}"})
+        self._send(200, self.server.status())
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            return self._reject(415, f"Unsupported Content-Type {content_type or 'none'}, expected application/json.")
+
+        handler = self.server.routes.get(self.path)
+        if handler is None:
+            return self._send(404, {'error': f"Unknown path {self.path}"})
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("The request body must be a JSON object.")
+        except Exception as e:
+            return self._send(400, {'error': f"Invalid request: {e}", 'error_type': type(e).__name__})
+
+        start = time.perf_counter()
+        status, response = handler(request)
+        response['elapsed'] = round(time.perf_counter() - start, 6)
+        self.server.requests += 1
+        self._send(status, response)
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _authorized(self) -> bool:
+        if not is_local_host(self.headers.get('Host')):
+            self._reject(403, f"Host {self.headers.get('Host')} is not localhost.")
+            return False
+        if not hmac.compare_digest(self.headers.get(TOKEN_HEADER, '').encode('utf-8'), self.server.token.encode('utf-8')):
+            self._reject(401, f"Missing or invalid {TOKEN_HEADER}.")
+            return False
+        return True
+
+    def _reject(self, status: int, error: str):
+        # A small body is read and dropped, so the client gets the response, and the connection is closed
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            length = 0
+        if 0 < length <= MAX_REJECTED_BODY:
+            self.rfile.read(length)
+        self.close_connection = True
+        self._send(status, {'error': error})
+
+    def _send(self, status: int, response: dict):
+        body = json.dumps(response).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class JadnServerMixin():
+    """
+    Request handling shared by the TCP and Unix socket servers.
+    Requests are handled one at a time, in the process that holds the loaded libraries and parsed schemas.
+    """
+
+    def setup_jadn(self, cli, verbose: bool = False, token_file: str = None):
+        self.cli = cli
+        self.verbose = verbose
+        self.token_file = token_file or get_token_path()
+        self.token = write_token(self.token_file)
+        self.started = time.time()
+        self.requests = 0
+        self.routes = {
+            '/validate': self.handle_validate,
+            '/convert': self.handle_convert,
+            '/translate': self.handle_translate,
+            '/command': self.handle_command
+        }
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.token_file):
+            os.unlink(self.token_file)
+
+    def status(self) -> dict:
+        return {'pid': os.getpid(), 'cwd': os.getcwd(), 'uptime': round(time.time() - self.started, 3),
+                'requests': self.requests, 'schema_registry': get_schema_registry().stats()}
+
+    def handle_validate(self, request: dict) -> tuple:
+        if 'data' in request:
+            data = request['data']
+            data_format = request.get('format', JSON_FILE_EXT)
+            if data_format == CBOR_FILE_EXT and isinstance(data, str):
+                data = bytes.fromhex(data)
+            return self._run_api(request, lambda entry: validate_data(entry, data, data_format, request.get('root')))
+
+        from src.logic.cli_data_validation import CliDataValidation
+
+        def validate():
+            validation = CliDataValidation(request.get('schema'), request.get('data_file'), request.get('root'))
+            validation.validate()
+            return {'valid': True, 'root': validation.matched_root}
+
+        status, response = self._run(validate)
+        if response.get('error'):
+            response['valid'] = False
+        return status, response
+
+    def handle_convert(self, request: dict) -> tuple:
+        if 'data' in request:
+            return self._run_api(request, lambda entry: convert_data(entry, request['data'], request.get('to')))
+
+        from src.logic.cli_data_conversion import CliDataConversion
+
+        def convert():
+            conversion = CliDataConversion(request.get('schema'), request.get('data_file'), request.get('to'))
+            return {'converted': json.loads(conversion.convert() or "null")}
+
+        return self._run(convert)
+
+    def handle_translate(self, request: dict) -> tuple:
+        from src.logic.cli_schema_conversion import CliSchemaConversion
+
+        def translate():
+            conversion = CliSchemaConversion(request.get('schema'), request.get('to'), bool(request.get('force')))
+            converted = conversion.convert(request.get('detail') or INFORMATION_OPTION)
+            return {'converted': converted, 'cached': conversion.from_cache}
+
+        return self._run(translate)
+
+    def handle_command(self, request: dict) -> tuple:
+        command = request.get('command')
+        if request.get('cwd') and os.path.abspath(request['cwd']) != os.getcwd():
+            return 409, {'error': f"The server runs in {os.getcwd()}, not {request['cwd']}."}
+        if command not in SERVE_COMMANDS or not hasattr(self.cli, f"do_{command}"):
+            return 400, {'error': f"Command {command} cannot be run by the server."}
+
+        error_count = len(self.cli.error_list)
+        console = io.StringIO()
+        saved_stdin = sys.stdin
+        try:
+            # No terminal to prompt on, a command that asks for input reads an empty stdin and stops
+            sys.stdin = io.StringIO()
+            with redirect_stdout(console):
+                self.cli.run_command(command, request.get('args', ''))
+        except (Exception, SystemExit) as e:
+            console.write(f" - Command {command} stopped: {e or type(e).__name__}\n")
+        finally:
+            sys.stdin = saved_stdin
+
+        errors = self.cli.error_list[error_count:]
+        # Each request's errors go back in its response, the server does not keep them
+        del self.cli.error_list[error_count:]
+        return 200, {'output': console.getvalue(), 'errors': errors}
+
+    def _run_api(self, request: dict, func) -> tuple:
+        schema_filename = request.get('schema')
+        entry = get_schema_registry().load(SCHEMAS_DIR_PATH, schema_filename) if schema_filename else None
+        if entry is None:
+            return 200, {'error': f"jadn schema {schema_filename} not found.  Double check the schema folder and filename.", 'error_type': "ValueError"}
+        return 200, func(entry)
+
+    def _run(self, func) -> tuple:
+        try:
+            response = func()
+            response['error'] = None
+            return 200, response
+        except Exception as e:
+            return 200, {'error': str(e), 'error_type': type(e).__name__}
+
+
+class JadnHTTPServer(JadnServerMixin, HTTPServer):
+    pass
+
+
+class JadnUnixServer(JadnServerMixin, socketserver.UnixStreamServer):
+    pass
+
+
+def create_server(cli, host: str = None, port: int = None, socket_path: str = None, verbose: bool = False,
+                  token_file: str = None):
+    """
+    Returns a server bound to the Unix socket, when one is given or configured, or to the localhost TCP port.
+    A Unix socket is only accessible to its owner (0600), and a new token is written to the token file (0600).
+    """
+    address = get_serve_address(host, port, socket_path)
+    if isinstance(address, str):
+        if os.path.exists(address):
+            os.unlink(address) # Left behind by a server that did not shut down cleanly
+        # Created 0600, not made so after binding, so no other user can connect in between
+        umask = os.umask(0o177)
+        try:
+            server = JadnUnixServer(address, JadnRequestHandler)
+        finally:
+            os.umask(umask)
+    else:
+        if not is_local_host(address[0]):
+            raise ValueError(f"The server only listens on localhost, not {address[0]}.")
+        server = JadnHTTPServer(address, JadnRequestHandler)
+    server.setup_jadn(cli, verbose, token_file)
+    return server
@@ -0,0 +1,149 @@
+import fnmatch
+import os
+import time
+
+from src.logic.cli_data_validation_bulk import validate_file
+from src.logic.cli_schema_conversion_multi import CliSchemaConversionMulti, parse_formats
+from src.logic.cli_schema_validation import CliSchemaValidation
+from src.logic.schema_registry import get_schema_registry
+from src.utils.config import get_config_value
+from src.utils.consts import DATA_DIR_PATH, JADN_SCHEMA_FILE_EXT, SCHEMAS_DIR_PATH, VALID_DATA_FORMATS
+from src.utils.dir_catalog import get_dir_catalog
+from src.utils.file_watcher import create_watcher, wait_for_changes
+
+WATCH_SECTION = "watch"
+DEFAULT_WATCH_FORMATS = "json"
+DEFAULT_DEBOUNCE_MS = 300
+DEFAULT_POLL_INTERVAL_MS = 500
+
+
+class CliWatch():
+    """
+    Recomputes what a change to the schemas or data directory affects.
+
+    A changed schema is meta-validated, translated to the watch formats and the data files bound to it are
+    revalidated.  A changed data file is revalidated against the schemas it is bound to.  Bindings come from
+    the [watch.bindings] table of config.toml, schema filename -> data file glob(s).  Unchanged schemas stay
+    parsed in the schema registry between events.
+    """
+
+    formats: list = []
+    bindings: dict = {}
+    debounce: float = DEFAULT_DEBOUNCE_MS / 1000
+    poll_interval: float = DEFAULT_POLL_INTERVAL_MS / 1000
+    use_polling: bool = False
+    watcher = None
+
+    def __init__(self, formats: str = None, use_polling: bool = False):
+        settings = get_config_value(WATCH_SECTION, {}) or {}
+        formats = formats or settings.get('formats', DEFAULT_WATCH_FORMATS)
+        self.formats = parse_formats(formats if isinstance(formats, str) else ','.join(formats)) if formats else []
+        self.bindings = {schema: [patterns] if isinstance(patterns, str) else list(patterns)
+                         for schema, patterns in (settings.get('bindings') or {}).items()}
+        self.debounce = settings.get('debounce_ms', DEFAULT_DEBOUNCE_MS) / 1000
+        self.poll_interval = settings.get('poll_interval_ms', DEFAULT_POLL_INTERVAL_MS) / 1000
+        self.use_polling = use_polling
+
+    def start(self):
+        # Parse the schemas up front, so the first change only costs the work it affects
+        schema_registry = get_schema_registry()
+        for schema_filename in get_dir_catalog(SCHEMAS_DIR_PATH).files((JADN_SCHEMA_FILE_EXT,)):
+            try:
+                schema_registry.load(SCHEMAS_DIR_PATH, schema_filename)
+            except Exception:
+                pass # Reported when the schema changes or is validated
+        self.watcher = create_watcher([SCHEMAS_DIR_PATH, DATA_DIR_PATH], self.poll_interval, self.use_polling)
+
+    def stop(self):
+        if self.watcher:
+            self.watcher.close()
+            self.watcher = None
+
+    @property
+    def mode(self) -> str:
+        return type(self.watcher).__name__.replace('Watcher', '').lower() if self.watcher else None
+
+    def next_changes(self, timeout: float = None) -> list:
+        """
+        Waits for a debounced burst of changes and processes it.  Returns an empty list if nothing changed within timeout.
+        """
+        changed = wait_for_changes(self.watcher, self.debounce, timeout)
+        return self.process(changed) if changed else []
+
+    def process(self, changed_paths) -> list:
+        """
+        Processes the changed paths, schemas first so their data files are validated against the new version.
+        Returns a list of result dicts with the action (schema_v, schema_t, data_v), file, schema, ok, error and error_type.
+        """
+        schemas_dir = os.path.abspath(SCHEMAS_DIR_PATH)
+        data_dir = os.path.abspath(DATA_DIR_PATH)
+        changed_schemas = set()
+        changed_data = set()
+        for path in changed_paths:
+            path = os.path.abspath(path)
+            dir_path, filename = os.path.split(path)
+            if dir_path == schemas_dir and filename.endswith(f".{JADN_SCHEMA_FILE_EXT}"):
+                changed_schemas.add(filename)
+            elif dir_path == data_dir and filename.rsplit('.', 1)[-1] in VALID_DATA_FORMATS:
+                changed_data.add(filename)
+
+        results = []
+        revalidate = {} # data filename -> schemas to validate it against
+        for schema_filename in sorted(changed_schemas):
+            if not os.path.isfile(os.path.join(SCHEMAS_DIR_PATH, schema_filename)):
+                results.append(self._result('schema_v', schema_filename, schema_filename, False, "Schema removed.", None))
+                continue
+
+            schema_results = self.refresh_schema(schema_filename)
+            results.extend(schema_results)
+            if schema_results[0]['ok']:
+                for data_filename in self.bound_data_files(schema_filename):
+                    revalidate.setdefault(data_filename, set()).add(schema_filename)
+
+        for data_filename in changed_data:
+            if os.path.isfile(os.path.join(DATA_DIR_PATH, data_filename)):
+                revalidate.setdefault(data_filename, set()).update(self.bound_schemas(data_filename))
+
+        for data_filename in sorted(revalidate):
+            for schema_filename in sorted(revalidate[data_filename]):
+                result = validate_file(schema_filename, data_filename)
+                results.append(self._result('data_v', data_filename, schema_filename, result['valid'],
+                                            result['error'], result['error_type'], result['elapsed']))
+
+        return results
+
+    def refresh_schema(self, schema_filename: str) -> list:
+        """
+        Meta-validates a schema and regenerates its watch formats.  The first result is the validation's.
+        """
+        start = time.perf_counter()
+        try:
+            CliSchemaValidation(schema_filename).validate()
+        except Exception as e:
+            return [self._result('schema_v', schema_filename, schema_filename, False, str(e), type(e).__name__, time.perf_counter() - start)]
+        results = [self._result('schema_v', schema_filename, schema_filename, True, None, None, time.perf_counter() - start)]
+
+        if self.formats:
+            # A single worker, the emitters of one schema are too small to be worth a process pool
+            for conversion in CliSchemaConversionMulti(schema_filename, self.formats, jobs=1).convert():
+                result = self._result('schema_t', conversion['output_filename'], schema_filename,
+                                      bool(conversion['converted']) and not conversion['error'],
+                                      conversion['error'], conversion['error_type'], conversion['elapsed'])
+                result['converted'] = conversion['converted']
+                result['cached'] = conversion['cached']
+                results.append(result)
+
+        return results
+
+    def bound_data_files(self, schema_filename: str) -> list:
+        patterns = self.bindings.get(schema_filename, [])
+        catalog = get_dir_catalog(DATA_DIR_PATH)
+        return sorted({filename for pattern in patterns for filename in catalog.files(VALID_DATA_FORMATS, pattern)})
+
+    def bound_schemas(self, data_filename: str) -> list:
+        return [schema_filename for schema_filename, patterns in self.bindings.items()
+                if any(fnmatch.fnmatchcase(data_filename, pattern) for pattern in patterns)]
+
+    def _result(self, action, filename, schema_filename, ok, error, error_type, elapsed=0.0) -> dict:
+        return {'action': action, 'filename': filename, 'schema': schema_filename, 'ok': ok,
+                'error': error, 'error_type': error_type, 'elapsed': elapsed}
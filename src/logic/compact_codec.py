@@ -0,0 +1,170 @@
+"""
+Schema driven conversion of instances between the verbose encoding and the compact and concise ones.
+
+A verbose Record is an object keyed by field name (or field id with the '=' option), a compact or concise Record
+is the list of its field values by position, with null for a field left out and nothing after the last field
+present.  Concise data also keys Maps and Choices by field id and holds Enumerated item ids rather than names.
+Converting walks the schema's types from a root type, so nested values are converted wherever they are reached:
+fields, Array positions, ArrayOf items, MapOf keys and values and Choices.  Verbose data is converted to compact
+data, compact and concise data are expanded to verbose data.
+"""
+from jadnvalidation.models.jadn.jadn_type import is_field_multiplicity
+
+from src.utils.consts import COMPACT_CONST, CONCISE_CONST
+
+PRIMITIVE_TYPES = ["Binary", "Boolean", "Integer", "Number", "String"]
+# Compound base types can also be used anonymously, as the type of a field with its options
+ANONYMOUS_TYPES = ["ArrayOf", "MapOf"]
+
+
+class CompactCodec():
+
+    types: dict = None
+
+    def __init__(self, schema_data: dict):
+        if not isinstance(schema_data, dict) or not isinstance(schema_data.get('types'), list):
+            raise ValueError("Schema must be a dictionary with a 'types' list.")
+        self.types = {type_def[0]: type_def for type_def in schema_data['types']}
+
+    def compact(self, data, root: str):
+        """
+        Returns verbose data of the root type in the compact encoding.  Raises a ValueError if the data does not
+        have the shape of the root type.
+        """
+        return self._convert(self._root(root), [], data, False, False)
+
+    def expand(self, data, root: str, convert_from: str = COMPACT_CONST):
+        """
+        Returns compact or concise data of the root type in the verbose encoding.  Raises a ValueError if the data
+        does not have the shape of the root type.
+        """
+        if convert_from not in (COMPACT_CONST, CONCISE_CONST):
+            raise ValueError(f"Invalid encoding: {convert_from}. Expected {COMPACT_CONST} or {CONCISE_CONST}.")
+        return self._convert(self._root(root), [], data, True, convert_from == CONCISE_CONST)
+
+    def _root(self, root: str) -> str:
+        if root not in self.types:
+            raise ValueError(f"Root type {root} not found in the schema.")
+        return root
+
+    def _fields(self, type_def: list) -> list:
+        fields = type_def[4] if len(type_def) > 4 and isinstance(type_def[4], list) else []
+        # Inherited fields come first, from the type named by the extends (e) or restricts (r) option
+        for opt in type_def[2]:
+            if opt[:1] in ('e', 'r') and opt[1:] in self.types:
+                parent_fields = self._fields(self.types[opt[1:]])
+                names = {field[1] for field in fields}
+                fields = [field for field in parent_fields if field[1] not in names] + fields
+        return fields
+
+    def _convert(self, type_name: str, type_options: list, value, expand: bool, concise: bool):
+        if type_name in PRIMITIVE_TYPES:
+            return value
+        if type_name in ANONYMOUS_TYPES:
+            base_type, options, fields = type_name, type_options, []
+        else:
+            type_def = self.types.get(type_name)
+            if type_def is None:
+                raise ValueError(f"Type {type_name} not found in the schema.")
+            base_type, options, fields = type_def[1], list(type_def[2]) + list(type_options), self._fields(type_def)
+
+        # Primitives are the same in every encoding
+        convert = getattr(self, f"_convert_{base_type.lower()}", None)
+        if convert is None:
+            return value
+        return convert(type_name, options, fields, value, expand, concise)
+
+    def _convert_field(self, field: list, value, expand: bool, concise: bool):
+        field_opts = field[3] if len(field) > 3 else []
+        if is_field_multiplicity(field_opts) and isinstance(value, list):
+            # A repeated field can hold a single value, a compact Record is a list too
+            try:
+                return [self._convert(field[2], field_opts, item, expand, concise) for item in value]
+            except ValueError:
+                pass
+        return self._convert(field[2], field_opts, value, expand, concise)
+
+    def _convert_record(self, type_name: str, options: list, fields: list, value, expand: bool, concise: bool):
+        key = (lambda field: str(field[0])) if '=' in options else (lambda field: field[1])
+        if not expand:
+            _check_kind(type_name, value, dict)
+            unknown = set(value) - {key(field) for field in fields}
+            if unknown:
+                raise ValueError(f"{type_name} has no fields {', '.join(sorted(map(str, unknown)))}")
+            values = [self._convert_field(field, value[key(field)], False, False) if key(field) in value else None for field in fields]
+            while values and values[-1] is None:
+                values.pop()
+            return values
+
+        _check_kind(type_name, value, list)
+        if len(value) > len(fields):
+            raise ValueError(f"{type_name} has {len(fields)} fields, not {len(value)}")
+        return {key(field): self._convert_field(field, item, True, concise) for field, item in zip(fields, value) if item is not None}
+
+    def _convert_map(self, type_name: str, options: list, fields: list, value, expand: bool, concise: bool):
+        _check_kind(type_name, value, dict)
+        use_id = '=' in options
+        by_key = {str(field[0]) if use_id else field[1]: field for field in fields}
+        if expand and concise and not use_id:
+            # Concise data is keyed by field id, verbose data by name
+            by_id = {str(field[0]): field for field in fields}
+            converted = {}
+            for name, item in value.items():
+                field = by_id.get(str(name))
+                if field is None:
+                    converted[name] = item # Unknown keys are kept as they are, validation reports them
+                else:
+                    converted[field[1]] = self._convert_field(field, item, True, True)
+            return converted
+
+        # Unknown keys are kept as they are, validation reports them
+        return {name: self._convert_field(by_key[name], item, expand, concise) if name in by_key else item for name, item in value.items()}
+
+    def _convert_choice(self, type_name: str, options: list, fields: list, value, expand: bool, concise: bool):
+        # anyOf / allOf / oneOf Choices hold the value of one of their fields, which one is not known without validating
+        if any(opt[:1] == 'C' for opt in options):
+            return value
+        return self._convert_map(type_name, options, fields, value, expand, concise)
+
+    def _convert_enumerated(self, type_name: str, options: list, fields: list, value, expand: bool, concise: bool):
+        # Concise data holds item ids, the other encodings item names unless the type has the id option
+        if not (expand and concise) or '=' in options or isinstance(value, bool):
+            return value
+
+        derived = _option(options, '#') or _option(options, '>')
+        if derived in self.types:
+            fields = self._fields(self.types[derived])
+        names = {str(item[0]): item[1] for item in fields}
+        if isinstance(value, (int, str)) and str(value) in names:
+            return names[str(value)]
+        return value # Left to validation to report
+
+    def _convert_array(self, type_name: str, options: list, fields: list, value, expand: bool, concise: bool):
+        _check_kind(type_name, value, list)
+        return [self._convert_field(field, item, expand, concise) if item is not None else None for field, item in zip(fields, value)] + value[len(fields):]
+
+    def _convert_arrayof(self, type_name: str, options: list, fields: list, value, expand: bool, concise: bool):
+        _check_kind(type_name, value, list)
+        vtype = _option(options, '*', 'String')
+        return [self._convert(vtype, [], item, expand, concise) for item in value]
+
+    def _convert_mapof(self, type_name: str, options: list, fields: list, value, expand: bool, concise: bool):
+        ktype = _option(options, '+', 'String')
+        vtype = _option(options, '*', 'String')
+        if isinstance(value, dict):
+            # Only concise keys differ, Enumerated keys are item ids
+            convert_key = (lambda name: self._convert(ktype, [], name, True, True)) if expand and concise else (lambda name: name)
+            return {convert_key(name): self._convert(vtype, [], item, expand, concise) for name, item in value.items()}
+
+        # Keys other than Strings are written as a list of alternating keys and values
+        _check_kind(type_name, value, list)
+        return [self._convert(ktype if idx % 2 == 0 else vtype, [], item, expand, concise) for idx, item in enumerate(value)]
+
+
+def _option(options: list, key: str, default: str = None) -> str:
+    # The first occurrence of an option is kept, as jadnvalidation does
+    return next((opt[1:] for opt in options if isinstance(opt, str) and opt[:1] == key), default)
+
+def _check_kind(type_name: str, value, kind: type):
+    if not isinstance(value, kind):
+        raise ValueError(f"{type_name} expects {'an object' if kind is dict else 'an array'}, not {type(value).__name__}")
@@ -0,0 +1,498 @@
+"""
+Schema driven generator of synthetic data, for load testing.
+
+Instances are generated by walking the schema's types from a root type, in verbose JSON form: Records and Maps are
+objects keyed by field name (or field id with the '=' option), Arrays are positional lists, Choices hold a single
+field, Enumerateds are item names (or ids), ArrayOfs and MapOfs hold a number of items within their bounds.  Field
+cardinality, numeric and length bounds, formats and patterns are honoured.  The same schema, root and seed always
+give the same instances.
+"""
+import base64
+import random
+import re
+import string
+import uuid
+
+from jadnvalidation.models.jadn.jadn_type import is_field_multiplicity
+
+try:
+    import re._parser as sre_parse
+    from re._constants import (ANY, ASSERT, ASSERT_NOT, AT, BRANCH, CATEGORY, CATEGORY_DIGIT, CATEGORY_NOT_DIGIT, CATEGORY_NOT_SPACE,
+                               CATEGORY_NOT_WORD, CATEGORY_SPACE, CATEGORY_WORD, GROUPREF, IN, LITERAL, MAX_REPEAT, MIN_REPEAT,
+                               NEGATE, NOT_LITERAL, RANGE, SUBPATTERN)
+except ImportError: # Python < 3.11
+    import sre_parse
+    from sre_constants import (ANY, ASSERT, ASSERT_NOT, AT, BRANCH, CATEGORY, CATEGORY_DIGIT, CATEGORY_NOT_DIGIT, CATEGORY_NOT_SPACE,
+                               CATEGORY_NOT_WORD, CATEGORY_SPACE, CATEGORY_WORD, GROUPREF, IN, LITERAL, MAX_REPEAT, MIN_REPEAT,
+                               NEGATE, NOT_LITERAL, RANGE, SUBPATTERN)
+
+PRIMITIVE_TYPES = ["Binary", "Boolean", "Integer", "Number", "String"]
+# Compound base types can also be used anonymously, as the type of a field with its options
+ANONYMOUS_TYPES = ["ArrayOf", "MapOf"]
+
+# Beyond this depth optional fields are left out and repeated values hold their minimum number of items
+DEFAULT_MAX_DEPTH = 8
+# Upper bound on the items of an ArrayOf, MapOf or repeated field, when the schema allows more
+DEFAULT_MAX_ITEMS = 5
+# Upper bound on the length of generated strings, when the schema allows longer
+DEFAULT_MAX_STRING = 16
+
+# Bit widths of the sized integer formats, e.g. i8 and u16
+_INT_FORMAT_BITS = {'i8': 8, 'i16': 16, 'i32': 32, 'i64': 64, 'byte': 8, 'short': 16, 'int': 32, 'long': 64}
+_REPEAT_EXTRA = 4
+_WORD_CHARS = string.ascii_letters + string.digits + "_"
+_TEXT_CHARS = string.ascii_lowercase + string.digits
+# Unicode property classes, which Python's re does not parse, generate from their ASCII subset
+_PROPERTY_CLASS = re.compile(r"\\[pP]\{(\w+)\}")
+_PROPERTY_RANGES = {'L': "a-zA-Z", 'Lu': "A-Z", 'Ll': "a-z", 'N': "0-9", 'Nd': "0-9", 'P': "._\\-", 'Z': " ", 'Zs': " "}
+
+
+class DataGenerator():
+
+    schema_data: dict = None
+    types: dict = None
+    root: str = None
+    max_depth: int = DEFAULT_MAX_DEPTH
+    max_items: int = DEFAULT_MAX_ITEMS
+    max_string: int = DEFAULT_MAX_STRING
+    rng: random.Random = None
+
+    def __init__(self, schema_data: dict, root: str = None, seed: int = None, max_depth: int = None, max_items: int = None):
+        if not isinstance(schema_data, dict) or not isinstance(schema_data.get('types'), list):
+            raise ValueError("Schema must be a dictionary with a 'types' list.")
+
+        self.schema_data = schema_data
+        self.types = {type_def[0]: type_def for type_def in schema_data['types']}
+        roots = (schema_data.get('meta') or {}).get('roots') or []
+        self.root = root or (roots[0] if roots else None)
+        if self.root not in self.types:
+            raise ValueError(f"Root type {self.root} not found in the schema. Expected any of {', '.join(roots) or 'its types'}.")
+
+        self.max_depth = max_depth or DEFAULT_MAX_DEPTH
+        self.max_items = max_items or DEFAULT_MAX_ITEMS
+        self.rng = random.Random(seed)
+
+    def generate(self):
+        """
+        Returns one valid instance of the root type.
+        """
+        type_def = self.types[self.root]
+        return self._value(type_def[1], type_def[2], self._fields(type_def), 0)
+
+    def generate_invalid(self):
+        """
+        Returns one instance of the root type with a single value broken: a member of the root holds a value of
+        the wrong JSON type, or the root itself does when it has no members.
+        """
+        data = self.generate()
+        if isinstance(data, dict) and data:
+            key = self.rng.choice(sorted(data, key=str))
+            data[key] = self._break(data[key])
+            return data
+        if isinstance(data, list) and data:
+            idx = self.rng.randrange(len(data))
+            data[idx] = self._break(data[idx])
+            return data
+        return self._break(data)
+
+    def _break(self, value):
+        # Each replacement is rejected by every type the original value could have been generated for
+        if isinstance(value, bool):
+            return [value]
+        if isinstance(value, dict):
+            return [value]
+        if isinstance(value, list):
+            return {'invalid': value}
+        if isinstance(value, str):
+            return 12345
+        return "invalid"
+
+    def _fields(self, type_def: list) -> list:
+        fields = type_def[4] if len(type_def) > 4 and isinstance(type_def[4], list) else []
+        # Inherited fields come first, from the type named by the extends (e) or restricts (r) option
+        for opt in type_def[2]:
+            if opt[:1] in ('e', 'r') and opt[1:] in self.types:
+                parent_fields = self._fields(self.types[opt[1:]])
+                names = {field[1] for field in fields}
+                fields = [field for field in parent_fields if field[1] not in names] + fields
+        return fields
+
+    def _value(self, base_type: str, type_options: list, fields: list, depth: int):
+        opts = _parse_options(type_options)
+        if 'v' in opts:
+            return _const(base_type, opts['v'])
+
+        generate = getattr(self, f"_gen_{base_type.lower()}", None)
+        if generate is None:
+            raise ValueError(f"Unknown base type: {base_type}")
+        return generate(opts, fields, depth)
+
+    def _reference(self, type_name: str, type_options: list, depth: int):
+        """
+        Returns a value of a named type, field or item type options are merged over the referenced type's own.
+        """
+        if type_name in PRIMITIVE_TYPES or type_name in ANONYMOUS_TYPES:
+            return self._value(type_name, type_options, [], depth)
+
+        type_def = self.types.get(type_name)
+        if type_def is None:
+            raise ValueError(f"Type {type_name} not found in the schema.")
+        merged = list(type_def[2]) + [opt for opt in type_options if opt[:1] not in ('[', ']', '&', '<', 'K', 'L', 'N')]
+        return self._value(type_def[1], merged, self._fields(type_def), depth + 1)
+
+    def _field_value(self, field: list, depth: int):
+        field_opts = field[3] if len(field) > 3 else []
+        if is_field_multiplicity(field_opts):
+            opts = _parse_options(field_opts)
+            min_count = opts.get('[', 1)
+            max_count = opts.get(']', 1)
+            return [self._reference(field[2], field_opts, depth) for _ in range(self._count(min_count, max_count if max_count > 0 else None, depth))]
+        return self._reference(field[2], field_opts, depth)
+
+    def _include(self, field: list, depth: int) -> bool:
+        field_opts = field[3] if len(field) > 3 else []
+        if _parse_options(field_opts).get('[', 1) > 0:
+            return True
+        return depth < self.max_depth and self.rng.random() < 0.7
+
+    def _count(self, min_count: int, max_count: int, depth: int) -> int:
+        min_count = max(0, min_count or 0)
+        if depth >= self.max_depth:
+            return min_count
+        upper = min(max_count, min_count + self.max_items) if max_count is not None else min_count + self.max_items
+        return self.rng.randint(min_count, max(min_count, upper))
+
+    def _gen_boolean(self, opts: dict, fields: list, depth: int):
+        return self.rng.random() < 0.5
+
+    def _gen_integer(self, opts: dict, fields: list, depth: int):
+        low, high = _bounds(opts, 0, 1000)
+        fmt = opts.get('/')
+        if fmt in _INT_FORMAT_BITS or (fmt or '')[:1] in ('i', 'u') and (fmt or '')[1:].isdigit():
+            bits = _INT_FORMAT_BITS.get(fmt) or int(fmt[1:])
+            fmt_low, fmt_high = (0, 2 ** bits - 1) if fmt.startswith('u') else (-2 ** (bits - 1), 2 ** (bits - 1) - 1)
+            low, high = max(low, fmt_low), min(high, fmt_high)
+        elif fmt in ('positiveInteger',):
+            low = max(low, 1)
+        elif fmt in ('nonNegativeInteger',):
+            low = max(low, 0)
+        elif fmt in ('negativeInteger',):
+            low, high = min(low, -1000), min(high, -1)
+        elif fmt in ('nonPositiveInteger',):
+            low, high = min(low, -1000), min(high, 0)
+        return self.rng.randint(low, max(low, high))
+
+    def _gen_number(self, opts: dict, fields: list, depth: int):
+        low, high = _bounds(opts, 0, 1000)
+        return round(self.rng.uniform(low, max(low, high)), 3) + 0.0
+
+    def _gen_string(self, opts: dict, fields: list, depth: int):
+        # jadnvalidation also reads the numeric bounds of a String as bounds on its length
+        min_length = max([opts.get('{', 1), opts.get('w', 0), opts.get('y', -1) + 1])
+        max_lengths = [opts[key] for key in ('}', 'x') if key in opts] + ([opts['z'] - 1] if 'z' in opts else [])
+        max_length = min(max_lengths) if max_lengths else None
+
+        if '/' in opts:
+            value = self._format(opts['/'])
+            if value is not None:
+                return value
+        if '%' in opts:
+            value = self._pattern(opts['%'], min_length, max_length)
+            if value is not None:
+                return value
+        return self._text(min_length, max_length)
+
+    def _gen_binary(self, opts: dict, fields: list, depth: int):
+        fmt = opts.get('/')
+        if fmt in ('ipv4-addr', 'ipv6-addr', 'eui'):
+            return self._format(fmt)
+
+        min_length = opts.get('{', 1)
+        max_length = opts.get('}')
+        raw = self.rng.randbytes(self._length(min_length, max_length))
+        if fmt in ('x', 'X'):
+            return raw.hex()
+        if fmt == 'b64':
+            return base64.b64encode(raw).decode('ascii')
+        # Binary data read from JSON is checked as the UTF-8 bytes of the string
+        return self._text(min_length, max_length)
+
+    def _gen_enumerated(self, opts: dict, fields: list, depth: int):
+        items = fields
+        derived = opts.get('#') or opts.get('>')
+        if derived in self.types:
+            items = self._fields(self.types[derived])
+        if not items:
+            raise ValueError("Enumerated type has no items.")
+        item = self.rng.choice(items)
+        return item[0] if '=' in opts else item[1]
+
+    def _gen_choice(self, opts: dict, fields: list, depth: int):
+        if not fields:
+            raise ValueError("Choice type has no fields.")
+        field = self.rng.choice(fields)
+        # anyOf / allOf / oneOf Choices hold the value itself rather than a single keyed field
+        if 'C' in opts:
+            return self._field_value(field, depth)
+        return {str(field[0]) if '=' in opts else field[1]: self._field_value(field, depth)}
+
+    def _gen_record(self, opts: dict, fields: list, depth: int):
+        return {str(field[0]) if '=' in opts else field[1]: self._field_value(field, depth) for field in fields if self._include(field, depth)}
+
+    _gen_map = _gen_record
+
+    def _gen_array(self, opts: dict, fields: list, depth: int):
+        values = []
+        for field in fields:
+            # Positions are kept, an optional field can only be left out at the end
+            values.append(self._field_value(field, depth) if self._include(field, depth) else None)
+        while values and values[-1] is None:
+            values.pop()
+        return values
+
+    def _gen_arrayof(self, opts: dict, fields: list, depth: int):
+        vtype = opts.get('*', 'String')
+        count = self._count(opts.get('{', 0), opts.get('}'), depth)
+        items = []
+        seen = set()
+        for _ in range(count * 3 if 'q' in opts or 's' in opts else count):
+            item = self._reference(vtype, [], depth)
+            # Unique (q) and set (s) ArrayOfs hold distinct values
+            if 'q' in opts or 's' in opts:
+                key = repr(item)
+                if key in seen:
+                    continue
+                seen.add(key)
+            items.append(item)
+            if len(items) == count:
+                break
+        return items
+
+    def _gen_mapof(self, opts: dict, fields: list, depth: int):
+        ktype = opts.get('+', 'String')
+        vtype = opts.get('*', 'String')
+        count = self._count(opts.get('{', 0), opts.get('}'), depth)
+        key_type = ktype if ktype in PRIMITIVE_TYPES else self.types.get(ktype, [None, None])[1]
+
+        pairs = {}
+        for _ in range(count * 3):
+            key = self._reference(ktype, [], depth)
+            pairs.setdefault(key if key_type == 'String' else repr(key), (key, self._reference(vtype, [], depth)))
+            if len(pairs) == count:
+                break
+
+        if key_type == 'String':
+            return {key: value for key, value in pairs.values()}
+        # Keys other than Strings are written as a list of alternating keys and values
+        return [item for pair in pairs.values() for item in pair]
+
+    def _length(self, min_length: int, max_length: int) -> int:
+        min_length = max(0, min_length or 0)
+        upper = min(max_length, max(min_length, self.max_string)) if max_length is not None else max(min_length, self.max_string)
+        return self.rng.randint(min_length, max(min_length, upper))
+
+    def _text(self, min_length: int, max_length: int) -> str:
+        return ''.join(self.rng.choices(_TEXT_CHARS, k=self._length(min_length, max_length)))
+
+    def _pattern(self, pattern: str, min_length: int, max_length: int):
+        try:
+            parsed = sre_parse.parse(_ascii_properties(pattern))
+        except Exception:
+            return None
+        # A pattern can allow lengths the length bounds do not, a few tries usually find one that fits both
+        for _ in range(10):
+            value = ''.join(self._regex(parsed, {}))
+            if len(value) >= (min_length or 0) and (max_length is None or len(value) <= max_length) and value:
+                return value
+        return None
+
+    def _regex(self, parsed, groups: dict) -> list:
+        out = []
+        for op, arg in parsed:
+            if op == LITERAL:
+                out.append(chr(arg))
+            elif op == NOT_LITERAL:
+                out.append(self.rng.choice([char for char in _TEXT_CHARS if ord(char) != arg]))
+            elif op == ANY:
+                out.append(self.rng.choice(_TEXT_CHARS))
+            elif op == IN:
+                out.append(self._char_class(arg))
+            elif op == CATEGORY:
+                out.append(self._char_class([(CATEGORY, arg)]))
+            elif op == BRANCH:
+                out.extend(self._regex(self.rng.choice(arg[1]), groups))
+            elif op == SUBPATTERN:
+                text = self._regex(arg[-1], groups)
+                if arg[0] is not None:
+                    groups[arg[0]] = text
+                out.extend(text)
+            elif op in (MAX_REPEAT, MIN_REPEAT) or str(op) == 'POSSESSIVE_REPEAT':
+                low, high, sub = arg
+                high = min(high, low + _REPEAT_EXTRA)
+                for _ in range(self.rng.randint(low, max(low, high))):
+                    out.extend(self._regex(sub, groups))
+            elif op == GROUPREF:
+                out.extend(groups.get(arg, []))
+            elif op in (AT, ASSERT, ASSERT_NOT):
+                continue
+            else:
+                raise ValueError(f"Unsupported pattern element: {op}")
+        return out
+
+    def _char_class(self, items: list) -> str:
+        chars = []
+        negate = False
+        for op, arg in items:
+            if op == NEGATE:
+                negate = True
+            elif op == LITERAL:
+                chars.append(chr(arg))
+            elif op == RANGE:
+                low, high = arg
+                chars.extend(chr(code) for code in range(low, min(high, low + 255) + 1))
+            elif op == CATEGORY:
+                chars.extend({CATEGORY_DIGIT: string.digits, CATEGORY_NOT_DIGIT: string.ascii_letters,
+                              CATEGORY_WORD: _WORD_CHARS, CATEGORY_NOT_WORD: "-.!",
+                              CATEGORY_SPACE: " ", CATEGORY_NOT_SPACE: _WORD_CHARS}.get(arg, _TEXT_CHARS))
+        if negate:
+            excluded = set(chars)
+            chars = [char for char in _TEXT_CHARS if char not in excluded]
+        return self.rng.choice(chars or _TEXT_CHARS)
+
+    def _format(self, fmt: str):
+        """
+        Returns a string in a semantic format, or None for a format the generator does not know.
+        """
+        rng = self.rng
+        word = lambda length=8: ''.join(rng.choices(string.ascii_lowercase, k=length))
+        date = f"{rng.randint(1970, 2037):04d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        time = f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}"
+        ipv4 = '.'.join(str(rng.randint(1, 254)) for _ in range(4))
+        ipv6 = ':'.join(f"{rng.getrandbits(16):x}" for _ in range(8))
+
+        formats = {
+            'date-time': lambda: f"{date}T{time}Z",
+            'date': lambda: date,
+            'time': lambda: time,
+            'duration': lambda: f"P{rng.randint(1, 30)}DT{rng.randint(0, 23)}H",
+            'dayTimeDuration': lambda: f"P{rng.randint(1, 30)}DT{rng.randint(0, 23)}H",
+            'yearMonthDuration': lambda: f"P{rng.randint(1, 10)}Y{rng.randint(1, 11)}M",
+            'gYear': lambda: date[:4],
+            'gYearMonth': lambda: date[:7],
+            'gMonthDay': lambda: f"--{date[5:]}",
+            'email': lambda: f"{word()}@{word()}.com",
+            'idn-email': lambda: f"{word()}@{word()}.com",
+            'hostname': lambda: f"{word()}.example.com",
+            'idn-hostname': lambda: f"{word()}.example.com",
+            'ipv4': lambda: ipv4,
+            'ipv4-addr': lambda: ipv4,
+            'ipv4-net': lambda: f"{ipv4}/{rng.randint(8, 32)}",
+            'ipv6': lambda: ipv6,
+            'ipv6-addr': lambda: ipv6,
+            'ipv6-net': lambda: f"{ipv6}/{rng.randint(16, 128)}",
+            'eui': lambda: ':'.join(f"{rng.getrandbits(8):02x}" for _ in range(6)),
+            'uri': lambda: f"https://{word()}.example.com/{word()}",
+            'uri-reference': lambda: f"https://{word()}.example.com/{word()}",
+            'iri': lambda: f"https://{word()}.example.com/{word()}",
+            'iri-reference': lambda: f"https://{word()}.example.com/{word()}",
+            'uri-template': lambda: f"https://{word()}.example.com/{{{word(4)}}}",
+            'uuid': lambda: str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            'json-pointer': lambda: f"/{word()}/{word()}",
+            'relative-json-pointer': lambda: f"{rng.randint(0, 3)}/{word()}",
+            'regex': lambda: f"^{word(4)}[0-9]+$",
+            'language': lambda: rng.choice(["en", "en-US", "fr", "de-DE"]),
+            'name': lambda: word(),
+            'token': lambda: word(),
+            'normalizedString': lambda: f"{word()} {word()}",
+            'QName': lambda: f"{word(3)}:{word()}",
+        }
+        generate = formats.get(fmt)
+        return generate() if generate else None
+
+
+def _parse_options(options: list) -> dict:
+    """
+    Returns the options as a dict of option id to value, integer options are parsed.  The first occurrence of an
+    option is kept, as jadnvalidation does.
+    """
+    parsed = {}
+    for opt in options or []:
+        if not isinstance(opt, str) or not opt:
+            continue
+        key, value = opt[0], opt[1:]
+        if key in parsed:
+            continue
+        if key in ('{', '}', '[', ']'):
+            try:
+                value = int(value)
+            except ValueError:
+                continue
+        elif key in ('w', 'x', 'y', 'z'):
+            try:
+                value = float(value) if '.' in value else int(value)
+            except ValueError:
+                continue
+        parsed[key] = value
+    return parsed
+
+def _ascii_properties(pattern: str) -> str:
+    """
+    Returns the pattern with its \\p{..} classes replaced by ASCII ranges, bare or inside the class they are part of.
+    A negated or unknown property is left as is, the pattern then fails to parse and is not used.
+    """
+    out = []
+    in_class = False
+    pos = 0
+    while pos < len(pattern):
+        match = _PROPERTY_CLASS.match(pattern, pos)
+        if match and pattern[pos + 1] == 'p' and match.group(1) in _PROPERTY_RANGES:
+            ranges = _PROPERTY_RANGES[match.group(1)]
+            out.append(ranges if in_class else f"[{ranges}]")
+            pos = match.end()
+            continue
+        char = pattern[pos]
+        if char == '\\':
+            out.append(pattern[pos:pos + 2])
+            pos += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        out.append(char)
+        pos += 1
+
+    return ''.join(out)
+
+def _bounds(opts: dict, low: int, high: int) -> tuple:
+    """
+    Returns the inclusive (low, high) range of a number, from its inclusive (w, x) and exclusive (y, z) bounds.
+    The default range is moved to fit a bound given on one side only.
+    """
+    if 'w' in opts:
+        low = opts['w']
+    if 'y' in opts:
+        low = opts['y'] + 1
+    if 'x' in opts:
+        high = opts['x']
+    if 'z' in opts:
+        high = opts['z'] - 1
+    if ('w' in opts or 'y' in opts) and not ('x' in opts or 'z' in opts):
+        high = max(high, low + 1000)
+    if ('x' in opts or 'z' in opts) and not ('w' in opts or 'y' in opts):
+        low = min(low, high - 1000)
+    # jadnvalidation reads minLength / maxLength ({ }) on an Integer as bounds too
+    if '{' in opts:
+        low = max(low, opts['{'])
+    if '}' in opts:
+        high = min(high, opts['}'])
+    return low, high
+
+def _const(base_type: str, value: str):
+    if base_type == 'Integer':
+        return int(value)
+    if base_type == 'Number':
+        return float(value)
+    if base_type == 'Boolean':
+        return value.lower() == 'true'
+    return value
@@ -0,0 +1,149 @@
+import atexit
+import csv
+import os
+import sqlite3
+
+from src.utils.config import get_config_value
+from src.utils.consts import OUTPUT_DIR_PATH
+
+DEFAULT_ERROR_DB = os.path.join(OUTPUT_DIR_PATH, "jadn_cli_errors.db")
+DEFAULT_ERROR_BATCH_SIZE = 100
+DEFAULT_ERROR_PAGE_SIZE = 20
+EXPORT_FETCH_SIZE = 1000
+
+ERROR_COLUMNS = ['timestamp', 'command', 'schema', 'data_file', 'error_type', 'message']
+ERROR_FILTERS = ['command', 'schema', 'data_file', 'error_type']
+
+
+class ErrorStore():
+    """
+    Indexed SQLite store of the errors logged by CLI commands.
+
+    Errors are buffered and written in batches, a batch is flushed once it is full, when
+    the store is queried and when the process exits.  Queries filter by date range, command,
+    schema, data file or error type and are paged, CSV exports stream rows from a cursor
+    so neither needs the whole history in memory.
+    """
+
+    def __init__(self, db_path: str = None, batch_size: int = None):
+        self.db_path = db_path or get_config_value("error_db", DEFAULT_ERROR_DB)
+        self.batch_size = batch_size or DEFAULT_ERROR_BATCH_SIZE
+        self.pending = []
+        self.connection = None
+
+    def add(self, timestamp: str, command: str, error_type: str, message: str, schema: str = None, data_file: str = None):
+        self.pending.append((timestamp, command, schema, data_file, error_type, message))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write the buffered errors in a single transaction.  Returns the number written.
+        """
+        if not self.pending:
+            return 0
+
+        rows, self.pending = self.pending, []
+        connection = self._connect()
+        with connection:
+            connection.executemany(f"INSERT INTO errors ({', '.join(ERROR_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def count(self, **filters) -> int:
+        where, params = self._where(**filters)
+        self.flush()
+        return self._connect().execute(f"SELECT COUNT(*) FROM errors{where}", params).fetchone()[0]
+
+    def query(self, page: int = 1, page_size: int = None, **filters) -> list:
+        """
+        Returns one page of errors as dicts, newest first.  Pages start at 1.
+        """
+        page_size = page_size or DEFAULT_ERROR_PAGE_SIZE
+        where, params = self._where(**filters)
+        self.flush()
+        cursor = self._connect().execute(
+            f"SELECT {', '.join(ERROR_COLUMNS)} FROM errors{where} ORDER BY id DESC LIMIT ? OFFSET ?",
+            params + [page_size, (max(page, 1) - 1) * page_size])
+        return [dict(zip(ERROR_COLUMNS, row)) for row in cursor]
+
+    def export_csv(self, filepath: str, **filters) -> int:
+        """
+        Stream the matching errors, oldest first, to a CSV file with a header row.  Returns the number of rows written.
+        """
+        where, params = self._where(**filters)
+        self.flush()
+        cursor = self._connect().execute(f"SELECT {', '.join(ERROR_COLUMNS)} FROM errors{where} ORDER BY id", params)
+
+        count = 0
+        with open(filepath, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(ERROR_COLUMNS)
+            while True:
+                rows = cursor.fetchmany(EXPORT_FETCH_SIZE)
+                if not rows:
+                    break
+                writer.writerows(rows)
+                count += len(rows)
+        return count
+
+    def clear(self) -> int:
+        """
+        Remove every stored and buffered error.  Returns the number of stored errors removed.
+        """
+        self.pending = []
+        connection = self._connect()
+        with connection:
+            return connection.execute("DELETE FROM errors").rowcount
+
+    def close(self):
+        self.flush()
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.connection is None:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            self.connection = sqlite3.connect(self.db_path)
+            with self.connection:
+                self.connection.execute(
+                    "CREATE TABLE IF NOT EXISTS errors (id INTEGER PRIMARY KEY, timestamp TEXT NOT NULL, command TEXT, "
+                    "schema TEXT, data_file TEXT, error_type TEXT, message TEXT)")
+                for column in ['timestamp'] + ERROR_FILTERS:
+                    self.connection.execute(f"CREATE INDEX IF NOT EXISTS errors_{column} ON errors ({column})")
+        return self.connection
+
+    def _where(self, date_from: str = None, date_to: str = None, **filters) -> tuple:
+        """
+        Builds the WHERE clause for the filters.  Dates are ISO timestamps or days, a day as date_to includes the whole day.
+        """
+        clauses = []
+        params = []
+        if date_from:
+            clauses.append("timestamp >= ?")
+            params.append(date_from)
+        if date_to:
+            clauses.append("timestamp <= ?")
+            params.append(date_to + "T23:59:59" if len(date_to) == 10 else date_to)
+        for name in ERROR_FILTERS:
+            value = filters.get(name)
+            if value:
+                clauses.append(f"{name} = ?")
+                params.append(value)
+
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+_error_store = None
+
+def get_error_store() -> ErrorStore:
+    """
+    Returns the process wide error store, buffered errors are flushed when the process exits.
+    """
+    global _error_store
+    if _error_store is None:
+        _error_store = ErrorStore()
+        atexit.register(_error_store.close)
+    return _error_store
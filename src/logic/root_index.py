@@ -0,0 +1,144 @@
+from jadnvalidation.models.jadn.jadn_type import build_jadn_type_obj
+from jadnvalidation.utils.mapping_utils import get_inheritance, is_optional
+from jadnvalidation.utils.type_utils import get_schema_type_by_name
+
+# The python (JSON) data kinds each JADN base type accepts, Boolean coerces strings, 0 / 1 and null
+BASE_TYPE_KINDS = {
+    'Array': ('list',),
+    'ArrayOf': ('list',),
+    'Binary': ('str', 'bytes'),
+    'Boolean': ('bool', 'str', 'int', None),
+    'Choice': ('dict',),
+    'Enumerated': ('str', 'int'),
+    'Integer': ('int',),
+    'Map': ('dict',),
+    'MapOf': ('dict', 'list'),
+    'Number': ('float',),
+    'Record': ('dict',),
+    'String': ('str',)
+}
+ALL_KINDS = tuple({kind for kinds in BASE_TYPE_KINDS.values() for kind in kinds})
+
+
+class RootSignature():
+
+    __slots__ = ('name', 'base_type', 'required', 'names', 'is_choice', 'is_open')
+
+    def __init__(self, name: str, base_type: str, required: frozenset = None, names: frozenset = None, is_choice: bool = False,
+                 is_open: bool = False):
+        self.name = name
+        self.base_type = base_type
+        self.required = required # None when the fields are unknown (extended types, MapOf)
+        self.names = names
+        self.is_choice = is_choice
+        self.is_open = is_open # anyOf / allOf / oneOf Choices hold the value of a field, of any kind
+
+    def matches(self, keys: set) -> bool:
+        if self.names is None:
+            return True
+        if self.is_choice:
+            return len(keys) == 1 and keys <= self.names
+        return self.required <= keys and keys <= self.names
+
+
+class RootIndex():
+    """
+    Dispatch index over a schema's exported roots.
+
+    Each root is indexed by the JSON kind of data it accepts (object, array, string, ...) and,
+    for Records, Maps and Choices, by its top-level field names.  For a document the candidate
+    roots are found from its kind and keys, rather than validating it against every root.
+    """
+
+    def __init__(self, j_schema: dict, roots: list):
+        self.roots = list(roots or [])
+        self.by_kind = {}  # data kind -> [RootSignature]
+        self.by_field = {} # top-level field name -> [RootSignature] declaring it
+        self.open_keyed = [] # dict roots whose fields are not known, always candidates for objects
+        self.unknown = set() # roots not defined in the schema
+
+        j_types = j_schema.get('types') or []
+        for root in self.roots:
+            signature = self._build_signature(j_types, root)
+            if signature.base_type is None:
+                self.unknown.add(root)
+            kinds = ALL_KINDS if signature.is_open else BASE_TYPE_KINDS.get(signature.base_type, ())
+            for kind in kinds:
+                self.by_kind.setdefault(kind, []).append(signature)
+
+            if 'dict' in kinds:
+                if signature.names is None:
+                    self.open_keyed.append(signature)
+                else:
+                    for name in signature.names:
+                        self.by_field.setdefault(name, []).append(signature)
+
+    def _build_signature(self, j_types: list, root: str) -> RootSignature:
+        root_type = get_schema_type_by_name(j_types, root)
+        if root_type is None:
+            # Left to the validator to report
+            return RootSignature(root, None)
+
+        root_type_obj = build_jadn_type_obj(root_type)
+        base_type = root_type_obj.base_type
+        fields = root_type_obj.fields or []
+        type_options = root_type[2] if len(root_type) > 2 else []
+        if base_type == 'Choice' and any(opt[:1] == 'C' for opt in type_options):
+            return RootSignature(root, base_type, is_open=True)
+        if base_type not in ('Record', 'Map', 'Choice') or get_inheritance(root_type_obj.type_options) is not None:
+            return RootSignature(root, base_type)
+
+        # Types with the id option are keyed by field id, as a string in JSON
+        use_id = '=' in type_options
+        names = []
+        required = []
+        for field in fields:
+            field_obj = build_jadn_type_obj(field)
+            name = str(field[0]) if use_id else field_obj.type_name
+            names.append(name)
+            if not is_optional(field_obj):
+                required.append(name)
+
+        return RootSignature(root, base_type, frozenset(required), frozenset(names), base_type == 'Choice')
+
+    def candidates(self, data) -> list:
+        """
+        Returns the names of the roots the data could be an instance of, in export order.
+        Unknown roots are always kept so the validator can report them.
+        """
+        if len(self.roots) <= 1:
+            return list(self.roots)
+
+        kind = data_kind(data)
+        if kind == 'dict':
+            keys = set(data)
+            # Only roots declaring one of the document's keys can match, plus any with open fields
+            first_key = next(iter(keys), None)
+            signatures = self.by_field.get(first_key, []) if first_key is not None else self.by_kind.get('dict', [])
+            matched = {signature.name for signature in signatures if signature.matches(keys)}
+            matched.update(signature.name for signature in self.open_keyed)
+        else:
+            matched = {signature.name for signature in self.by_kind.get(kind, [])}
+
+        return [root for root in self.roots if root in matched or root in self.unknown]
+
+
+def data_kind(data) -> str:
+    """
+    Returns the JSON kind of a parsed value as used by the index, booleans are not integers here.
+    """
+    if isinstance(data, bool):
+        return 'bool'
+    if isinstance(data, dict):
+        return 'dict'
+    if isinstance(data, (list, tuple)):
+        return 'list'
+    if isinstance(data, int):
+        return 'int'
+    if isinstance(data, float):
+        return 'float'
+    if isinstance(data, str):
+        return 'str'
+    if isinstance(data, bytes):
+        return 'bytes'
+    return None
@@ -0,0 +1,207 @@
+import marshal
+import os
+import sys
+
+from src.utils.config import get_performance_config
+
+CACHE_FORMAT_VERSION = 1
+CACHE_ENTRY_EXT = ".marshal"
+SCHEMAS_CACHE_SUBDIR = "schemas"
+# A put that takes the cache past its cap prunes it to this fraction of the cap, so the puts after it do not scan again
+PRUNE_RATIO = 0.9
+
+
+def get_lib_version(lib_name: str) -> str:
+    """
+    Returns the installed version of a library, or 'unknown' if it is not installed.
+    """
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version(lib_name)
+    except PackageNotFoundError:
+        return "unknown"
+
+def file_size(path: str) -> int:
+    """
+    Returns the size of a file, 0 if it does not exist.
+    """
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+class SchemaDiskCache():
+    """
+    Content addressed, on-disk cache of schema meta-validation results.
+
+    Each entry holds the meta-validation verdict and the parsed schema serialized with marshal,
+    which loads much faster than json.  Entries are keyed by the schema content hash plus the
+    jadnvalidation, python and cache format versions, so upgrading any of them invalidates the entry.
+    The least recently used entries are removed once the cache grows past its size cap.  The directory
+    is scanned by the first put, later puts keep a running total and only scan again to prune.
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        if cache_dir is None:
+            cache_dir = get_performance_config().cache_dir
+        if max_bytes is None:
+            max_bytes = get_performance_config().cache_max_mb * 1024 * 1024
+
+        self.cache_dir = os.path.join(cache_dir, SCHEMAS_CACHE_SUBDIR)
+        self.max_bytes = max_bytes
+        self.current_bytes = None # Unknown until the first put scans the directory
+        self.key_suffix = f"-jv{get_lib_version('jadnvalidation')}-py{sys.version_info[0]}{sys.version_info[1]}-f{CACHE_FORMAT_VERSION}"
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, content_hash: str) -> dict:
+        """
+        Returns the cached record {'valid', 'error', 'schema'} for the schema hash, or None on a miss.
+        """
+        path = self._entry_path(content_hash)
+        try:
+            with open(path, 'rb') as file:
+                record = marshal.load(file)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            # Corrupt or truncated entry, drop it and treat as a miss
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        if not isinstance(record, dict) or record.get('format') != CACHE_FORMAT_VERSION:
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path) # Mark as recently used for eviction
+        except OSError:
+            pass
+
+        self.hits += 1
+        return record
+
+    def put(self, content_hash: str, schema_data: dict, is_valid: bool, error: str = None):
+        """
+        Store a schema's verdict and parsed structure, then enforce the size cap.
+        """
+        record = {
+            'format': CACHE_FORMAT_VERSION,
+            'valid': is_valid,
+            'error': error,
+            'schema': schema_data
+        }
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._entry_path(content_hash)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as file:
+                marshal.dump(record, file)
+            added = os.path.getsize(tmp_path) - file_size(path)
+            os.replace(tmp_path, path)
+        except (OSError, ValueError):
+            # Caching is best effort, the schema was still validated
+            return
+
+        self._track(added)
+
+    def prune(self, max_bytes: int = None) -> int:
+        """
+        Remove stale entries (other library / format versions) and evict the least recently
+        used entries until the cache is under max_bytes, its size cap by default.  Returns the number of entries removed.
+        """
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        removed = 0
+        entries = []
+        total = 0
+        for entry in self._scan():
+            if not entry.name.endswith(self.key_suffix + CACHE_ENTRY_EXT):
+                self._remove(entry.path)
+                removed += 1
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        entries.sort()
+        while total > max_bytes and entries:
+            _, size, path = entries.pop(0)
+            self._remove(path)
+            total -= size
+            removed += 1
+
+        self.current_bytes = total
+        return removed
+
+    def clear(self) -> int:
+        """
+        Remove every cached entry.  Returns the number of entries removed.
+        """
+        removed = 0
+        for entry in self._scan():
+            self._remove(entry.path)
+            removed += 1
+        self.current_bytes = 0
+        return removed
+
+    def stats(self) -> dict:
+        entries = 0
+        stale = 0
+        total = 0
+        for entry in self._scan():
+            entries += 1
+            total += entry.stat().st_size
+            if not entry.name.endswith(self.key_suffix + CACHE_ENTRY_EXT):
+                stale += 1
+
+        return {
+            'dir': self.cache_dir,
+            'entries': entries,
+            'stale': stale,
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def _entry_path(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, content_hash + self.key_suffix + CACHE_ENTRY_EXT)
+
+    def _track(self, added: int):
+        # Entries written by other processes are only counted by the next scan
+        if self.current_bytes is None or self.current_bytes + added > self.max_bytes:
+            self.prune(int(self.max_bytes * PRUNE_RATIO))
+        else:
+            self.current_bytes += added
+
+    def _scan(self):
+        try:
+            with os.scandir(self.cache_dir) as it:
+                return [entry for entry in it if entry.is_file() and entry.name.endswith(CACHE_ENTRY_EXT)]
+        except FileNotFoundError:
+            return []
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_schema_disk_cache = None
+
+def get_schema_disk_cache() -> SchemaDiskCache:
+    """
+    Returns the process wide disk cache, or None if it is disabled in the config.
+    """
+    global _schema_disk_cache
+    if _schema_disk_cache is None and get_performance_config().disk_cache:
+        _schema_disk_cache = SchemaDiskCache()
+    return _schema_disk_cache
@@ -0,0 +1,263 @@
+import hashlib
+import json
+import os
+import sys
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from src.logic.schema_disk_cache import SchemaDiskCache, get_schema_disk_cache
+from src.utils.config import get_performance_config
+from src.utils.consts import STDIN_FILENAME
+from src.utils.file_utils import read_stdin
+from src.utils.json_utils import get_json_loads
+from src.utils.gen_utils import get_schema_roots
+from src.utils.metrics import span
+
+# jadnvalidation is only imported once a schema is validated or compiled, see the methods below
+if TYPE_CHECKING:
+    from src.logic.compact_codec import CompactCodec
+    from src.logic.root_index import RootIndex
+    from src.logic.validation_plan import ValidationPlan
+
+
+class SchemaEntry():
+
+    path: str = None
+    content_hash: str = None
+    schema_data: dict = None
+    roots: list = None
+    is_valid: bool = None
+    error: str = None
+    size: int = 0
+    plans: dict = None # data format -> ValidationPlan
+    root_index: 'RootIndex' = None
+    compact_codec: 'CompactCodec' = None
+    registry: 'SchemaRegistry' = None # The registry holding the entry, validation verdicts are cached through it
+
+    def __init__(self, path: str, content_hash: str, schema_data: dict):
+        self.path = path
+        self.content_hash = content_hash
+        self.schema_data = schema_data
+        self.roots = get_schema_roots(schema_data)
+        self.size = deep_sizeof(schema_data)
+
+
+class SchemaRegistry():
+    """
+    In-process LRU cache of parsed JADN schemas.
+    Entries are keyed by file path + content hash and hold the parsed schema,
+    its roots and the meta-schema validation verdict once it has been computed.
+    When a disk cache is given, verdicts are persisted across processes.
+    """
+
+    def __init__(self, max_bytes: int = None, disk_cache: SchemaDiskCache = None):
+        if max_bytes is None:
+            max_bytes = get_performance_config().schema_cache_mb * 1024 * 1024
+
+        self.max_bytes = max_bytes
+        self.disk_cache = disk_cache
+        self.entries = OrderedDict()
+        self.stat_index = {} # path -> (mtime_ns, size, content_hash), skips re-reading unchanged files
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def load(self, dir_path: str, filename: str) -> SchemaEntry:
+        """
+        Returns the SchemaEntry for the given schema file, parsing it only if it is not cached.
+        Returns None if the file does not exist.  The filename '-' reads the schema from stdin.
+        """
+        if filename == STDIN_FILENAME:
+            return self.load_content(read_stdin())
+
+        path = os.path.abspath(os.path.join(dir_path, filename))
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        if not os.path.isfile(path):
+            return None
+
+        content_hash = None
+        raw = None
+        known = self.stat_index.get(path)
+        if known and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+            content_hash = known[2]
+        else:
+            with span("file_read"), open(path, 'rb') as file:
+                raw = file.read()
+            content_hash = hashlib.sha256(raw).hexdigest()
+            self.stat_index[path] = (stat.st_mtime_ns, stat.st_size, content_hash)
+
+        return self._get_entry(path, content_hash, raw)
+
+    def load_content(self, content) -> SchemaEntry:
+        """
+        Returns the SchemaEntry for a schema held in memory: JSON text, bytes or an already parsed dict.
+        Entries are keyed by content hash, so the same schema is only parsed and validated once.
+        A parsed dict is kept as is and must not be changed afterwards.
+        """
+        schema_data = None
+        if isinstance(content, dict):
+            schema_data = content
+            raw = json.dumps(content, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        elif isinstance(content, str):
+            raw = content.encode('utf-8')
+        elif isinstance(content, (bytes, bytearray, memoryview)):
+            raw = bytes(content)
+        else:
+            raise ValueError(f"A schema must be JSON text, bytes or a dict, not {type(content).__name__}.")
+
+        content_hash = hashlib.sha256(raw).hexdigest()
+        return self._get_entry(f"<memory:{content_hash[:16]}>", content_hash, raw, schema_data)
+
+    def validate(self, entry: SchemaEntry) -> bool:
+        """
+        Validates the schema against the JADN meta-schema, only once per entry.
+        Returns the cached verdict, the error message is kept on the entry.
+        """
+        if entry.is_valid is None:
+            from jadnvalidation import DataValidation
+            from jadnvalidation.data_validation.schemas.jadn_meta_schema import j_meta_schema, j_meta_roots
+
+            try:
+                with span("meta_validation"):
+                    j_validation = DataValidation(j_meta_schema, j_meta_roots, entry.schema_data)
+                    j_validation.validate()
+                entry.is_valid = True
+            except Exception as e:
+                entry.is_valid = False
+                entry.error = str(e)
+
+            if self.disk_cache:
+                self.disk_cache.put(entry.content_hash, entry.schema_data, entry.is_valid, entry.error)
+
+        return entry.is_valid
+
+    def get_plan(self, entry: SchemaEntry, data_format: str = 'json') -> 'ValidationPlan':
+        """
+        Returns the compiled validation plan for the schema and data format, compiled on first use and kept with the entry.
+        """
+        if entry.plans is None:
+            entry.plans = {}
+        plan = entry.plans.get(data_format)
+        if plan is None:
+            from src.logic.validation_plan import ValidationPlan
+            plan = entry.plans[data_format] = ValidationPlan(entry.schema_data, data_format)
+        return plan
+
+    def get_root_index(self, entry: SchemaEntry) -> 'RootIndex':
+        """
+        Returns the root dispatch index for the schema, built on first use and kept with the entry.
+        """
+        if entry.root_index is None:
+            from src.logic.root_index import RootIndex
+            entry.root_index = RootIndex(entry.schema_data, entry.roots)
+        return entry.root_index
+
+    def get_compact_codec(self, entry: SchemaEntry) -> 'CompactCodec':
+        """
+        Returns the verbose / compact codec for the schema, built on first use and kept with the entry.
+        """
+        if entry.compact_codec is None:
+            from src.logic.compact_codec import CompactCodec
+            entry.compact_codec = CompactCodec(entry.schema_data)
+        return entry.compact_codec
+
+    def clear(self):
+        self.entries.clear()
+        self.stat_index.clear()
+        self.current_bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+    def _get_entry(self, path: str, content_hash: str, raw: bytes, schema_data: dict = None) -> SchemaEntry:
+        key = (path, content_hash)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        record = self.disk_cache.get(content_hash) if self.disk_cache else None
+        if record is not None:
+            entry = SchemaEntry(path, content_hash, record['schema'])
+            entry.is_valid = record['valid']
+            entry.error = record['error']
+        else:
+            if schema_data is None:
+                if raw is None:
+                    with span("file_read"), open(path, 'rb') as file:
+                        raw = file.read()
+                with span("parse"):
+                    schema_data = get_json_loads()(raw.decode('utf-8'))
+            entry = SchemaEntry(path, content_hash, schema_data)
+
+        self._add(key, entry)
+
+        return entry
+
+    def _add(self, key, entry: SchemaEntry):
+        # Drop older versions of the same file, they can no longer be hit
+        for old_key in [k for k in self.entries if k[0] == key[0]]:
+            self.current_bytes -= self.entries.pop(old_key).size
+
+        entry.registry = self
+        self.entries[key] = entry
+        self.current_bytes += entry.size
+
+        # Always keep the newest entry, even if it alone exceeds the budget
+        while self.current_bytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.current_bytes -= evicted.size
+            self.evictions += 1
+
+
+def deep_sizeof(obj) -> int:
+    """
+    Approximate the memory used by a parsed JSON structure.
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k) + deep_sizeof(v) for k, v in obj.items())
+    elif isinstance(obj, list):
+        size += sum(deep_sizeof(i) for i in obj)
+    return size
+
+
+_schema_registry = None
+
+def get_schema_registry() -> SchemaRegistry:
+    """
+    Returns the process wide schema registry, created on first use.
+    """
+    global _schema_registry
+    if _schema_registry is None:
+        _schema_registry = SchemaRegistry(disk_cache=get_schema_disk_cache())
+    return _schema_registry
+
+_memory_registry = None
+
+def get_memory_registry() -> SchemaRegistry:
+    """
+    Returns the process wide registry of the schemas given to the in-memory API, created on first use.
+    It has no disk cache, so nothing about those schemas is read from or written to disk.
+    """
+    global _memory_registry
+    if _memory_registry is None:
+        _memory_registry = SchemaRegistry()
+    return _memory_registry
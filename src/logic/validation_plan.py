@@ -0,0 +1,578 @@
+from jadnvalidation.models.jadn.jadn_config import Jadn_Config, check_field_name, check_sys_char, check_type_name, get_j_config
+from jadnvalidation.models.jadn.jadn_type import Jadn_Type, build_j_type, build_jadn_type_obj, is_field_multiplicity, is_primitive, is_user_defined
+from jadnvalidation.utils.consts import JSON
+from jadnvalidation.utils.general_utils import create_clz_instance, create_regex, merge_opts
+from jadnvalidation.utils.mapping_utils import (
+    flip_to_array_of, get_const_val_str, get_format, get_inheritance, get_ktype, get_max_exclusive, get_max_inclusive,
+    get_max_length, get_max_occurs, get_min_exclusive, get_min_inclusive, get_min_length, get_min_occurs, get_pattern,
+    get_tagid, get_vtype, is_derived_enumeration, is_optional, use_field_ids
+)
+from jadnvalidation.utils.type_utils import get_reference_type, get_schema_type_by_name
+
+# Options that jadnvalidation parses as integers, a value that does not parse is left to jadnvalidation
+INT_OPTS = ('{', '}', '[', ']', 'w', 'x', 'y', 'z')
+
+
+class ValidationPlan():
+    """
+    A JADN schema compiled once into a graph of reusable validator objects, for decoded JSON or CBOR data.
+
+    Type references, field tables, enumeration values, patterns and numeric bounds are resolved
+    at compile time, so validating a document only walks the data.  The plan mirrors jadnvalidation's
+    verbose JSON rules; any type or option it does not compile natively (formats, inheritance, tagged
+    fields, Choice, Array, Map, Binary and null data) is delegated to the jadnvalidation class for that
+    node, so the verdicts are the same as jadnvalidation.DataValidation.
+    """
+
+    __slots__ = ('j_schema', 'j_config', 'data_format', 'nodes', 'roots')
+
+    def __init__(self, j_schema: dict, data_format: str = JSON):
+        self.j_schema = j_schema
+        self.data_format = data_format
+        self.j_config = get_j_config(j_schema)
+        self.nodes = {}
+        self.roots = {}
+
+    def validate(self, data, root: str):
+        """
+        Validate decoded data against a root type.  Raises a ValueError if the data is invalid.
+        """
+        node = self.roots.get(root)
+        if node is None:
+            node = self._compile_root(root)
+            self.roots[root] = node
+
+        try:
+            node.validate(data)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(e)
+
+        return True
+
+    def _compile_root(self, root: str):
+        try:
+            j_types = self.j_schema.get('types')
+            if j_types == None or j_types == []:
+                raise ValueError(f"No Types defined")
+
+            root_type = get_schema_type_by_name(j_types, root)
+            if root_type == None:
+                raise ValueError(f"Root Type not found {root}")
+
+            root_type_obj = build_jadn_type_obj(root_type)
+            check_type_name(root_type_obj.type_name, self.j_config.TypeName)
+        except Exception as e:
+            return ErrorNode(e)
+
+        return self.compile(root_type_obj.base_type, root_type_obj.type_name, root_type_obj.type_options, root_type_obj.fields)
+
+    def compile(self, base_type: str, type_name: str, type_options: list, fields: list = None):
+        """
+        Returns the validator for a resolved type, compiling it on first use.
+        Nodes are registered before their children are linked, so recursive types are supported.
+        """
+        type_options = list(type_options or [])
+        key = (base_type, type_name, tuple(type_options), id(fields))
+        node = self.nodes.get(key)
+        if node is not None:
+            return node
+
+        node_clz = NODE_TYPES.get(base_type)
+        if node_clz is None or not node_clz.can_compile(self, type_options, fields):
+            node = DelegateNode(self, base_type, type_name, type_options, fields)
+            self.nodes[key] = node
+            return node
+
+        node = node_clz(self, type_name, type_options, fields)
+        self.nodes[key] = node
+        node.link(self, type_options, fields)
+
+        return node
+
+    def compile_reference(self, type_name: str):
+        """
+        Compile a reference to a user defined type, the way jadnvalidation resolves ArrayOf / MapOf value types.
+        """
+        ref_type_obj = build_j_type(get_reference_type(self.j_schema, type_name))
+        return self.compile(ref_type_obj.base_type, ref_type_obj.type_name, ref_type_obj.type_options, ref_type_obj.fields)
+
+    def jadn_type(self, base_type: str, type_name: str, type_options: list, fields: list = None) -> Jadn_Type:
+        return Jadn_Type(type_name, base_type, type_options=list(type_options), fields=fields if fields is not None else [])
+
+
+def int_opts_ok(type_options: list) -> bool:
+    """
+    Check that the first occurrence of every integer option parses, as jadnvalidation only reads the first one.
+    """
+    seen = set()
+    for opt in type_options:
+        if not opt or opt[0] not in INT_OPTS or opt[0] in seen:
+            continue
+        seen.add(opt[0])
+        try:
+            int(opt[1:])
+        except ValueError:
+            return False
+    return True
+
+
+class ErrorNode():
+    """
+    Raises an error found while compiling, at the point jadnvalidation would raise it.
+    """
+
+    __slots__ = ('error',)
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+    def validate(self, data):
+        raise ValueError(self.error)
+
+
+class DelegateNode():
+    """
+    Validates a node with the jadnvalidation class for its base type.
+    """
+
+    __slots__ = ('plan', 'base_type', 'type_name', 'type_options', 'fields')
+
+    def __init__(self, plan: ValidationPlan, base_type: str, type_name: str, type_options: list, fields: list = None):
+        self.plan = plan
+        self.base_type = base_type
+        self.type_name = type_name
+        self.type_options = type_options
+        self.fields = fields
+
+    def validate(self, data):
+        # jadnvalidation mutates the type it is given, so build a fresh one per call
+        j_type = self.plan.jadn_type(self.base_type, self.type_name, self.type_options, self.fields)
+        clz_instance = create_clz_instance(class_name=self.base_type, j_schema=self.plan.j_schema, j_type=j_type, data=data, data_format=self.plan.data_format)
+        clz_instance.validate()
+
+
+class StringNode():
+
+    __slots__ = ('type_name', 'min_length', 'max_length', 'const', 'min_inclusive', 'max_inclusive', 'min_exclusive', 'max_exclusive', 'pattern', 'delegate')
+
+    @staticmethod
+    def can_compile(plan: ValidationPlan, type_options: list, fields: list) -> bool:
+        j_type = plan.jadn_type('String', '', type_options)
+        if not int_opts_ok(type_options) or get_format(j_type) is not None:
+            return False
+        pattern = get_pattern(j_type)
+        if pattern is not None:
+            try:
+                create_regex(pattern)
+            except Exception:
+                return False
+        return True
+
+    def __init__(self, plan: ValidationPlan, type_name: str, type_options: list, fields: list = None):
+        j_type = plan.jadn_type('String', type_name, type_options)
+        self.type_name = type_name
+        self.min_length = get_min_length(j_type)
+        self.max_length = get_max_length(j_type, plan.j_config)
+        self.const = get_const_val_str(j_type)
+        self.min_inclusive = get_min_inclusive(j_type)
+        self.max_inclusive = get_max_inclusive(j_type)
+        self.min_exclusive = get_min_exclusive(j_type)
+        self.max_exclusive = get_max_exclusive(j_type)
+        pattern = get_pattern(j_type)
+        self.pattern = create_regex(pattern) if pattern is not None else None
+        self.delegate = DelegateNode(plan, 'String', type_name, type_options)
+
+    def link(self, plan: ValidationPlan, type_options: list, fields: list):
+        pass
+
+    def validate(self, data):
+        if data is None:
+            return self.delegate.validate(data)
+        if not isinstance(data, str):
+            raise ValueError(f"Data for type {self.type_name} must be a string. Received: {type(data)}")
+
+        length = len(data)
+        if self.min_length is not None and length < self.min_length:
+            raise ValueError(f"String for type {self.type_name} length must be greater than {self.min_length}. Received: {length}")
+        if length > self.max_length:
+            raise ValueError(f"String for type {self.type_name} length must be less than {self.max_length}. Received: {length}")
+        if self.const is not None and data != self.const:
+            raise ValueError(f"String for type {self.type_name} value must be exactly {self.const}. Received: {data}")
+        if self.min_inclusive is not None and length < self.min_inclusive:
+            raise ValueError(f"String for type {self.type_name} length must be at least {self.min_inclusive}. Received: {length}")
+        if self.max_inclusive is not None and length > self.max_inclusive:
+            raise ValueError(f"String for type {self.type_name} length cannot be more than {self.max_inclusive}. Received: {length}")
+        if self.min_exclusive is not None and length < self.min_exclusive + 1:
+            raise ValueError(f"String for type {self.type_name} length must be more than {self.min_exclusive}. Received: {length}")
+        if self.max_exclusive is not None and length > self.max_exclusive - 1:
+            raise ValueError(f"String for type {self.type_name} length must be less than {self.max_exclusive}. Received: {length}")
+        if self.pattern is not None and data:
+            match = self.pattern.search(data)
+            # jadnvalidation treats an empty match as no match
+            if not match or not match.group():
+                raise ValueError(f"Match not found for pattern: {self.pattern.pattern}  Data: {data}")
+
+
+class IntegerNode():
+
+    __slots__ = ('type_name', 'min_val', 'max_val', 'min_inclusive', 'max_inclusive', 'min_exclusive', 'max_exclusive', 'delegate')
+
+    @staticmethod
+    def can_compile(plan: ValidationPlan, type_options: list, fields: list) -> bool:
+        return int_opts_ok(type_options) and get_format(plan.jadn_type('Integer', '', type_options)) is None
+
+    def __init__(self, plan: ValidationPlan, type_name: str, type_options: list, fields: list = None):
+        j_type = plan.jadn_type('Integer', type_name, type_options)
+        self.type_name = type_name
+        self.min_val = get_min_length(j_type)
+        self.max_val = get_max_length(j_type, plan.j_config)
+        self.min_inclusive = get_min_inclusive(j_type)
+        self.max_inclusive = get_max_inclusive(j_type)
+        self.min_exclusive = get_min_exclusive(j_type)
+        self.max_exclusive = get_max_exclusive(j_type)
+        self.delegate = DelegateNode(plan, 'Integer', type_name, type_options)
+
+    def link(self, plan: ValidationPlan, type_options: list, fields: list):
+        pass
+
+    def validate(self, data):
+        if data is None:
+            return self.delegate.validate(data)
+        if isinstance(data, bool):
+            raise ValueError(f"Data for type {self.type_name} must be of type integer, not Boolean. Received: {type(data)}")
+        if not isinstance(data, int):
+            raise ValueError(f"Data for type {self.type_name} must be of type integer. Received: {type(data)}")
+
+        if self.min_inclusive is not None and data < self.min_inclusive:
+            raise ValueError(f"Integer for type {self.type_name} must be greater than or equal to {self.min_inclusive}. Received: {data}")
+        if self.max_inclusive is not None and data > self.max_inclusive:
+            raise ValueError(f"Integer for type {self.type_name} must be less than or equal to {self.max_inclusive}. Received: {data}")
+        if self.min_exclusive is not None and data <= self.min_exclusive:
+            raise ValueError(f"Integer for type {self.type_name} must be greater than {self.min_exclusive}. Received: {data}")
+        if self.max_exclusive is not None and data >= self.max_exclusive:
+            raise ValueError(f"Integer for type {self.type_name} must be less than {self.max_exclusive}. Received: {data}")
+        if self.min_val is not None and data < self.min_val:
+            raise ValueError(f"Integer for type {self.type_name} must be greater than {self.min_val}. Received: {data}")
+        if self.max_val is not None and data > self.max_val:
+            raise ValueError(f"Integer for type {self.type_name} must be less than {self.max_val}. Received: {data}")
+
+
+class NumberNode():
+
+    __slots__ = ('type_name', 'min_inclusive', 'max_inclusive', 'min_exclusive', 'max_exclusive', 'delegate')
+
+    @staticmethod
+    def can_compile(plan: ValidationPlan, type_options: list, fields: list) -> bool:
+        return int_opts_ok(type_options) and get_format(plan.jadn_type('Number', '', type_options)) is None
+
+    def __init__(self, plan: ValidationPlan, type_name: str, type_options: list, fields: list = None):
+        j_type = plan.jadn_type('Number', type_name, type_options)
+        self.type_name = type_name
+        self.min_inclusive = get_min_inclusive(j_type)
+        self.max_inclusive = get_max_inclusive(j_type)
+        self.min_exclusive = get_min_exclusive(j_type)
+        self.max_exclusive = get_max_exclusive(j_type)
+        self.delegate = DelegateNode(plan, 'Number', type_name, type_options)
+
+    def link(self, plan: ValidationPlan, type_options: list, fields: list):
+        pass
+
+    def validate(self, data):
+        if data is None:
+            return self.delegate.validate(data)
+        if not isinstance(data, float):
+            raise ValueError(f"Data must be a float. Received: {type(data)}")
+
+        if self.min_inclusive is not None and data < self.min_inclusive:
+            raise ValueError(f"Number must be greater than or equal to {self.min_inclusive}. Received: {data}")
+        if self.max_inclusive is not None and data > self.max_inclusive:
+            raise ValueError(f"Number must be less than or equal to {self.max_inclusive}. Received: {data}")
+        if self.min_exclusive is not None and data <= self.min_exclusive:
+            raise ValueError(f"Number must be greater than {self.min_exclusive}. Received: {data}")
+        if self.max_exclusive is not None and data >= self.max_exclusive:
+            raise ValueError(f"Number must be less than {self.max_exclusive}. Received: {data}")
+
+
+class BooleanNode():
+
+    __slots__ = ()
+
+    @staticmethod
+    def can_compile(plan: ValidationPlan, type_options: list, fields: list) -> bool:
+        return True
+
+    def __init__(self, plan: ValidationPlan, type_name: str, type_options: list, fields: list = None):
+        pass
+
+    def link(self, plan: ValidationPlan, type_options: list, fields: list):
+        pass
+
+    def validate(self, data):
+        # jadnvalidation coerces any string, and the integers 0 and 1, to a boolean
+        if data is None or isinstance(data, (bool, str)):
+            return
+        if isinstance(data, int):
+            if data not in (0, 1):
+                raise ValueError(f"Data must be a boolean. Received: {type(data)}")
+            return
+        raise ValueError(f"Data must be a boolean, string or integer. Received: {type(data)}")
+
+
+class EnumeratedNode():
+
+    __slots__ = ('type_name', 'use_ids', 'values', 'max_string')
+
+    @staticmethod
+    def can_compile(plan: ValidationPlan, type_options: list, fields: list) -> bool:
+        if get_inheritance(type_options) is not None or is_derived_enumeration(type_options) is not None:
+            return False
+        try:
+            {(field[0], field[1]) for field in fields or []}
+        except Exception:
+            return False
+        return True
+
+    def __init__(self, plan: ValidationPlan, type_name: str, type_options: list, fields: list = None):
+        self.type_name = type_name
+        self.use_ids = use_field_ids(type_options)
+        self.values = frozenset(field[0] if self.use_ids else field[1] for field in fields or [])
+        self.max_string = plan.j_config.MaxString
+
+    def link(self, plan: ValidationPlan, type_options: list, fields: list):
+        pass
+
+    def validate(self, data):
+        if data is not None:
+            if self.use_ids and not isinstance(data, int):
+                raise ValueError(f"Data for type {self.type_name} must be an integer. Received: {type(data)}")
+            if not self.use_ids and not isinstance(data, str):
+                raise ValueError(f"Data for type {self.type_name} must be a string. Received: {type(data)}")
+
+        if data not in self.values:
+            raise ValueError(f"Data {data} not valid for Enumeration type '{self.type_name}'. ")
+
+        # The matched value is then validated as a plain Integer or String
+        if self.use_ids and isinstance(data, bool):
+            raise ValueError(f"Data for type {self.type_name} must be of type integer, not Boolean. Received: {type(data)}")
+        if not self.use_ids and len(data) > self.max_string:
+            raise ValueError(f"String for type {self.type_name} length must be less than {self.max_string}. Received: {len(data)}")
+
+
+class FieldSpec():
+
+    __slots__ = ('name', 'optional', 'node')
+
+    def __init__(self, name: str, optional: bool, node):
+        self.name = name
+        self.optional = optional
+        self.node = node
+
+
+class RecordNode():
+
+    __slots__ = ('type_name', 'min_length', 'max_length', 'fields', 'field_names')
+
+    @staticmethod
+    def can_compile(plan: ValidationPlan, type_options: list, fields: list) -> bool:
+        if not int_opts_ok(type_options) or get_inheritance(type_options) is not None:
+            return False
+        try:
+            for field in fields or []:
+                field_opts = field[3]
+                if not int_opts_ok(field_opts) or get_tagid(field_opts) is not None:
+                    return False
+                if is_user_defined(field[2]) and not is_field_multiplicity(field_opts):
+                    ref_type_obj = build_j_type(get_reference_type(plan.j_schema, field[2]))
+                    if get_tagid(merge_opts(field_opts, ref_type_obj.type_options)) is not None:
+                        return False
+        except Exception:
+            return False
+        return True
+
+    def __init__(self, plan: ValidationPlan, type_name: str, type_options: list, fields: list = None):
+        j_type = plan.jadn_type('Record', type_name, type_options)
+        self.type_name = type_name
+        self.min_length = get_min_length(j_type)
+        self.max_length = get_max_length(j_type, plan.j_config)
+        self.fields = ()
+        self.field_names = frozenset(field[1] for field in fields or [])
+
+    def link(self, plan: ValidationPlan, type_options: list, fields: list):
+        self.fields = tuple(self._compile_field(plan, field) for field in fields or [])
+
+    def _compile_field(self, plan: ValidationPlan, field: list) -> FieldSpec:
+        j_config: Jadn_Config = plan.j_config
+        j_field_obj = build_jadn_type_obj(field)
+        optional = is_optional(j_field_obj)
+
+        # Errors raised here are raised by jadnvalidation each time the field has data
+        try:
+            check_sys_char(j_field_obj.type_name, j_config.Sys)
+            check_field_name(j_field_obj.type_name, j_config.FieldName)
+
+            if is_field_multiplicity(j_field_obj.type_options):
+                j_field_obj = flip_to_array_of(j_field_obj, get_min_occurs(j_field_obj), get_max_occurs(j_field_obj, j_config))
+                node = plan.compile(j_field_obj.base_type, j_field_obj.type_name, j_field_obj.type_options)
+
+            elif is_user_defined(j_field_obj.base_type):
+                ref_type_obj = build_j_type(get_reference_type(plan.j_schema, j_field_obj.base_type))
+                check_type_name(ref_type_obj.type_name, j_config.TypeName)
+                merged_opts = merge_opts(j_field_obj.type_options, ref_type_obj.type_options)
+                node = plan.compile(ref_type_obj.base_type, ref_type_obj.type_name, merged_opts, ref_type_obj.fields)
+
+            else:
+                node = plan.compile(j_field_obj.base_type, j_field_obj.type_name, j_field_obj.type_options)
+
+        except Exception as e:
+            node = ErrorNode(e)
+
+        return FieldSpec(field[1], optional, node)
+
+    def validate(self, data):
+        if not isinstance(data, dict):
+            raise ValueError(f"Data for type {self.type_name} must be a record / dict. Received: {type(data)}")
+
+        if self.min_length is not None and len(data) < self.min_length:
+            raise ValueError(f"Number of fields for type {self.type_name} must be greater than {self.min_length}. Received: {len(data)}")
+        if self.max_length is not None and len(data) > self.max_length:
+            raise ValueError(f"Number of fields length for type {self.type_name} must be less than {self.max_length}. Received: {len(data)}")
+
+        for field in self.fields:
+            field_data = data.get(field.name)
+            if field_data is None:
+                if field.optional:
+                    continue
+                raise ValueError(f"Field '{field.name}' is missing from data")
+            field.node.validate(field_data)
+
+        if not self.field_names.issuperset(data):
+            unknown = [key for key in data if key not in self.field_names]
+            raise ValueError([f"Unknown data {key}." for key in unknown])
+
+
+class ArrayOfNode():
+
+    __slots__ = ('type_name', 'min_length', 'max_length', 'max_elements', 'item_node')
+
+    @staticmethod
+    def can_compile(plan: ValidationPlan, type_options: list, fields: list) -> bool:
+        return int_opts_ok(type_options)
+
+    def __init__(self, plan: ValidationPlan, type_name: str, type_options: list, fields: list = None):
+        j_type = plan.jadn_type('ArrayOf', type_name, type_options)
+        self.type_name = type_name
+        self.min_length = get_min_length(j_type)
+        self.max_length = get_max_length(j_type, plan.j_config)
+        self.max_elements = plan.j_config.MaxElements
+        self.item_node = None
+
+    def link(self, plan: ValidationPlan, type_options: list, fields: list):
+        vtype = get_vtype(plan.jadn_type('ArrayOf', self.type_name, type_options))
+        try:
+            if is_primitive(vtype):
+                self.item_node = plan.compile(vtype, "of_" + self.type_name, [])
+            else:
+                self.item_node = plan.compile_reference(vtype)
+        except Exception as e:
+            self.item_node = ErrorNode(e)
+
+    def validate(self, data):
+        if not isinstance(data, list):
+            raise ValueError(f"Data for type {self.type_name} must be a list. Received: {type(data)}")
+        if len(data) > self.max_elements:
+            raise ValueError(f"Data items for type {self.type_name} exceed the maximum limit of {self.max_elements}")
+        if self.min_length is not None and len(data) < self.min_length:
+            raise ValueError(f"Array length for type {self.type_name} must be greater than {self.min_length}. Received: {len(data)}")
+        if self.max_length is not None and len(data) > self.max_length:
+            raise ValueError(f"Array length for type {self.type_name} must be less than {self.max_length}. Received: {len(data)}")
+
+        item_validate = self.item_node.validate
+        for data_item in data:
+            item_validate(data_item)
+
+
+class MapOfNode():
+
+    __slots__ = ('type_name', 'min_length', 'max_length', 'max_elements', 'string_keys', 'key_node', 'value_node', 'error')
+
+    @staticmethod
+    def can_compile(plan: ValidationPlan, type_options: list, fields: list) -> bool:
+        return int_opts_ok(type_options)
+
+    def __init__(self, plan: ValidationPlan, type_name: str, type_options: list, fields: list = None):
+        j_type = plan.jadn_type('MapOf', type_name, type_options)
+        self.type_name = type_name
+        self.min_length = get_min_length(j_type)
+        self.max_length = get_max_length(j_type, plan.j_config)
+        self.max_elements = plan.j_config.MaxElements
+        self.string_keys = False
+        self.key_node = None
+        self.value_node = None
+        self.error = None
+
+    def link(self, plan: ValidationPlan, type_options: list, fields: list):
+        j_type = plan.jadn_type('MapOf', self.type_name, type_options)
+        ktype = get_ktype(j_type)
+        vtype = get_vtype(j_type)
+
+        try:
+            if is_user_defined(ktype):
+                key_type_obj = build_j_type(get_reference_type(plan.j_schema, ktype))
+                self.key_node = plan.compile(key_type_obj.base_type, key_type_obj.type_name, key_type_obj.type_options, key_type_obj.fields)
+                self.string_keys = key_type_obj.base_type == 'String'
+            elif is_primitive(ktype):
+                self.key_node = plan.compile(ktype, self.type_name.lower() + "_" + ktype.lower(), [])
+                self.string_keys = ktype == 'String'
+            else:
+                raise ValueError(f"Invalid MapOf ktype: {ktype}")
+
+            if is_user_defined(vtype):
+                self.value_node = plan.compile_reference(vtype)
+            elif is_primitive(vtype):
+                self.value_node = plan.compile(vtype, self.type_name.lower() + "_" + vtype.lower(), [])
+            else:
+                raise ValueError(f"Invalid MapOf vtype: {vtype}")
+
+        except Exception as e:
+            self.error = e
+
+    def validate(self, data):
+        if not isinstance(data, (list, dict)):
+            raise ValueError(f"Data must be a list / dict / object / record that contains an iterable structure. Received: {type(data)}")
+        max_elements = self.max_elements * 2 if isinstance(data, list) else self.max_elements
+        if len(data) > max_elements:
+            raise ValueError(f"Data items exceed the maximum limit of {self.max_elements}")
+        if self.min_length is not None and len(data) < self.min_length:
+            raise ValueError(f"Number of fields must be greater than {self.min_length}. Received: {len(data)}")
+        if self.max_length is not None and len(data) > self.max_length:
+            raise ValueError(f"Number of fields length must be less than {self.max_length}. Received: {len(data)}")
+        if self.error is not None:
+            raise ValueError(self.error)
+
+        if self.string_keys:
+            # JSON object, {"key1": value1, "key2": value2, ...}
+            if not isinstance(data, dict):
+                raise ValueError(f"Data for type {self.type_name} must be a dict when keys are Strings. Received: {type(data)}")
+            key_validate = self.key_node.validate
+            value_validate = self.value_node.validate
+            for data_key, data_val in data.items():
+                key_validate(data_key)
+                value_validate(data_val)
+        else:
+            # JSON array of alternating keys and values, [key1, value1, key2, value2, ...]
+            for i, data_item in enumerate(data):
+                (self.key_node if i % 2 == 0 else self.value_node).validate(data_item)
+
+
+NODE_TYPES = {
+    'ArrayOf': ArrayOfNode,
+    'Boolean': BooleanNode,
+    'Enumerated': EnumeratedNode,
+    'Integer': IntegerNode,
+    'MapOf': MapOfNode,
+    'Number': NumberNode,
+    'Record': RecordNode,
+    'String': StringNode
+}
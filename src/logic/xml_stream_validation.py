@@ -0,0 +1,253 @@
+import jadnvalidation
+
+from jadnvalidation.models.jadn.jadn_config import check_field_name, check_sys_char, check_type_name, get_j_config
+from jadnvalidation.models.jadn.jadn_type import Jadn_Type, build_j_type, build_jadn_type_obj, is_field_multiplicity, is_primitive, is_user_defined
+from jadnvalidation.utils.consts import XML
+from jadnvalidation.utils.general_utils import create_clz_instance, merge_opts
+from jadnvalidation.utils.mapping_utils import (
+    flip_to_array_of, get_inheritance, get_ktype, get_max_length, get_max_occurs, get_min_length, get_min_occurs,
+    get_tagid, get_vtype, is_optional
+)
+from jadnvalidation.utils.type_utils import get_reference_type, get_schema_type_by_name
+
+from src.utils.file_utils import iter_xml_elements, open_input
+
+
+class XmlStreamValidation():
+    """
+    Validates an XML data file against a JADN schema without loading the whole document.
+
+    The root element's children are read one at a time and validated as soon as they are complete, then released,
+    so memory is bounded by the largest child rather than the file size.  Children are items of an ArrayOf root,
+    entries of a MapOf root, or fields of a Record root.  Any other root type is validated on the whole document
+    by jadnvalidation.  Errors are reported at the line / column of the element they were found in.
+    """
+
+    def __init__(self, j_schema: dict, filepath: str, roots: list):
+        self.j_schema = j_schema
+        self.j_config = get_j_config(j_schema)
+        self.filepath = filepath
+        self.roots = roots
+        self.matched_root = None
+
+    def validate(self):
+        """
+        Yields (line, is_valid, error) per child of the root element, followed by any checks on the root as a whole.
+        """
+        elements = iter_xml_elements(self.filepath)
+        for event, tag, value, line, column in elements:
+            if event == 'error':
+                yield line, False, f"column {column}: Failed to parse XML: {value}"
+                return
+
+            if event == 'start':
+                if tag not in self.roots:
+                    yield line, False, f"column {column}: Root element <{tag}> does not match a schema root: {self.roots}"
+                    return
+                self.matched_root = tag
+                break
+        else:
+            yield 0, False, "No root element found in XML data"
+            return
+
+        root_type_obj = build_jadn_type_obj(get_schema_type_by_name(self.j_schema.get('types', []), self.matched_root))
+        check_type_name(root_type_obj.type_name, self.j_config.TypeName)
+
+        collector = self._build_collector(root_type_obj)
+        if collector is None:
+            # Not streamable, validated on the whole document
+            elements.close()
+            yield from self._validate_document()
+            return
+
+        for event, tag, value, line, column in elements:
+            if event == 'error':
+                yield line, False, f"column {column}: Failed to parse XML: {value}"
+                return
+
+            if event == 'item':
+                for error_line, error_column, error_tag, error in collector.add(tag, value, line, column):
+                    yield error_line, error is None, None if error is None else f"column {error_column}, <{error_tag}>: {error}"
+
+            elif event == 'end':
+                for error_line, error_column, error_tag, error in collector.finish():
+                    yield error_line, error is None, None if error is None else f"column {error_column}, <{error_tag}>: {error}"
+                for error in collector.check_root():
+                    yield line, False, f"column {column}, <{tag}>: {error}"
+
+    def _build_collector(self, root_type_obj: Jadn_Type):
+        base_type = root_type_obj.base_type
+        type_options = root_type_obj.type_options
+        if base_type == 'ArrayOf':
+            return ArrayOfCollector(self, root_type_obj)
+        if base_type == 'MapOf' and not any(opt.startswith('=') for opt in type_options):
+            ktype = get_ktype(root_type_obj)
+            if ktype == 'String' or (is_user_defined(ktype) and build_j_type(get_reference_type(self.j_schema, ktype)).base_type == 'String'):
+                return MapOfCollector(self, root_type_obj)
+        if base_type == 'Record' and get_inheritance(type_options) is None:
+            if all(get_tagid(field[3]) is None for field in root_type_obj.fields or []):
+                return RecordCollector(self, root_type_obj)
+        return None
+
+    def _validate_document(self):
+        with open_input(self.filepath) as file:
+            xml_data = file.read().decode('utf-8')
+        try:
+            jadnvalidation.DataValidation(self.j_schema, self.matched_root, xml_data, XML).validate()
+            yield 1, True, None
+        except Exception as e:
+            yield 1, False, str(e)
+
+    def validate_value(self, j_type: Jadn_Type, value):
+        # jadnvalidation changes the type it is given, so each value gets its own copy
+        j_type = Jadn_Type(j_type.type_name, j_type.base_type, type_options=list(j_type.type_options), type_description=j_type.type_description, fields=j_type.fields)
+        clz_instance = create_clz_instance(class_name=j_type.base_type, j_schema=self.j_schema, j_type=j_type, data=value, data_format=XML)
+        clz_instance.validate()
+
+    def reference_type(self, type_name: str, of_name: str) -> Jadn_Type:
+        # Resolved the way jadnvalidation resolves ArrayOf / MapOf value types
+        if is_primitive(type_name):
+            return Jadn_Type(of_name, type_name)
+        return build_j_type(get_reference_type(self.j_schema, type_name))
+
+
+class ArrayOfCollector():
+    """
+    Validates each <item> child of an ArrayOf root as an array item.
+    """
+
+    def __init__(self, stream: XmlStreamValidation, j_type: Jadn_Type):
+        self.stream = stream
+        self.j_type = j_type
+        self.vtype = stream.reference_type(get_vtype(j_type), "of_" + j_type.type_name)
+        self.count = 0
+
+    def add(self, tag: str, value, line: int, column: int):
+        self.count += 1
+        try:
+            if tag != "item":
+                raise ValueError(f"Array items for type {self.j_type.type_name} must be <item> elements")
+            self.stream.validate_value(self.vtype, value)
+            yield line, column, tag, None
+        except Exception as e:
+            yield line, column, tag, e
+
+    def finish(self):
+        return []
+
+    def check_root(self):
+        return count_errors(self.j_type, self.stream.j_config, self.stream.j_config.MaxElements, self.count, "Array length")
+
+
+class MapOfCollector():
+    """
+    Validates each child of a MapOf root, the element name is the key and its content the value.
+    """
+
+    def __init__(self, stream: XmlStreamValidation, j_type: Jadn_Type):
+        self.stream = stream
+        self.j_type = j_type
+        self.ktype = stream.reference_type(get_ktype(j_type), j_type.type_name.lower() + "_" + get_ktype(j_type).lower())
+        self.vtype = stream.reference_type(get_vtype(j_type), j_type.type_name.lower() + "_" + get_vtype(j_type).lower())
+        self.keys = set()
+
+    def add(self, tag: str, value, line: int, column: int):
+        try:
+            if tag in self.keys:
+                raise ValueError(f"Duplicate key {tag} for type {self.j_type.type_name}")
+            self.keys.add(tag)
+            self.stream.validate_value(self.ktype, tag)
+            self.stream.validate_value(self.vtype, value)
+            yield line, column, tag, None
+        except Exception as e:
+            yield line, column, tag, e
+
+    def finish(self):
+        return []
+
+    def check_root(self):
+        return count_errors(self.j_type, self.stream.j_config, self.stream.j_config.MaxElements, len(self.keys), "Number of fields")
+
+
+class RecordCollector():
+    """
+    Validates each field of a Record root.  Consecutive elements with the same name are one field holding a list,
+    which is validated once the next field starts.  Required and unknown fields are checked as the root closes.
+    """
+
+    def __init__(self, stream: XmlStreamValidation, j_type: Jadn_Type):
+        self.stream = stream
+        self.j_type = j_type
+        self.fields = {field[1]: field for field in j_type.fields or []}
+        self.seen = set()
+        self.pending = None # [tag, values, line, column] of the field being read
+
+    def add(self, tag: str, value, line: int, column: int):
+        if self.pending is not None and self.pending[0] == tag:
+            self.pending[1].append(value)
+            return
+        yield from self.finish()
+        self.pending = [tag, [value], line, column]
+
+    def finish(self):
+        if self.pending is None:
+            return
+        tag, values, line, column = self.pending
+        self.pending = None
+        try:
+            if tag in self.seen:
+                raise ValueError(f"Field '{tag}' is repeated, its elements must be next to each other")
+            self.seen.add(tag)
+            self._validate_field(tag, values[0] if len(values) == 1 else values)
+            yield line, column, tag, None
+        except Exception as e:
+            yield line, column, tag, e
+
+    def _validate_field(self, tag: str, value):
+        j_config = self.stream.j_config
+        field = self.fields.get(tag)
+        if field is None:
+            raise ValueError(f"Unknown data {tag}.")
+
+        j_field_obj = build_jadn_type_obj(field)
+        if value is None:
+            if is_optional(j_field_obj):
+                return
+            raise ValueError(f"Field '{tag}' is missing from data")
+
+        check_sys_char(j_field_obj.type_name, j_config.Sys)
+        check_field_name(j_field_obj.type_name, j_config.FieldName)
+
+        if is_field_multiplicity(j_field_obj.type_options):
+            j_field_obj = flip_to_array_of(j_field_obj, get_min_occurs(j_field_obj), get_max_occurs(j_field_obj, j_config))
+        elif is_user_defined(j_field_obj.base_type):
+            ref_type_obj = build_j_type(get_reference_type(self.stream.j_schema, j_field_obj.base_type))
+            check_type_name(ref_type_obj.type_name, j_config.TypeName)
+            ref_type_obj.type_options = merge_opts(j_field_obj.type_options, ref_type_obj.type_options)
+            j_field_obj = ref_type_obj
+
+        self.stream.validate_value(j_field_obj, value)
+
+    def check_root(self):
+        errors = []
+        for name, field in self.fields.items():
+            if name not in self.seen and not is_optional(build_jadn_type_obj(field)):
+                errors.append(f"Field '{name}' is missing from data")
+        errors.extend(count_errors(self.j_type, self.stream.j_config, None, len(self.seen), "Number of fields"))
+        return errors
+
+
+def count_errors(j_type: Jadn_Type, j_config, max_elements: int, count: int, label: str) -> list:
+    """
+    Checks the number of children of the root against the type's min / max length and the MaxElements limit.
+    """
+    errors = []
+    if max_elements is not None and count > max_elements:
+        errors.append(f"Data items for type {j_type.type_name} exceed the maximum limit of {max_elements}")
+    min_length = get_min_length(j_type)
+    if min_length is not None and count < min_length:
+        errors.append(f"{label} for type {j_type.type_name} must be greater than {min_length}. Received: {count}")
+    max_length = get_max_length(j_type, j_config)
+    if max_length is not None and count > max_length:
+        errors.append(f"{label} for type {j_type.type_name} must be less than {max_length}. Received: {count}")
+    return errors
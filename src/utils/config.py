@@ -1,27 +1,97 @@
+import logging
 import os
 import toml
 
+ENV_PREFIX = "JADN_CLI_"
+PERFORMANCE_SECTION = "performance"
+JSON_BACKENDS = ["json", "orjson"]
+
+_config_cache = {} # config path -> (cache key, config)
+_performance_cache = {} # config path -> (cache key, PerformanceConfig)
+
+logger = logging.getLogger(__name__)
+
+
+class PerformanceConfig():
+    """
+    Typed view of the [performance] section of config.toml.
+
+    Keys left out of the section fall back to the same key at the top level of the file
+    (where older config files kept them) and then to the defaults below.  An invalid value
+    is reported and the default is used instead.
+    """
+
+    jobs: int = None # worker processes for bulk commands, None = one per core
+    cache_dir: str = "./.jadn_cache"
+    cache_max_mb: int = 256
+    disk_cache: bool = True
+    artifact_cache: bool = True
+    schema_cache_mb: int = 64 # in-process schema cache memory budget
+    stream_chunk_kb: int = 64 # read size for incrementally parsed data files
+    json_backend: str = "json" # json or orjson
+    compiled_validation: bool = True
+
+    def __init__(self, values: dict = None):
+        values = values or {}
+        for name, value_type in PerformanceConfig.__annotations__.items():
+            if name not in values:
+                continue
+            try:
+                setattr(self, name, self._coerce(name, value_type, values[name]))
+            except ValueError as e:
+                print(f"Invalid performance setting {name}: {e}, using {getattr(PerformanceConfig, name)!r}")
+
+    def _coerce(self, name: str, value_type: type, value):
+        if value_type is bool:
+            if isinstance(value, bool):
+                return value
+            raise ValueError(f"{value!r} is not true or false")
+
+        if value_type is int:
+            if name == 'jobs' and value in (None, 0, "auto"):
+                return None
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                raise ValueError(f"{value!r} is not a positive number")
+            return value
+
+        if not isinstance(value, str) or not value:
+            raise ValueError(f"{value!r} is not a string")
+        if name == 'json_backend' and value not in JSON_BACKENDS:
+            raise ValueError(f"{value!r} is not one of {', '.join(JSON_BACKENDS)}")
+        return value
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in PerformanceConfig.__annotations__}
+
+
 def read_config(config_path="config.toml"):
     """
     Reads configuration variables from the config.toml file.
     Returns a dictionary of configuration values.
+
+    The file is parsed once and only re-read when its modification time or size changes.
+    Environment variables named JADN_CLI_<KEY> override a key, the [performance] keys included,
+    e.g. JADN_CLI_USE_PROMPTS=false or JADN_CLI_JOBS=4.  The returned dictionary is shared, do not change it.
     """
-    
-    # Example usage:
-    # config = read_config()
-    # use_prompts = config.get("use_prompts", True)    
-    
     config_file = os.path.join(os.getcwd(), config_path)
-    if not os.path.isfile(config_file):
-        print(f"Config file '{config_file}' not found.")
-        return {}
-    try:
-        with open(config_file, "r") as f:
-            config = toml.load(f)
-        return config
-    except Exception as e:
-        print(f"Error reading config file: {e}")
-        return {}
+    cache_key = _get_cache_key(config_file)
+    cached = _config_cache.get(config_file)
+    if cached is not None and cached[0] == cache_key:
+        return cached[1]
+
+    config = {}
+    if cache_key[0] is None:
+        logger.warning(f"Config file '{config_file}' not found.")
+    else:
+        try:
+            with open(config_file, "r") as f:
+                config = toml.load(f)
+        except Exception as e:
+            logger.error(f"Error reading config file: {e}")
+
+    _apply_env_overrides(config, cache_key[1])
+    _config_cache[config_file] = (cache_key, config)
+    return config
 
 def get_config_value(key, default=None, config_path="config.toml"):
     """
@@ -30,3 +100,46 @@ def get_config_value(key, default=None, config_path="config.toml"):
     """
     config = read_config(config_path)
     return config.get(key, default)
+
+def get_performance_config(config_path="config.toml") -> PerformanceConfig:
+    """
+    Returns the performance settings, rebuilt only when the config file or its environment overrides change.
+    """
+    config = read_config(config_path)
+    config_file = os.path.join(os.getcwd(), config_path)
+    cache_key = _config_cache[config_file][0]
+    cached = _performance_cache.get(config_file)
+    if cached is not None and cached[0] == cache_key:
+        return cached[1]
+
+    values = {name: config[name] for name in PerformanceConfig.__annotations__ if name in config}
+    values.update(config.get(PERFORMANCE_SECTION) or {})
+    performance_config = PerformanceConfig(values)
+    _performance_cache[config_file] = (cache_key, performance_config)
+    return performance_config
+
+def _get_cache_key(config_file: str) -> tuple:
+    try:
+        stat = os.stat(config_file)
+        file_key = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        file_key = None
+    env_overrides = tuple(sorted((name, value) for name, value in os.environ.items() if name.startswith(ENV_PREFIX)))
+    return file_key, env_overrides
+
+def _apply_env_overrides(config: dict, env_overrides: tuple):
+    for name, raw_value in env_overrides:
+        key = name[len(ENV_PREFIX):].lower()
+        try:
+            # Values are read as TOML, so numbers and true / false keep their type, anything else is a string
+            value = toml.loads(f"value = {raw_value}")["value"]
+        except Exception:
+            value = raw_value
+
+        if key in PerformanceConfig.__annotations__:
+            section = config.get(PERFORMANCE_SECTION)
+            if not isinstance(section, dict):
+                section = config[PERFORMANCE_SECTION] = {}
+            section[key] = value
+        else:
+            config[key] = value
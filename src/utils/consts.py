@@ -3,15 +3,22 @@ SCHEMAS_DIR_PATH = "./schemas"
 DATA_DIR_PATH = "./data"
 OUTPUT_DIR_PATH = "./output"
 
+# Read a schema or data file from stdin instead of the schemas / data directory, results are named stdin.<ext>
+STDIN_FILENAME = "-"
+STDIN_OUTPUT_NAME = "stdin"
+
 SCHEMA_CSS_FILE_NAME = "schema_theme.css"
 
 CBOR_FILE_EXT = "cbor"
+CBOR_SEQ_FILE_EXT = "cborseq"
 GV_FILE_EXT = "gv"
 HTML_FILE_EXT = "html"
 JADN_SCHEMA_FILE_EXT = "jadn"
 JIDL_FILE_EXT = "jidl"
 JSON_FILE_EXT = "json"
 MARKDOWN_FILE_EXT = "md"
+NDJSON_FILE_EXT = "ndjson"
+JSONL_FILE_EXT = "jsonl"
 PLANT_UML_FILE_EXT = "puml"
 XML_FILE_EXT = "xml"
 XSD_FILE_EXT = "xsd"
@@ -19,12 +26,18 @@ UNKNOWN_EXT = "unknown"
 LOGICAL_OPTION = "logical"
 CONCEPTUAL_OPTION = "conceptual"
 INFORMATION_OPTION = "information"
+VERBOSE_CONST = "verbose"
 COMPACT_CONST = "compact"
 CONCISE_CONST = "concise"
 
-VALID_DATA_FORMATS = [CBOR_FILE_EXT, JSON_FILE_EXT, XML_FILE_EXT]
+STREAM_PROGRESS_INTERVAL = 10000
+
+VALID_STREAM_DATA_FORMATS = [NDJSON_FILE_EXT, JSONL_FILE_EXT, CBOR_SEQ_FILE_EXT]
+VALID_DATA_FORMATS = [CBOR_FILE_EXT, JSON_FILE_EXT, XML_FILE_EXT] + VALID_STREAM_DATA_FORMATS
+INCREMENTAL_DATA_FORMATS = VALID_STREAM_DATA_FORMATS + [XML_FILE_EXT]
 VALID_SCHEMA_FORMATS = [JIDL_FILE_EXT, JSON_FILE_EXT, XSD_FILE_EXT]
 VALID_REV_SCHEMA_FORMATS = [JIDL_FILE_EXT, JSON_FILE_EXT]
 VALID_REV_SCHEMA_TRANSLATION_FORMATS = [JADN_SCHEMA_FILE_EXT, JIDL_FILE_EXT, JSON_FILE_EXT]
 VALID_SCHEMA_VIS_FORMATS = [GV_FILE_EXT, HTML_FILE_EXT, MARKDOWN_FILE_EXT, PLANT_UML_FILE_EXT]
-VALID_SCHEMA_VIS_OPTIONS = [LOGICAL_OPTION, CONCEPTUAL_OPTION, INFORMATION_OPTION]
\ No newline at end of file
+VALID_SCHEMA_VIS_OPTIONS = [LOGICAL_OPTION, CONCEPTUAL_OPTION, INFORMATION_OPTION]
+SCHEMA_OUTPUT_FORMATS = VALID_SCHEMA_FORMATS + VALID_SCHEMA_VIS_FORMATS
\ No newline at end of file
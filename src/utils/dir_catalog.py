@@ -0,0 +1,140 @@
+import os
+import re
+
+from src.utils.metrics import span
+
+
+class DirCatalog():
+    """
+    Cached listing of the files in a directory, built with os.scandir.
+
+    The listing is kept until the directory's modification time changes, which happens whenever a
+    file is added, removed or renamed, so repeated lookups cost a single stat.  Names are sorted,
+    which keeps file numbering stable between calls, and held in a set for O(1) existence checks.
+    A recursive catalog also lists sub directories, relative names use '/' as separator.
+    Hidden files and directories (starting with '.') are left out, as glob does.
+    """
+
+    def __init__(self, dir_path: str, recursive: bool = False):
+        self.dir_path = os.path.abspath(dir_path)
+        self.recursive = recursive
+        self.dir_mtimes = None # directory path -> mtime_ns at the last scan
+        self.names = []
+        self.name_set = frozenset()
+        self.filtered = {} # (extensions, pattern) -> names
+        self.scans = 0
+
+    def exists(self, name: str) -> bool:
+        self.refresh()
+        return name in self.name_set
+
+    def files(self, extensions: tuple = None, pattern: str = None) -> list:
+        """
+        Returns the sorted relative names of the files with one of the extensions (without the dot) and matching
+        the glob style pattern, where '**' matches any number of sub directories.  Results are cached until the
+        directory changes.
+        """
+        self.refresh()
+        key = (tuple(extensions) if extensions else None, pattern)
+        names = self.filtered.get(key)
+        if names is None:
+            names = self.names
+            if extensions:
+                suffixes = tuple(f".{extension}" for extension in extensions)
+                names = [name for name in names if name.endswith(suffixes)]
+            if pattern:
+                regex = compile_pattern(pattern)
+                names = [name for name in names if regex.match(name)]
+            self.filtered[key] = names
+        return names
+
+    def paths(self, extensions: tuple = None, pattern: str = None) -> list:
+        return [os.path.join(self.dir_path, name) for name in self.files(extensions, pattern)]
+
+    def refresh(self):
+        """
+        Rescan the directory if it, or for a recursive catalog any of its sub directories, has changed.
+        """
+        if self.dir_mtimes is not None:
+            try:
+                if all(os.stat(path).st_mtime_ns == mtime for path, mtime in self.dir_mtimes.items()):
+                    return
+            except OSError:
+                pass
+        self._scan()
+
+    def _scan(self):
+        names = []
+        dir_mtimes = {}
+        pending = [(self.dir_path, "")]
+        with span("dir_scan"):
+            while pending:
+                path, prefix = pending.pop()
+                try:
+                    dir_mtimes[path] = os.stat(path).st_mtime_ns
+                    with os.scandir(path) as entries:
+                        for entry in entries:
+                            if entry.name.startswith('.'):
+                                continue
+                            if entry.is_file():
+                                names.append(prefix + entry.name)
+                            elif self.recursive and entry.is_dir():
+                                pending.append((entry.path, f"{prefix}{entry.name}/"))
+                except OSError:
+                    continue
+
+        names.sort()
+        self.names = names
+        self.name_set = frozenset(names)
+        self.dir_mtimes = dir_mtimes
+        self.filtered = {}
+        self.scans += 1
+
+
+def compile_pattern(pattern: str) -> re.Pattern:
+    """
+    Compiles a glob style pattern for relative names: '*' and '?' do not cross '/', '[...]' is a character set
+    and a '**' path segment matches zero or more directories.
+    """
+    regex = ""
+    segments = pattern.split('/')
+    for idx, segment in enumerate(segments):
+        if segment == "**":
+            regex += "(?:[^/]+/)*" if idx < len(segments) - 1 else ".*"
+            continue
+
+        i = 0
+        while i < len(segment):
+            char = segment[i]
+            if char == '*':
+                regex += "[^/]*"
+            elif char == '?':
+                regex += "[^/]"
+            elif char == '[' and segment.find(']', i + 2) != -1:
+                end = segment.find(']', i + 2)
+                chars = segment[i + 1:end]
+                if chars.startswith('!'):
+                    chars = '^' + chars[1:]
+                regex += "[" + chars.replace('\\', '\\\\') + "]"
+                i = end
+            else:
+                regex += re.escape(char)
+            i += 1
+
+        if idx < len(segments) - 1:
+            regex += "/"
+
+    return re.compile(regex + r"\Z")
+
+
+_catalogs = {}
+
+def get_dir_catalog(dir_path: str, recursive: bool = False) -> DirCatalog:
+    """
+    Returns the process wide catalog of a directory.
+    """
+    key = (os.path.abspath(dir_path), recursive)
+    catalog = _catalogs.get(key)
+    if catalog is None:
+        catalog = _catalogs[key] = DirCatalog(dir_path, recursive)
+    return catalog
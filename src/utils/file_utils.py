@@ -1,22 +1,235 @@
-import glob
+import cbor2
+import io
 import json
+import mmap
 import os
+import sys
 
-from src.utils.consts import CBOR_FILE_EXT, JADN_SCHEMA_FILE_EXT, JIDL_FILE_EXT, JSON_FILE_EXT, UNKNOWN_EXT, XML_FILE_EXT, XSD_FILE_EXT
+from contextlib import nullcontext
+from xml.parsers import expat
+
+from src.utils.config import get_performance_config
+from src.utils.dir_catalog import get_dir_catalog
+from src.utils.json_utils import get_json_loads
+from src.utils.metrics import span
+from src.utils.consts import CBOR_FILE_EXT, CBOR_SEQ_FILE_EXT, JADN_SCHEMA_FILE_EXT, JIDL_FILE_EXT, JSON_FILE_EXT, JSONL_FILE_EXT, NDJSON_FILE_EXT, STDIN_FILENAME, STDIN_OUTPUT_NAME, UNKNOWN_EXT, XML_FILE_EXT, XSD_FILE_EXT
+
+_stdin_data = None
     
+def read_stdin() -> bytes:
+    """
+    Returns everything on stdin.  Stdin can only be consumed once, so it is read once and kept.
+    """
+    global _stdin_data
+    if _stdin_data is None:
+        stream = getattr(sys.stdin, 'buffer', None)
+        with span("file_read"):
+            _stdin_data = stream.read() if stream is not None else sys.stdin.read().encode('utf-8')
+    return _stdin_data
+
+def open_input(filepath: str):
+    """
+    Opens a file for binary reading, or stdin for '-'.  Stdin is streamed unless it has already been read,
+    and is left open when the returned context manager exits.
+    """
+    if filepath != STDIN_FILENAME:
+        return open(filepath, 'rb')
+    if _stdin_data is not None or getattr(sys.stdin, 'buffer', None) is None:
+        return io.BytesIO(read_stdin())
+    return nullcontext(sys.stdin.buffer)
+
 def get_file(dir_path: str, filename: str) -> dict:
     file_data = {}
+    if filename == STDIN_FILENAME:
+        file_data[filename] = read_stdin().decode('utf-8')
+        return file_data
+
     filepath = os.path.join(dir_path, filename)
     if os.path.isfile(filepath):
-        with open(filepath, 'r') as file:
+        with span("file_read"), open(filepath, 'r') as file:
             file_data[filename] = file.read()
             
     return file_data
 
+def iter_json_lines(filepath: str):
+    """
+    Lazily read a newline delimited JSON (NDJSON / JSON Lines) file.
+    Yields (line_no, data, error) for each non blank line, where error is the parse exception or None.
+    Only the current line is held in memory, stdin ('-') is read line by line as it arrives.
+    """
+    loads = get_json_loads()
+    with open_input(filepath) as file:
+        for line_no, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            # Timed apart from the yield, the caller's work on the record is not part of the parse
+            with span("parse"):
+                try:
+                    data, error = loads(line), None
+                except ValueError as e:
+                    data, error = None, e
+            yield line_no, data, error
+
+def load_cbor(filepath: str):
+    """
+    Decode a single CBOR data item straight from the file bytes, the file is memory mapped rather than read as text.
+    Raises a ValueError if the file is empty or holds more than one item.
+    """
+    if filepath == STDIN_FILENAME:
+        data = read_stdin()
+        if not data:
+            raise ValueError("CBOR data on stdin is empty.")
+        stream = io.BytesIO(data)
+        with span("parse"):
+            item = cbor2.CBORDecoder(stream).decode()
+        if stream.tell() != len(data):
+            raise ValueError("CBOR data on stdin holds more than one data item, use the cborseq format.")
+        return item
+
+    with open(filepath, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            raise ValueError(f"CBOR file {os.path.basename(filepath)} is empty.")
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, span("parse"):
+            data = cbor2.CBORDecoder(mapped).decode()
+            if mapped.tell() != size:
+                raise ValueError(f"Unexpected data after the first CBOR item at byte {mapped.tell()}, use a .{CBOR_SEQ_FILE_EXT} file for CBOR Sequences.")
+
+    return data
+
+def iter_cbor_seq(filepath: str):
+    """
+    Lazily decode a CBOR Sequence (RFC 8742), a concatenation of CBOR data items, from a memory mapped file.
+    Yields (item_no, data, error) per item, where error is the decode exception or None.
+    A decode error ends the sequence, as the start of the next item cannot be found.
+    Stdin ('-') is decoded as it arrives.
+    """
+    if filepath == STDIN_FILENAME:
+        yield from _iter_cbor_stream(filepath)
+        return
+
+    with open(filepath, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            decoder = cbor2.CBORDecoder(mapped)
+            item_no = 0
+            while mapped.tell() < size:
+                item_no += 1
+                with span("parse"):
+                    try:
+                        data, error = decoder.decode(), None
+                    except Exception as e:
+                        data, error = None, e
+                yield item_no, data, error
+                if error is not None:
+                    return
+
+def _iter_cbor_stream(filepath: str):
+    with open_input(filepath) as stream:
+        if not hasattr(stream, 'peek'):
+            stream = io.BufferedReader(stream)
+        decoder = cbor2.CBORDecoder(stream)
+        item_no = 0
+        while stream.peek(1):
+            item_no += 1
+            with span("parse"):
+                try:
+                    data, error = decoder.decode(), None
+                except Exception as e:
+                    data, error = None, e
+            yield item_no, data, error
+            if error is not None:
+                return
+
+def iter_xml_elements(filepath: str, chunk_size: int = None):
+    """
+    Incrementally parse an XML file, one child of the root element at a time.
+    Yields (event, tag, value, line, column) tuples:
+      ('start', root_tag, None, ...) when the root element opens,
+      ('item', tag, value, ...) for each completed child of the root, with its subtree converted the way
+        xmltodict does without attributes (text, None, or a dict with lists for repeated tags),
+      ('end', root_tag, None, ...) when the root element closes, and
+      ('error', None, message, ...) for a parse error, which ends the stream.
+    Line and column point at the element's start tag, columns are 1-based.
+    Each child's subtree is released once it has been yielded, so memory is bounded by the largest child.
+    The file is read chunk_size bytes at a time, by default the stream_chunk_kb performance setting.
+    """
+    if chunk_size is None:
+        chunk_size = get_performance_config().stream_chunk_kb * 1024
+
+    parser = expat.ParserCreate()
+    parser.SetParamEntityParsing(expat.XML_PARAM_ENTITY_PARSING_NEVER)
+    parser.buffer_text = True
+    stack = [] # [tag, children, text_parts, line, column] per open element
+    events = []
+
+    def start_element(tag, attrs):
+        stack.append([tag, None, [], parser.CurrentLineNumber, parser.CurrentColumnNumber + 1])
+        if len(stack) == 1:
+            events.append(('start', tag, None, parser.CurrentLineNumber, parser.CurrentColumnNumber + 1))
+
+    def end_element(tag):
+        tag, children, text_parts, line, column = stack.pop()
+        text = ''.join(text_parts).strip() or None
+        if children is not None:
+            value = children
+            if text is not None:
+                value['#text'] = text
+        else:
+            value = text
+
+        if len(stack) == 0:
+            events.append(('end', tag, None, parser.CurrentLineNumber, parser.CurrentColumnNumber + 1))
+        elif len(stack) == 1:
+            events.append(('item', tag, value, line, column))
+        else:
+            parent = stack[-1]
+            if parent[1] is None:
+                parent[1] = {}
+            if tag in parent[1]:
+                if not isinstance(parent[1][tag], list):
+                    parent[1][tag] = [parent[1][tag]]
+                parent[1][tag].append(value)
+            else:
+                parent[1][tag] = value
+
+    def char_data(data):
+        if len(stack) > 1:
+            stack[-1][2].append(data)
+
+    def entity_decl(*args):
+        raise ValueError("entities are disabled")
+
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = char_data
+    parser.EntityDeclHandler = entity_decl
+
+    with open_input(filepath) as file:
+        while True:
+            chunk = file.read(chunk_size)
+            try:
+                parser.Parse(chunk, not chunk)
+            except (expat.ExpatError, ValueError) as e:
+                yield from events
+                yield ('error', None, str(e), parser.ErrorLineNumber, parser.ErrorColumnNumber + 1)
+                return
+
+            yield from events
+            events.clear()
+            if not chunk:
+                break
+
 def get_filepath(dir_path: str, filename: str) -> str:
     """
-    Returns the absolute full path to the file if it exists, otherwise returns None.
+    Returns the absolute full path to the file if it exists, otherwise returns None.  Stdin ('-') is returned as is.
     """
+    if filename == STDIN_FILENAME:
+        return filename
     filepath = os.path.join(dir_path, filename)
     if os.path.isfile(filepath):
         return os.path.abspath(filepath)
@@ -29,12 +242,18 @@ def determine_file_type(filename: str) -> str:
     """
     if filename.endswith('.cbor'):
         return CBOR_FILE_EXT    
+    elif filename.endswith('.cborseq'):
+        return CBOR_SEQ_FILE_EXT
     elif filename.endswith('.jadn'):
         return JADN_SCHEMA_FILE_EXT
     elif filename.endswith('.jidl'):
         return JIDL_FILE_EXT    
     elif filename.endswith('.json'):
         return JSON_FILE_EXT
+    elif filename.endswith('.jsonl'):
+        return JSONL_FILE_EXT
+    elif filename.endswith('.ndjson'):
+        return NDJSON_FILE_EXT
     elif filename.endswith('.xml'):
         return XML_FILE_EXT
     elif filename.endswith('.xsd'):
@@ -47,27 +266,30 @@ def file_exists(dirname, filename):
     Check if a filename exists in the directory.
     Returns True if found, False otherwise.
     """
-    dir = os.path.join(os.getcwd(), dirname)
-    if not os.path.exists(dir):
-        return False
-    files = [os.path.basename(f) for f in glob.glob(os.path.join(dir, "*"))]
-    return filename in files
+    return get_dir_catalog(dirname).exists(filename)
+
+def get_file_extensions(is_jadn_only=True, is_json_only=False):
+    """
+    Returns the extensions the file selection helpers show, or None for every file.
+    """
+    if is_jadn_only:
+        return (JADN_SCHEMA_FILE_EXT,)
+    if is_json_only:
+        return (JSON_FILE_EXT,)
+    return None
 
-def list_files(dir, is_jadn_only=True, is_json_only=False, join_list=None):
+def list_files(dir, is_jadn_only=True, is_json_only=False, join_list=None, pattern=None, recursive=False):
     """
     List all files (not directories or nested files) in the specified directory, displaying a file number for each.
+    With recursive, files in sub directories are listed too, and a glob style pattern narrows the list.
+    Files are numbered in name order, so the numbers stay the same between calls.
     """
     dir = os.path.join(os.getcwd(), dir)
     if not os.path.exists(dir):
         print(f"The '{dir}' directory does not exist.")
         return
 
-    if is_jadn_only:
-        files = [f for f in glob.glob(os.path.join(dir, "*.jadn")) if os.path.isfile(f)]
-    elif is_json_only:
-        files = [f for f in glob.glob(os.path.join(dir, "*.json")) if os.path.isfile(f)]
-    else:
-        files = [f for f in glob.glob(os.path.join(dir, "*")) if os.path.isfile(f)]
+    files = get_dir_catalog(dir, recursive).paths(get_file_extensions(is_jadn_only, is_json_only), pattern)
         
     if files:
         if join_list is not None:
@@ -79,11 +301,11 @@ def list_files(dir, is_jadn_only=True, is_json_only=False, join_list=None):
         else:
             print(f"Files in '{dir}' directory:")
             for idx, f in enumerate(files, 1):
-                print(f"  {idx} - {os.path.basename(f)}")
+                print(f"  {idx} - {os.path.relpath(f, dir)}")
     else:
         print(f"No files found in the '{dir}' directory.")
 
-def map_files(dir, is_jadn_only=True, is_json_only=False):
+def map_files(dir, is_jadn_only=True, is_json_only=False, pattern=None, recursive=False):
     """
     Map all files in the specific directory to their file number.
     To allow users to be able to run commands with numbers instead of filenames.
@@ -95,12 +317,7 @@ def map_files(dir, is_jadn_only=True, is_json_only=False):
         print(f"The '{dir}' directory does not exist.")
         return
 
-    if is_jadn_only:
-        files = [f for f in glob.glob(os.path.join(dir, "*.jadn")) if os.path.isfile(f)]
-    elif is_json_only:
-        files = [f for f in glob.glob(os.path.join(dir, "*.json")) if os.path.isfile(f)]
-    else:
-        files = [f for f in glob.glob(os.path.join(dir, "*")) if os.path.isfile(f)]
+    files = get_dir_catalog(dir, recursive).paths(get_file_extensions(is_jadn_only, is_json_only), pattern)
 
     if files:
         for idx, f in enumerate(files, 1):
@@ -170,12 +387,7 @@ def pick_a_file(dir, fromArray=None, is_jadn_only=True, is_json_only=False, prom
             print(f"The '{dir}' directory does not exist.")
             return None
 
-        if is_jadn_only:
-            files = [os.path.basename(f) for f in glob.glob(os.path.join(dir, "*.jadn")) if os.path.isfile(f)]
-        elif is_json_only:
-            files = [os.path.basename(f) for f in glob.glob(os.path.join(dir, "*.json")) if os.path.isfile(f)]
-        else:
-            files = [os.path.basename(f) for f in glob.glob(os.path.join(dir, "*")) if os.path.isfile(f)]
+        files = get_dir_catalog(dir).files(get_file_extensions(is_jadn_only, is_json_only))
 
         if not files:
             print(f"No files found in the '{dir}' directory.")
@@ -260,12 +472,32 @@ def update_file_extension(filename, new_ext):
     Update a filename with a new extension.
     Returns the new filename.
     Example: update_file_extension('example.txt', '.json') -> 'example.json'
+    Results of stdin ('-') are named stdin, e.g. 'stdin.json'.
     """
+    if filename == STDIN_FILENAME:
+        filename = STDIN_OUTPUT_NAME
     base = os.path.splitext(filename)[0]
     if not new_ext.startswith('.'):
         new_ext = '.' + new_ext
     return base + new_ext            
             
+def is_output_current(filename, data) -> bool:
+    """
+    Check if the file under the 'output' directory already holds exactly this data, so writing it can be skipped.
+    """
+    if not isinstance(data, str):
+        return False
+
+    filepath = os.path.join(os.getcwd(), "output", filename)
+    encoded = data.encode('utf-8')
+    try:
+        if os.path.getsize(filepath) != len(encoded):
+            return False
+        with open(filepath, 'rb') as f:
+            return f.read() == encoded
+    except OSError:
+        return False
+
 def write_to_output(filename, data):
     """
     Write data to a file under the 'output' directory.
@@ -278,10 +510,21 @@ def write_to_output(filename, data):
     output_dir = os.path.join(os.getcwd(), "output")
     os.makedirs(output_dir, exist_ok=True)
     filepath = os.path.join(output_dir, filename)
-    with open(filepath, 'w') as f:
+    with span("write_output"), open(filepath, 'w') as f:
         f.write(data)
     print(f" - Data written to {filepath}")
     
+def open_output(filename, binary=False):
+    """
+    Open a file under the 'output' directory for writing text, or bytes when binary, creating the directory (and
+    any sub directory in the filename) if it does not exist.  Used to stream results that are not held in memory as a whole.
+    """
+    filepath = os.path.join(os.getcwd(), "output", filename)
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    if binary:
+        return open(filepath, 'wb')
+    return open(filepath, 'w', encoding='utf-8')
+
 def write_json_to_output(filename, data):
     """
     Write json data to a file under the 'output' directory.
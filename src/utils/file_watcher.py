@@ -0,0 +1,94 @@
+import os
+import time
+
+
+class PollingWatcher():
+    """
+    Detects changed files by comparing (mtime, size) snapshots of the watched directories.
+    Used when inotify is not available.
+    """
+
+    def __init__(self, dirs: list, poll_interval: float = 0.5):
+        self.dirs = [os.path.abspath(dir_path) for dir_path in dirs]
+        self.poll_interval = poll_interval
+        self.snapshot = self._scan()
+
+    def wait(self, timeout: float = None) -> set:
+        """
+        Returns the paths added, changed or removed since the last call, waiting up to timeout seconds (None = one poll interval).
+        """
+        time.sleep(self.poll_interval if timeout is None else min(timeout, self.poll_interval))
+        snapshot = self._scan()
+        changed = {path for path, stat in snapshot.items() if self.snapshot.get(path) != stat}
+        changed.update(path for path in self.snapshot if path not in snapshot)
+        self.snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+    def _scan(self) -> dict:
+        snapshot = {}
+        for dir_path in self.dirs:
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        if entry.name.startswith('.') or not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                        snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+        return snapshot
+
+
+class InotifyWatcher():
+    """
+    Detects changed files with inotify, through the optional inotify_simple package.
+    Only completed writes, moves and deletions are reported, so half written files are not picked up.
+    """
+
+    def __init__(self, dirs: list):
+        from inotify_simple import INotify, flags
+
+        self.inotify = INotify()
+        mask = flags.CLOSE_WRITE | flags.MOVED_TO | flags.MOVED_FROM | flags.DELETE
+        self.watches = {self.inotify.add_watch(os.path.abspath(dir_path), mask): os.path.abspath(dir_path) for dir_path in dirs}
+
+    def wait(self, timeout: float = None) -> set:
+        """
+        Returns the paths changed since the last call, blocking up to timeout seconds (None = until a change).
+        """
+        events = self.inotify.read(timeout=None if timeout is None else int(timeout * 1000))
+        return {os.path.join(self.watches[event.wd], event.name) for event in events
+                if event.wd in self.watches and event.name and not event.name.startswith('.')}
+
+    def close(self):
+        self.inotify.close()
+
+
+def create_watcher(dirs: list, poll_interval: float = 0.5, use_polling: bool = False):
+    """
+    Returns an inotify watcher when inotify_simple is installed and the platform supports it, a polling watcher otherwise.
+    """
+    if not use_polling:
+        try:
+            return InotifyWatcher(dirs)
+        except (ImportError, OSError):
+            pass
+    return PollingWatcher(dirs, poll_interval)
+
+def wait_for_changes(watcher, debounce: float, timeout: float = None) -> set:
+    """
+    Waits for a change, then keeps collecting until no change has arrived for debounce seconds,
+    so a burst of saves is handled once.  Returns an empty set if nothing changed within timeout.
+    """
+    changed = watcher.wait(timeout)
+    if not changed:
+        return changed
+
+    while True:
+        more = watcher.wait(debounce)
+        if not more:
+            return changed
+        changed |= more
@@ -47,4 +47,48 @@ def parse_args(arg_string):
     Takes a string of arguments, trims whitespace, splits on spaces,
     and returns a list of arguments in the same order.
     """
-    return arg_string.strip().split()
\ No newline at end of file
+    return arg_string.strip().split()
+
+def get_opt_value(opts, name, default=None):
+    """
+    Returns the value following an option flag, supporting both '--name value' and '--name=value'.
+    Returns the default value if the flag is not present.
+    """
+    for idx, opt in enumerate(opts):
+        if opt == name and idx + 1 < len(opts):
+            return opts[idx + 1]
+        if opt.startswith(name + '='):
+            return opt.split('=', 1)[1]
+    return default
+
+def get_int_opt(opts, name, default=None):
+    """
+    Returns the positive number given with an option flag, or the default value.
+    Raises a ValueError if the value is not a positive number.
+    """
+    value = get_opt_value(opts, name, None)
+    if value is None:
+        return default
+    if not str(value).isdigit() or int(value) < 1:
+        raise ValueError(f"Invalid {name} value: {value}. Expected a positive number.")
+    return int(value)
+
+def get_jobs_opt(opts, default=None):
+    """
+    Returns the worker count given with --jobs N, or the default value.
+    Raises a ValueError if the count is not a positive number.
+    """
+    return get_int_opt(opts, '--jobs', default)
+
+def get_error_filters(opts):
+    """
+    Returns the error store filters given with --from, --to, --command, --schema, --data and --type.
+    Only the flags present are returned.
+    """
+    flags = {'--from': 'date_from', '--to': 'date_to', '--command': 'command', '--schema': 'schema', '--data': 'data_file', '--type': 'error_type'}
+    filters = {}
+    for flag, name in flags.items():
+        value = get_opt_value(opts, flag, None)
+        if value is not None:
+            filters[name] = value
+    return filters
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+
+# The CLI itself, followed by the libraries its commands load on demand
+STARTUP_MODULES = [
+    "jadn_cli",
+    "texttable",
+    "toml",
+    "cbor2",
+    "jadn",
+    "jadnschema.convert",
+    "jadnvalidation",
+    "jadnxml.builder.xsd_builder",
+    "jadnutils.html.html_converter",
+    "jadnutils.json.convert_compact"
+]
+
+
+def measure_import_time(module_name: str, runs: int = 1) -> dict:
+    """
+    Imports a module in a fresh interpreter with -X importtime and returns its cold import time.
+    The best of the given number of runs is kept, in milliseconds.  Errors are returned, not raised.
+    """
+    result = {'module': module_name, 'self_ms': None, 'total_ms': None, 'error': None}
+    for _ in range(max(1, runs)):
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+                                   capture_output=True, text=True)
+        if completed.returncode != 0:
+            result['error'] = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else f"exit code {completed.returncode}"
+            return result
+
+        timing = parse_import_time(completed.stderr, module_name)
+        if timing is None:
+            result['error'] = "No import time reported, the module may already be loaded at startup"
+            return result
+
+        self_us, total_us = timing
+        if result['total_ms'] is None or total_us / 1000 < result['total_ms']:
+            result['self_ms'] = round(self_us / 1000, 1)
+            result['total_ms'] = round(total_us / 1000, 1)
+
+    return result
+
+def parse_import_time(output: str, module_name: str) -> tuple:
+    """
+    Returns the (self, cumulative) microseconds reported by -X importtime for a module, or None.
+    """
+    for line in reversed(output.splitlines()):
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) == 3 and fields[2].strip() == module_name:
+            try:
+                return int(fields[0]), int(fields[1])
+            except ValueError:
+                return None
+    return None
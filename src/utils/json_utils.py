@@ -0,0 +1,34 @@
+import json
+
+from src.utils.config import get_performance_config
+
+
+def get_json_loads():
+    """
+    Returns the loads function of the JSON backend set in the performance config.
+    Falls back to the standard library when orjson is not installed.
+    Look it up once per file rather than per document.
+    """
+    if get_performance_config().json_backend == "orjson":
+        try:
+            import orjson
+            return orjson.loads
+        except ImportError:
+            pass
+    return json.loads
+
+def get_json_dumps(pretty: bool = False):
+    """
+    Returns a function serializing data to JSON text, compact (no whitespace) unless pretty, which indents by 4.
+    Compact output uses the JSON backend set in the performance config, look it up once per file.
+    """
+    if pretty:
+        return lambda data: json.dumps(data, indent=4)
+
+    if get_performance_config().json_backend == "orjson":
+        try:
+            import orjson
+            return lambda data: orjson.dumps(data).decode('utf-8')
+        except ImportError:
+            pass
+    return lambda data: json.dumps(data, separators=(',', ':'), ensure_ascii=False)
@@ -0,0 +1,282 @@
+"""
+Per-stage timing spans of the CLI commands, exported as JSON Lines and a Prometheus textfile.
+
+Stages are timed with `with span(stage):` around the work.  Spans are only kept while a SpanRecorder is
+recording, the rest of the time span() hands back a shared no-op context manager, so instrumented code
+pays for one function call and a global lookup per stage when metrics are off.  Spans of a command
+add up per stage: the number of times it ran and its total seconds.
+
+Metrics are turned on by the [metrics] section of config.toml, or with JADN_CLI_METRICS=true.
+"""
+import json
+import os
+import re
+import time
+
+from contextlib import nullcontext
+
+try:
+    import fcntl
+except ImportError: # Windows, textfile updates are not serialized
+    fcntl = None
+
+from src.utils.config import get_config_value
+from src.utils.consts import JADN_SCHEMA_FILE_EXT, VALID_SCHEMA_FORMATS
+from src.utils.time_utils import get_now
+
+METRICS_SECTION = "metrics"
+DEFAULT_METRICS_FILE = "./output/metrics.jsonl"
+
+# Stages in the order a command goes through them
+SPAN_STAGES = ["dir_scan", "file_read", "parse", "meta_validation", "root_selection", "data_validation", "conversion",
+               "serialization", "write_output"]
+
+PROMETHEUS_PREFIX = "jadn_cli"
+_PROMETHEUS_METRICS = {
+    'command_seconds': ("gauge", "Wall clock seconds of the last run of a command."),
+    'command_runs_total': ("counter", "Runs of a command, by status."),
+    'stage_seconds': ("gauge", "Seconds spent in a stage by the last run of a command."),
+    'stage_calls': ("gauge", "Times a stage ran in the last run of a command.")
+}
+_PROMETHEUS_SAMPLE = re.compile(r"^(\w+)(\{.*\})? (\S+)$")
+
+_spans = None # stage -> [count, seconds] of the recorder recording, None when none is
+_NO_SPAN = nullcontext()
+
+
+class _Span():
+    __slots__ = ('spans', 'stage', 'start')
+
+    def __init__(self, spans: dict, stage: str):
+        self.spans = spans
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        elapsed = time.perf_counter() - self.start
+        totals = self.spans.get(self.stage)
+        if totals is None:
+            self.spans[self.stage] = [1, elapsed]
+        else:
+            totals[0] += 1
+            totals[1] += elapsed
+        return False
+
+
+def span(stage: str):
+    """
+    Returns a context manager timing a stage into the spans being recorded, or a no-op one when none are.
+    """
+    if _spans is None:
+        return _NO_SPAN
+    return _Span(_spans, stage)
+
+def is_recording() -> bool:
+    return _spans is not None
+
+def add_spans(spans: dict):
+    """
+    Adds spans recorded apart, e.g. by a worker process, to the spans being recorded, if any.
+    """
+    if _spans is not None and spans:
+        merge_spans(_spans, spans)
+
+def record_call(func, *args):
+    """
+    Calls func recording its spans apart and returns its result, a result dict holding them under 'spans'.
+    Used by run_jobs, so the spans of every bulk item come back with its result, whatever process it ran in.
+    """
+    with SpanRecorder(True) as recorder:
+        result = func(*args)
+    if isinstance(result, dict):
+        result['spans'] = recorder.as_dict()
+    return result
+
+def get_metrics_settings() -> dict:
+    """
+    Returns the [metrics] settings: enabled, the JSON Lines file and the Prometheus textfile, '' for none.
+    JADN_CLI_METRICS=true / false, which replaces the section with a flag, turns metrics on or off with the default files.
+    """
+    settings = get_config_value(METRICS_SECTION, {})
+    if isinstance(settings, bool):
+        settings = {'enabled': settings}
+    elif not isinstance(settings, dict):
+        settings = {}
+    return {
+        'enabled': settings.get('enabled', False) is True,
+        'file': settings.get('file') or DEFAULT_METRICS_FILE,
+        'prometheus_file': settings.get('prometheus_file') or ""
+    }
+
+def metrics_enabled() -> bool:
+    return get_metrics_settings()['enabled']
+
+def merge_spans(totals: dict, spans: dict) -> dict:
+    """
+    Adds spans, as recorded or as returned by as_dict, to totals (stage -> [count, seconds]), returning totals.
+    """
+    for stage, value in (spans or {}).items():
+        count, seconds = (value['count'], value['seconds']) if isinstance(value, dict) else value
+        entry = totals.setdefault(stage, [0, 0.0])
+        entry[0] += count
+        entry[1] += seconds
+    return totals
+
+def spans_as_dict(spans: dict) -> dict:
+    """
+    Returns spans as {stage: {'count', 'seconds'}}, in stage order, ready for JSON.
+    """
+    order = {stage: idx for idx, stage in enumerate(SPAN_STAGES)}
+    return {stage: {'count': spans[stage][0], 'seconds': round(spans[stage][1], 6)}
+            for stage in sorted(spans, key=lambda stage: order.get(stage, len(order)))}
+
+
+class SpanRecorder():
+    """
+    Context manager recording the spans timed while it is open, turned off it records nothing.
+    A recorder opened inside another records in its place until it closes, so the spans of a bulk command's
+    files, whether they ran in worker processes or in this one, are only counted when added to the command.
+    """
+
+    enabled: bool = False
+    spans: dict = None
+
+    def __init__(self, enabled: bool = None):
+        self.enabled = metrics_enabled() if enabled is None else enabled
+        self.spans = {} if self.enabled else None
+        self._previous = None
+
+    def __enter__(self):
+        global _spans
+        if self.enabled:
+            self._previous = _spans
+            _spans = self.spans
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        global _spans
+        if self.enabled:
+            _spans = self._previous
+        return False
+
+    def as_dict(self) -> dict:
+        """
+        Returns the spans for a result dict crossing process boundaries, None when off.
+        """
+        return spans_as_dict(self.spans) if self.enabled else None
+
+
+class CommandMetrics(SpanRecorder):
+    """
+    Records the spans of one command run and, when closed, appends them to the metrics file as a JSON line:
+    the timestamp, command, arguments, schema, status, errors, wall clock seconds and the spans per stage.
+    With a Prometheus textfile set, its samples for the command and schema are updated for node_exporter.
+    """
+
+    command: str = None
+    args: str = ""
+    schema: str = None
+    errors: int = 0
+    elapsed: float = 0.0
+    record: dict = None
+
+    def __init__(self, command: str, args: str = "", settings: dict = None):
+        self.settings = settings or get_metrics_settings()
+        super().__init__(self.settings['enabled'])
+        self.command = command
+        self.args = args
+        # The first argument names the schema of most commands, labelled so dashboards can trend each schema
+        first = args.split()[0] if args.split() else ""
+        self.schema = first if os.path.splitext(first)[1].lstrip('.') in [JADN_SCHEMA_FILE_EXT] + VALID_SCHEMA_FORMATS else None
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return super().__enter__()
+
+    def __exit__(self, exc_type, exc, traceback):
+        super().__exit__(exc_type, exc, traceback)
+        self.elapsed = time.perf_counter() - self._start
+        if self.enabled:
+            self.write()
+        return False
+
+    def write(self):
+        self.record = {
+            'timestamp': get_now(),
+            'command': self.command,
+            'args': self.args,
+            'schema': self.schema,
+            'status': "error" if self.errors else "ok",
+            'errors': self.errors,
+            'seconds': round(self.elapsed, 6),
+            'spans': spans_as_dict(self.spans)
+        }
+        path = self.settings['file']
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(self.record) + "\n")
+
+        if self.settings['prometheus_file']:
+            write_prometheus_textfile(self.settings['prometheus_file'], self.record)
+
+
+def write_prometheus_textfile(path: str, record: dict):
+    """
+    Updates a Prometheus textfile with the samples of a command run: its seconds, stage seconds and calls, and
+    its run count.  Samples of other commands and schemas are kept, the file is replaced in one step so
+    node_exporter never reads it half written.  Updates hold a lock on <path>.lock, so commands finishing
+    at the same time do not lose each other's samples.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.lock", 'a') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX) # Released when the lock file is closed
+        _update_prometheus_textfile(path, record)
+
+def _update_prometheus_textfile(path: str, record: dict):
+    samples = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                match = _PROMETHEUS_SAMPLE.match(line.strip())
+                if match:
+                    samples[(match.group(1), match.group(2) or "")] = float(match.group(3))
+    except OSError:
+        pass
+
+    labels = {'command': record['command'], 'schema': record['schema'] or ""}
+    name = lambda metric: f"{PROMETHEUS_PREFIX}_{metric}"
+    samples[(name('command_seconds'), _labels(labels))] = record['seconds']
+    runs_key = (name('command_runs_total'), _labels({**labels, 'status': record['status']}))
+    samples[runs_key] = samples.get(runs_key, 0) + 1
+    # The stages of the last run replace those of the run before
+    command_labels = _labels(labels)[:-1]
+    for key in [key for key in samples if key[0] in (name('stage_seconds'), name('stage_calls')) and key[1].startswith(command_labels + ',')]:
+        del samples[key]
+    for stage, totals in record['spans'].items():
+        stage_labels = _labels({**labels, 'stage': stage})
+        samples[(name('stage_seconds'), stage_labels)] = totals['seconds']
+        samples[(name('stage_calls'), stage_labels)] = totals['count']
+
+    lines = []
+    for metric, (metric_type, help_text) in _PROMETHEUS_METRICS.items():
+        metric_samples = sorted((key, value) for key, value in samples.items() if key[0] == name(metric))
+        if not metric_samples:
+            continue
+        lines.append(f"# HELP {name(metric)} {help_text}")
+        lines.append(f"# TYPE {name(metric)} {metric_type}")
+        # Counters are whole numbers, gauges are written in full, %g would round both to 6 digits
+        lines.extend(f"{key[0]}{key[1]} {int(value) if metric_type == 'counter' else repr(float(value))}" for key, value in metric_samples)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        file.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
+
+def _labels(labels: dict) -> str:
+    escape = lambda value: str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels.items()) + "}"
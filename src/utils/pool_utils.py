@@ -0,0 +1,41 @@
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from src.utils.config import get_performance_config
+from src.utils.metrics import add_spans, is_recording, record_call
+
+
+def get_default_jobs() -> int:
+    """
+    Returns the default number of worker processes, the jobs performance setting or one per core.
+    """
+    return get_performance_config().jobs or os.cpu_count() or 1
+
+def run_jobs(func, arg_lists: list, jobs: int = None, initializer=None, initargs: tuple = ()) -> list:
+    """
+    Call func once per entry of arg_lists (a list of argument tuples) across a process pool.
+    Results are returned in the same order as arg_lists, whatever order the workers finish in.
+    Runs in the current process when one job or less is needed.
+    While metrics are recorded, each result dict also holds the spans of its call, which are added to the caller's.
+    """
+    recording = is_recording()
+    if recording:
+        func = partial(record_call, func)
+
+    jobs = min(jobs or get_default_jobs(), len(arg_lists))
+    if jobs <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        results = [func(*args) for args in arg_lists]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs) as executor:
+            chunksize = max(1, len(arg_lists) // (jobs * 4))
+            results = list(executor.map(func, *zip(*arg_lists), chunksize=chunksize))
+
+    if recording:
+        for result in results:
+            if isinstance(result, dict):
+                add_spans(result.get('spans'))
+    return results
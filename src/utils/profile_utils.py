@@ -0,0 +1,92 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+
+from src.utils.consts import OUTPUT_DIR_PATH
+from src.utils.time_utils import get_now
+
+PROFILE_DIR_PATH = os.path.join(OUTPUT_DIR_PATH, "profiles")
+DEFAULT_PROFILE_TOP = 25
+
+
+class CommandProfiler():
+    """
+    Context manager running a command under cProfile, and optionally tracemalloc.
+    On exit it writes the raw stats, readable with pstats or snakeviz, to <command>_<timestamp>.pstats and a summary of
+    the top functions by cumulative time, and of the top allocation sites when tracing memory, to <command>_<timestamp>.txt.
+    Only the calling process is profiled, not the worker processes of the bulk commands.
+    """
+
+    command: str = None
+    args: str = ""
+    top: int = DEFAULT_PROFILE_TOP
+    trace_memory: bool = False
+    output_dir: str = None
+    stats_path: str = None
+    summary_path: str = None
+    elapsed: float = 0.0
+
+    def __init__(self, command: str, args: str = "", top: int = None, trace_memory: bool = False, output_dir: str = None):
+        self.command = command
+        self.args = args
+        self.top = top or DEFAULT_PROFILE_TOP
+        self.trace_memory = trace_memory
+        self.output_dir = output_dir or PROFILE_DIR_PATH
+        self.profiler = cProfile.Profile()
+        self._started_tracing = False
+        self._start = None
+
+    def __enter__(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._start = time.perf_counter()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.profiler.disable()
+        self.elapsed = time.perf_counter() - self._start
+        snapshot = peak = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+            peak = tracemalloc.get_traced_memory()[1]
+            if self._started_tracing:
+                tracemalloc.stop()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"{self.command}_{get_now('%Y%m%d_%H%M%S_%f')}")
+        self.stats_path = f"{base}.pstats"
+        self.summary_path = f"{base}.txt"
+        self.profiler.dump_stats(self.stats_path)
+        with open(self.summary_path, 'w', encoding='utf-8') as file:
+            file.write(self.summary(snapshot, peak))
+
+        # Exceptions, including the SystemExit of a failed one-shot command, carry on once the profile is written
+        return False
+
+    def summary(self, snapshot: tracemalloc.Snapshot = None, peak: int = None) -> str:
+        """
+        Returns the text summary: the command, its wall clock time, the top functions by cumulative time and, given a
+        tracemalloc snapshot, the peak traced memory and the top allocation sites by size.
+        """
+        out = io.StringIO()
+        out.write(f"Command: {self.command} {self.args}".rstrip() + "\n")
+        out.write(f"Python: {sys.version.split()[0]}\n")
+        out.write(f"Wall clock: {self.elapsed:.3f}s\n\n")
+
+        stats = pstats.Stats(self.profiler, stream=out)
+        stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+
+        if snapshot is not None:
+            out.write(f"Peak traced memory: {peak / 1024:.1f} KB\n\n")
+            out.write(f"Top {self.top} allocation sites by size:\n")
+            for stat in snapshot.statistics('lineno')[:self.top]:
+                frame = stat.traceback[0]
+                out.write(f"{stat.size / 1024:10.1f} KB {stat.count:8} blocks  {frame.filename}:{frame.lineno}\n")
+
+        return out.getvalue()
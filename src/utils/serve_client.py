@@ -0,0 +1,155 @@
+import http.client
+import json
+import os
+import secrets
+import socket
+
+from src.utils.config import get_config_value, get_performance_config
+from src.utils.consts import STDIN_FILENAME
+
+SERVE_SECTION = "serve"
+DEFAULT_SERVE_HOST = "127.0.0.1"
+DEFAULT_SERVE_PORT = 8765
+CONNECT_TIMEOUT = 0.2
+
+# The only commands the server runs, and so the only ones forwarded to it: they read files and report, without
+# writing outside the error log, running programs or prompting
+SERVE_COMMANDS = ["schema_v", "data_v", "data_v_bulk", "err_report_out", "cache_stats", "version"]
+
+# Every request carries the server's token, read from a file only the user running the server can read
+TOKEN_HEADER = "X-Jadn-Token"
+TOKEN_FILENAME = "serve.token"
+# Host headers the server answers to, a page on another site that resolves its name to 127.0.0.1 is refused
+LOCAL_HOSTS = ["localhost", "127.0.0.1", "::1"]
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP connection over a Unix socket.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def get_serve_address(host: str = None, port: int = None, socket_path: str = None):
+    """
+    Returns the server's Unix socket path, or its (host, port), from the arguments or the [serve] section of config.toml.
+    """
+    settings = get_config_value(SERVE_SECTION, {}) or {}
+    if host is None and port is None:
+        socket_path = socket_path or settings.get('socket')
+    if socket_path:
+        return socket_path
+    return host or settings.get('host', DEFAULT_SERVE_HOST), int(port or settings.get('port', DEFAULT_SERVE_PORT))
+
+def get_token_path() -> str:
+    """
+    Returns the path of the server's token file, the token_file of the [serve] section or serve.token in the cache directory.
+    """
+    settings = get_config_value(SERVE_SECTION, {}) or {}
+    return settings.get('token_file') or os.path.join(get_performance_config().cache_dir, TOKEN_FILENAME)
+
+def write_token(path: str) -> str:
+    """
+    Writes a new random token to a file readable and writable by its owner only (0600), returning the token.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    token = secrets.token_urlsafe(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.fchmod(fd, 0o600) # An existing file keeps its mode on open
+        os.write(fd, token.encode('utf-8'))
+    finally:
+        os.close(fd)
+    return token
+
+def read_token(path: str = None) -> str:
+    """
+    Returns the running server's token, or None when there is no token file.
+    """
+    try:
+        with open(path or get_token_path(), 'r', encoding='utf-8') as file:
+            return file.read().strip() or None
+    except OSError:
+        return None
+
+def is_local_host(host_header: str) -> bool:
+    """
+    Returns True when a Host header names localhost, with or without a port.
+    """
+    host = (host_header or "").strip().lower()
+    if host.startswith('['):
+        host = host[1:host.find(']')] if ']' in host else host
+    elif host.count(':') == 1:
+        host = host.split(':')[0]
+    return host in LOCAL_HOSTS
+
+
+class ServeClient():
+    """
+    Sends requests to a running serve process, over one kept alive connection.
+    """
+
+    address = None
+    connection = None
+    token: str = None
+
+    def __init__(self, address=None, timeout: float = None, token: str = None):
+        self.address = address or get_serve_address()
+        self.token = token or read_token()
+        if isinstance(self.address, str):
+            self.connection = UnixHTTPConnection(self.address, timeout=timeout)
+        else:
+            self.connection = http.client.HTTPConnection(*self.address, timeout=timeout)
+
+    def request(self, path: str, body: dict = None) -> tuple:
+        """
+        Returns the (status, response) of a request, a GET without a body and a POST with one.
+        Raises an OSError when the server cannot be reached.
+        """
+        headers = {TOKEN_HEADER: self.token or ""}
+        if body is None:
+            self.connection.request("GET", path, headers=headers)
+        else:
+            headers['Content-Type'] = 'application/json'
+            self.connection.request("POST", path, json.dumps(body).encode('utf-8'), headers)
+        response = self.connection.getresponse()
+        return response.status, json.loads(response.read() or b"{}")
+
+    def close(self):
+        self.connection.close()
+
+
+def forward_command(command: str, args: str):
+    """
+    Runs a command on the serve process when one is running, returning its response, or None to run it locally.
+    Only the SERVE_COMMANDS are forwarded.  Commands reading stdin ('-') or writing their result to stdout run
+    locally, the server cannot reach either.
+    """
+    if command not in SERVE_COMMANDS or STDIN_FILENAME in args.split() or '--stdout' in args.split():
+        return None
+
+    # No token file, no server started by this user
+    token = read_token()
+    if token is None:
+        return None
+
+    client = ServeClient(timeout=CONNECT_TIMEOUT, token=token)
+    try:
+        client.connection.connect()
+        # Connected, the command itself may take as long as it needs
+        client.connection.sock.settimeout(None)
+        status, response = client.request("/command", {'command': command, 'args': args, 'cwd': os.getcwd()})
+    except (OSError, http.client.HTTPException, ValueError):
+        return None
+    finally:
+        client.close()
+
+    return response if status == 200 else None
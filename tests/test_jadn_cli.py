@@ -1,8 +1,18 @@
+import cbor2
+import io
+import subprocess
+import threading
 import sys
 import os
 import glob
+import copy
+import json
+import logging
+import pstats
+import stat
+import jadnvalidation
 from jadn_cli import JadnCLI
-from src.utils.consts import OUTPUT_DIR_PATH, SCHEMAS_DIR_PATH
+from src.utils.consts import DATA_DIR_PATH, OUTPUT_DIR_PATH, SCHEMAS_DIR_PATH
 
 from jadn2 import JADN, add_methods
 from jadn2.config import style_args, style_fname
@@ -10,6 +20,34 @@ from jadn2.convert import jidl_rw, xasd_rw, md_rw, erd_w
 from jadn2.translate import jschema_rw, xsd_rw, cddl_rw, proto_rw, xeto_rw
 
 from src.utils.file_utils import get_filepath
+from src.utils.config import get_config_value, get_performance_config, read_config
+from src.utils.import_utils import measure_import_time
+from src.utils.profile_utils import CommandProfiler
+from src.utils.metrics import CommandMetrics, SpanRecorder, span, write_prometheus_textfile
+from src.utils.pool_utils import run_jobs
+from src.utils.dir_catalog import DirCatalog
+from src.utils.file_watcher import PollingWatcher, wait_for_changes
+from src.utils.serve_client import TOKEN_HEADER, ServeClient, UnixHTTPConnection
+from src.logic.schema_registry import SchemaRegistry
+from src.logic.schema_disk_cache import SchemaDiskCache
+from src.logic.artifact_cache import ArtifactCache
+from src.logic.compact_codec import CompactCodec
+from src.logic.error_store import ErrorStore
+from src.logic.cli_data_validation import CliDataValidation
+from src.logic.benchmark import Benchmark, compare_reports, load_workload, make_synthetic_schema
+from src.logic.cli_data_gen import CliDataGen
+from src.logic.data_generator import DataGenerator
+from src.logic.cli_data_conversion_bulk import CliDataConversionBulk
+from src.logic.cli_data_transcode import CliDataTranscode
+from src.logic.cli_data_validation_bulk import CliDataValidationBulk
+from src.logic.cli_schema_conversion_bulk import CliSchemaConversionBulk
+from src.logic.cli_schema_conversion_multi import CliSchemaConversionMulti, parse_formats
+from src.logic.cli_watch import CliWatch
+from src.logic.cli_server import create_server
+from src import api
+from src.logic.validation_plan import ValidationPlan
+from src.logic.root_index import RootIndex
+from src.logic.xml_stream_validation import XmlStreamValidation
 
 add_methods(jidl_rw)  
 add_methods(xasd_rw)
@@ -191,6 +229,27 @@ def test_schema_t_xsd():
     
     assert cli.error_list == []
 
+def test_schema_t_all():
+    arg = "music-database.jadn --all --detail logical --jobs 2"
+
+    cli = JadnCLI()
+    cli.do_clear_log('')
+
+    cli.do_schema_t(arg)
+    cli.do_err_report_gen('')
+
+    assert cli.error_list == []
+
+def test_schema_t_multi_results():
+    assert parse_formats("jidl,gv,jidl") == ["jidl", "gv"]
+
+    multi_conversion = CliSchemaConversionMulti("music-database.jadn", ["jidl", "md", "puml"], jobs=1, force=True)
+    results = multi_conversion.convert()
+
+    assert [result['format'] for result in results] == ["jidl", "md", "puml"]
+    assert [result['output_filename'] for result in results] == ["music-database.jidl", "music-database.md", "music-database.puml"]
+    assert all(result['converted'] and not result['error'] for result in results)
+
 ############# TESTING COMMAND: schema_t_bulk <convert_to> #############
 
 def test_schema_t_bulk_xsd():
@@ -226,6 +285,25 @@ def test_schema_t_bulk_json():
 
     assert len(cli.error_list) == 0
 
+def test_schema_t_bulk_jobs():
+    arg = "jidl --jobs 2"
+
+    cli = JadnCLI()
+    cli.do_clear_log('')
+
+    cli.do_schema_t_bulk(arg)
+    cli.do_err_report_gen('')
+
+    assert cli.error_list == []
+
+def test_schema_t_bulk_results():
+    bulk_conversion = CliSchemaConversionBulk("jidl", jobs=2)
+    results = bulk_conversion.convert()
+
+    assert [result['filename'] for result in results] == sorted(bulk_conversion.find_files())
+    assert all(result['converted'] and result['error'] is None for result in results)
+    assert all(result['output_filename'].endswith(".jidl") for result in results)
+
 ############# TESTING COMMAND: schema_vis <schema_file> <convert_to> #############
 def test_schema_vis_md():
     arg = "music-database.jadn md"
@@ -283,6 +361,136 @@ def test_do_v_schema():
     
     assert cli.error_list == []
 
+############# TESTING COMMAND: data_c <schema_file> <data_file> #############
+def test_data_c_compact_ndjson():
+    cli = JadnCLI()
+    cli.do_clear_log('')
+
+    cli.do_data_c("music-database.jadn music_library.ndjson --compact")
+
+    assert cli.error_list == []
+    with open(os.path.join(OUTPUT_DIR_PATH, "music_library.ndjson")) as file:
+        lines = file.read().splitlines()
+    with open(os.path.join(DATA_DIR_PATH, "music_library.ndjson")) as file:
+        assert len(lines) == len([line for line in file if line.strip()])
+    # One compact record per line, no whitespace between tokens
+    assert all(json.loads(line) and ', ' not in line and ': ' not in line for line in lines)
+
+def test_data_c_bulk():
+    bulk_conversion = CliDataConversionBulk("music-database.jadn", "music_library.*json", "concise", jobs=2)
+    results = bulk_conversion.convert()
+
+    assert [result['filename'] for result in results] == ["music_library.json", "music_library.ndjson"]
+    assert all(result['converted'] and result['error'] is None for result in results)
+    assert results[1]['records'] == 3
+    assert bulk_conversion.throughput(results)['passed'] == 2
+
+    with open(os.path.join(OUTPUT_DIR_PATH, "music_library.json")) as file:
+        assert '\n' not in file.read().strip()
+
+############# TESTING COMMAND: data_t <schema_file> <data_file> --to <encoding> #############
+def test_data_t_concise_cbor():
+    cli = JadnCLI()
+    cli.do_clear_log('')
+
+    cli.do_data_t("music-database.jadn music_library.json --to concise --cbor")
+
+    assert cli.error_list == []
+    with open(os.path.join(OUTPUT_DIR_PATH, "music_library.cbor"), 'rb') as file:
+        concise = cbor2.loads(file.read())
+    assert concise and os.path.getsize(os.path.join(OUTPUT_DIR_PATH, "music_library.cbor")) < os.path.getsize(os.path.join(DATA_DIR_PATH, "music_library.json"))
+
+def test_data_t_stream():
+    transcoder = CliDataTranscode("music-database.jadn", "music_library.cborseq", "compact")
+    with io.BytesIO() as out:
+        errors = list(transcoder.transcode(out))
+        lines = out.getvalue().decode('utf-8').splitlines()
+
+    assert errors == []
+    assert transcoder.output_filename() == "music_library.ndjson"
+    assert len(lines) == transcoder.converted_count == 3
+    summary = transcoder.summary()
+    assert summary['bytes_out'] == sum(len(line) + 1 for line in lines)
+    assert 0 < summary['ratio'] < 1
+
+    # Verbose records read as concise data do not expand to valid records, each is reported instead
+    transcoder = CliDataTranscode("music-database.jadn", "music_library.ndjson", "verbose", convert_from="concise")
+    errors = list(transcoder.transcode(io.BytesIO()))
+    assert len(errors) == transcoder.failed_count == 3
+
+def test_data_t_round_trip():
+    cli = JadnCLI()
+    cli.do_clear_log('')
+    with open(os.path.join(DATA_DIR_PATH, "music_library.json")) as file:
+        verbose = json.load(file)
+
+    cli.do_data_t("music-database.jadn music_library.json --to compact --cbor")
+    assert cli.error_list == []
+    with open(os.path.join(OUTPUT_DIR_PATH, "music_library.cbor"), 'rb') as file:
+        compact = cbor2.loads(file.read())
+    assert compact == {"012345678912": [["John Michael Stipe", "vocals"], "test", ["test", "2025-04-24"],
+                                        ["test", [1, "test", 5, "MP3", ["test", "guitar"], ["PNG", "test"], "rock"]], 1, ["PNG", "test"]]}
+
+    with open(os.path.join(SCHEMAS_DIR_PATH, "music-database.jadn"), 'rb') as file:
+        schema = api.load_schema(file.read())
+    assert api.transcode_data(schema, cbor2.dumps(compact), "compact", "verbose", "cbor")['converted'] == verbose
+    concise = api.transcode_data(schema, compact, "compact", "concise")['converted']
+    assert concise["012345678912"][0] == ["John Michael Stipe", 1]
+    assert api.transcode_data(schema, verbose, "verbose", "concise")['converted'] == concise
+    assert api.transcode_data(schema, cbor2.dumps(concise), "concise", "verbose", "cbor")['converted'] == verbose
+    assert api.transcode_data(schema, concise, "concise", "compact")['converted'] == compact
+
+    # Concise Maps and Choices are keyed by field id and Enumerateds hold item ids
+    codec = CompactCodec({"types": [
+        ["Settings", "Map", [], "", [[1, "mode", "Mode", [], ""], [2, "target", "Target", ["[0"], ""]]],
+        ["Mode", "Enumerated", [], "", [[1, "on", ""], [2, "off", ""]]],
+        ["Target", "Choice", [], "", [[1, "host", "String", [], ""], [2, "ports", "Ports", [], ""]]],
+        ["Ports", "ArrayOf", ["*Integer"], ""]
+    ]})
+    assert codec.expand({"1": 2, "2": {"2": [80, 443]}}, "Settings", "concise") == {"mode": "off", "target": {"ports": [80, 443]}}
+
+    # Compact data that does not expand to a valid record is reported, not written as an empty one
+    album = compact["012345678912"]
+    for invalid in ({"012345678912": [None] * 6 + album}, {"012345678912": [None, "test"]}):
+        result = api.transcode_data(schema, invalid, "compact", "verbose")
+        assert result['converted'] is None and result['error'].startswith("Data Invalid")
+
+def test_data_gen():
+    cli = JadnCLI()
+    cli.do_clear_log('')
+
+    cli.do_data_gen("music-database.jadn --count 20 --seed 5 --format ndjson --invalid 0.25")
+
+    assert cli.error_list == []
+    with open(os.path.join(OUTPUT_DIR_PATH, "music-database.ndjson"), 'r') as file:
+        records = [json.loads(line) for line in file]
+    assert len(records) == 20
+    with open(os.path.join(SCHEMAS_DIR_PATH, "music-database.jadn"), 'r') as file:
+        entry = api.load_schema(file.read())
+    results = [api.validate_data(entry, record)['valid'] for record in records]
+    assert 0 < results.count(False) < 20
+
+    # The same seed gives the same records, as a CBOR indefinite-length array
+    outputs = []
+    for _ in range(2):
+        generator = CliDataGen("music-database.jadn", count=3, seed=11, data_format="cbor")
+        with io.BytesIO() as out:
+            list(generator.generate(out))
+            outputs.append(out.getvalue())
+    assert outputs[0] == outputs[1] and len(cbor2.loads(outputs[0])) == 3
+
+def test_data_generator_valid():
+    schemas = [make_synthetic_schema(300, seed=2)]
+    with open(os.path.join(SCHEMAS_DIR_PATH, "music-database.jadn"), 'r') as file:
+        schemas.append(json.load(file))
+
+    for schema in schemas:
+        entry = api.load_schema(json.dumps(schema))
+        generator = DataGenerator(schema, seed=3)
+        for _ in range(20):
+            assert api.validate_data(entry, generator.generate())['valid']
+            assert not api.validate_data(entry, generator.generate_invalid())['valid']
+
 ############# TESTING COMMAND: data_v <schema_file> <data_file> #############
 def test_do_v_data_json():
     arg = "music-database.jadn music_library.json"
@@ -304,11 +512,34 @@ def test_do_v_data_cbor():
     cli = JadnCLI()
     cli.do_clear_log('')
 
-    #cli.do_data_v(arg)
-    #cli.do_err_report_gen('')
+    cli.do_data_v(arg)
+    cli.do_err_report_gen('')
     
-    #assert cli.error_list == []  
-    assert True # CBOR is invalid   
+    assert cli.error_list == []
+
+def test_do_v_data_cbor_seq():
+    arg = "music-database.jadn music_library.cborseq"
+
+    cli = JadnCLI()
+    cli.do_clear_log('')
+
+    cli.do_data_v(arg)
+    cli.do_err_report_gen('')
+
+    assert cli.error_list == []
+
+def test_data_v_cbor_seq_counts():
+    data_validation = CliDataValidation("music-database.jadn", "music_library.cborseq")
+    results = list(data_validation.validate_stream())
+
+    assert [item_no for item_no, _, _ in results] == [1, 2, 3]
+    assert data_validation.valid_count == 3
+    assert data_validation.record_label() == "item"
+
+def test_data_v_record_labels():
+    xml_validation = CliDataValidation("music-database.jadn", "music_library.xml")
+    assert xml_validation.record_label() == "element" and xml_validation.record_position(3) == "Element at line 3"
+    assert CliDataValidation("music-database.jadn", "music_library.ndjson").record_position(2) == "Line 2"
 
 ############# TESTING COMMAND: data_c #############
 def test_do_data_c_compact():
@@ -357,6 +588,41 @@ def test_do_clear_log():
     
     assert cli.error_list == []
 
+############# TESTING COMMAND: err_report_out [filters] #############
+def test_do_err_report_out():
+    cli = JadnCLI()
+    cli.do_clear_log('')
+
+    cli.do_data_v("music-database.jadn missing_data.json")
+    cli.do_err_report_out("--command data_v --data missing_data.json --page-size 5")
+    cli.do_err_report_gen("--data missing_data.json --file missing_data_errors.csv")
+
+    assert len(cli.error_list) == 1
+    with open(os.path.join(OUTPUT_DIR_PATH, "missing_data_errors.csv")) as file:
+        assert file.readline().strip() == "timestamp,command,schema,data_file,error_type,message"
+        assert "missing_data.json" in file.readline()
+
+############# TESTING: error store #############
+def test_error_store(tmp_path):
+    error_store = ErrorStore(str(tmp_path / "errors.db"), batch_size=2)
+    error_store.add("2025-01-01T10:00:00", "data_v", "ValueError", "bad", schema="a.jadn", data_file="a.json")
+    assert error_store.pending
+
+    # A full batch is written in one go
+    error_store.add("2025-01-02T10:00:00", "schema_t", "KeyError", "missing", schema="b.jadn")
+    assert not error_store.pending
+    error_store.add("2025-01-03T10:00:00", "data_v", "ValueError", "worse", schema="a.jadn", data_file="c.json")
+
+    assert error_store.count() == 3
+    assert error_store.count(command="data_v", schema="a.jadn") == 2
+    assert error_store.count(date_from="2025-01-02", date_to="2025-01-02") == 1
+    assert [error['message'] for error in error_store.query(page=1, page_size=2)] == ["worse", "missing"]
+    assert [error['message'] for error in error_store.query(page=2, page_size=2)] == ["bad"]
+
+    assert error_store.export_csv(str(tmp_path / "errors.csv"), error_type="ValueError") == 2
+    assert error_store.clear() == 3
+    error_store.close()
+
 ############# TESTING COMMAND: clear_reports #############
 def test_do_clear_reports():
     arg = "music-database.jadn"
@@ -368,4 +634,601 @@ def test_do_clear_reports():
     cli.do_clear_reports('')
 
     csv_files = glob.glob(os.path.join(OUTPUT_DIR_PATH, "*.csv"))
-    assert len(csv_files) == 0
\ No newline at end of file
+    assert len(csv_files) == 0
+############# TESTING: schema registry #############
+def test_schema_registry_hits():
+    registry = SchemaRegistry()
+
+    entry = registry.load(SCHEMAS_DIR_PATH, "music-database.jadn")
+    assert registry.validate(entry) is True
+    assert entry.roots == ["Library"]
+
+    assert registry.load(SCHEMAS_DIR_PATH, "music-database.jadn") is entry
+    assert registry.stats()['hits'] == 1
+    assert registry.stats()['misses'] == 1
+    assert registry.load(SCHEMAS_DIR_PATH, "does-not-exist.jadn") is None
+
+def test_schema_registry_eviction():
+    registry = SchemaRegistry(max_bytes=1)
+
+    registry.load(SCHEMAS_DIR_PATH, "music-database.jadn")
+    registry.load(SCHEMAS_DIR_PATH, "oscal-ssp.jadn")
+
+    assert registry.stats()['entries'] == 1
+    assert registry.stats()['evictions'] == 1
+
+############# TESTING COMMAND: cache_stats #############
+def test_do_cache_stats():
+    cli = JadnCLI()
+    cli.do_clear_log('')
+
+    cli.do_data_v("music-database.jadn music_library.json")
+    cli.do_cache_stats('')
+
+    assert cli.error_list == []
+
+############# TESTING: schema disk cache #############
+def test_schema_disk_cache(tmp_path):
+    disk_cache = SchemaDiskCache(cache_dir=str(tmp_path))
+
+    entry = SchemaRegistry(disk_cache=disk_cache).load(SCHEMAS_DIR_PATH, "music-database.jadn")
+    assert entry.is_valid is None
+    SchemaRegistry(disk_cache=disk_cache).validate(entry)
+
+    # A fresh registry, like a new CLI process, gets the verdict without re-validating
+    cached_entry = SchemaRegistry(disk_cache=disk_cache).load(SCHEMAS_DIR_PATH, "music-database.jadn")
+    assert cached_entry.is_valid is True
+    assert cached_entry.schema_data == entry.schema_data
+    assert disk_cache.stats()['entries'] == 1
+    assert disk_cache.hits == 1
+
+    assert disk_cache.clear() == 1
+    assert disk_cache.stats()['entries'] == 0
+
+def test_schema_disk_cache_size_cap(tmp_path):
+    disk_cache = SchemaDiskCache(cache_dir=str(tmp_path), max_bytes=1)
+    disk_cache.put("abc", {"types": []}, True)
+
+    assert disk_cache.stats()['entries'] == 0
+
+def test_cache_put_scans_once(tmp_path, monkeypatch):
+    for cache, put in ((SchemaDiskCache(cache_dir=str(tmp_path), max_bytes=2048), lambda idx: cache.put(f"h{idx}", {"types": []}, True)),
+                       (ArtifactCache(cache_dir=str(tmp_path), max_bytes=2048), lambda idx: cache.put(f"h{idx}", "jidl", None, "x" * 100))):
+        scans = []
+        scan = cache._scan
+        monkeypatch.setattr(cache, "_scan", lambda: scans.append(1) or scan())
+        for idx in range(10):
+            put(idx)
+        # Only the first put scans, until the running total reaches the cap
+        assert len(scans) == 1 and cache.stats()['bytes'] == cache.current_bytes
+
+        # Past the cap a put prunes to 90% of it, leaving room for the puts that follow
+        for idx in range(10, 60):
+            put(idx)
+        assert 1 < len(scans) < 20 and cache.stats()['bytes'] <= 2048
+
+############# TESTING: schema translation artifact cache #############
+def test_artifact_cache(tmp_path):
+    artifact_cache = ArtifactCache(cache_dir=str(tmp_path))
+    assert artifact_cache.get("abc", "gv", "logical") is None
+
+    artifact_cache.put("abc", "gv", "logical", "digraph {}")
+    assert artifact_cache.get("abc", "gv", "logical") == "digraph {}"
+    # The visualization option is part of the key for diagram formats only
+    assert artifact_cache.get("abc", "gv", "conceptual") is None
+    artifact_cache.put("abc", "jidl", None, "package: x")
+    assert artifact_cache.get("abc", "jidl", "logical") == "package: x"
+    assert artifact_cache.hits == 2
+
+    assert artifact_cache.clear() == 2
+    assert artifact_cache.stats()['entries'] == 0
+
+def test_schema_t_force():
+    cli = JadnCLI()
+    cli.do_clear_log('')
+
+    cli.do_schema_t("music-database.jadn jidl")
+    cli.do_schema_t("music-database.jadn jidl --force")
+    cli.do_schema_t_bulk("jidl --force")
+
+    assert cli.error_list == []
+
+############# TESTING COMMAND: cache_clear #############
+def test_do_cache_clear():
+    cli = JadnCLI()
+    cli.do_clear_log('')
+
+    cli.do_schema_v("music-database.jadn")
+    cli.do_cache_clear('')
+    cli.do_cache_stats('')
+
+    assert cli.error_list == []
+
+############# TESTING COMMAND: data_v_bulk <schema_file> [glob] [--jobs N] #############
+def test_do_data_v_bulk():
+    arg = "music-database.jadn *.json --jobs 2"
+
+    cli = JadnCLI()
+    cli.do_clear_log('')
+
+    cli.do_data_v_bulk(arg)
+    cli.do_err_report_gen('')
+
+    assert cli.error_list == []
+
+def test_data_v_bulk_results():
+    bulk_validation = CliDataValidationBulk("music-database.jadn", "*.json", jobs=1)
+    results = bulk_validation.validate()
+
+    assert [result['filename'] for result in results] == ["music_library.json"]
+    assert all(result['valid'] for result in results)
+    assert bulk_validation.throughput(results)['passed'] == 1
+
+############# TESTING COMMAND: data_v <schema_file> <ndjson_file> #############
+def test_do_v_data_ndjson():
+    arg = "music-database.jadn music_library.ndjson"
+
+    cli = JadnCLI()
+    cli.do_clear_log('')
+
+    cli.do_data_v(arg)
+    cli.do_err_report_gen('')
+
+    assert cli.error_list == []
+
+def test_data_v_stream_counts():
+    data_validation = CliDataValidation("music-database.jadn", "music_library.ndjson")
+    results = list(data_validation.validate_stream())
+
+    assert [line_no for line_no, _, _ in results] == [1, 2, 3]
+    assert data_validation.valid_count == 3
+    assert data_validation.invalid_count == 0
+
+############# TESTING: compiled validation plan #############
+def test_validation_plan_matches_jadnvalidation():
+    with open(os.path.join(SCHEMAS_DIR_PATH, "music-database.jadn")) as file:
+        schema_data = json.load(file)
+    with open(os.path.join(DATA_DIR_PATH, "music_library.json")) as file:
+        data = json.load(file)
+
+    barcode = next(iter(data))
+    variants = [data]
+    for field, value in [('album_title', 5), ('total_tracks', True), ('cover_art', None), ('extra', 1)]:
+        variant = copy.deepcopy(data)
+        variant[barcode][field] = value
+        variants.append(variant)
+    variant = copy.deepcopy(data)
+    variant['123'] = data[barcode]
+    variants.append(variant)
+    variant = copy.deepcopy(data)
+    del variant[barcode]['album_artist']
+    variants.append(variant)
+
+    def verdict(validate, variant):
+        try:
+            validate(variant)
+            return True
+        except ValueError:
+            return False
+
+    plan = ValidationPlan(schema_data)
+    for variant in variants:
+        expected = verdict(lambda d: jadnvalidation.DataValidation(schema_data, "Library", d, "json").validate(), variant)
+        assert verdict(lambda d: plan.validate(d, "Library"), variant) == expected
+
+############# TESTING: root dispatch index #############
+def test_root_index_candidates():
+    with open(os.path.join(SCHEMAS_DIR_PATH, "oscal-ssp.jadn")) as file:
+        schema_data = json.load(file)
+
+    root_index = RootIndex(schema_data, ["Root", "System-security-plan"])
+
+    assert root_index.candidates({"system-security-plan": {}}) == ["Root"]
+    assert root_index.candidates({"uuid": "x", "metadata": {}, "import-profile": {}, "system-characteristics": {},
+                                  "system-implementation": {}, "control-implementation": {}}) == ["System-security-plan"]
+    assert root_index.candidates({"unknown": 1}) == []
+    assert root_index.candidates([]) == []
+
+    # Id keyed Maps are keyed by field id, anyOf / oneOf Choices hold a bare value of any kind
+    schema_data = {"meta": {"package": "http://example.com/roots", "roots": ["Ids", "Any", "Named"]}, "types": [
+        ["Ids", "Map", ["="], "", [[1, "a", "String", ["[0"], ""], [2, "b", "Integer", ["[0"], ""]]],
+        ["Any", "Choice", ["CO"], "", [[1, "s", "String", [], ""], [2, "n", "Integer", [], ""]]],
+        ["Named", "Record", [], "", [[1, "x", "String", [], ""]]]
+    ]}
+    root_index = RootIndex(schema_data, schema_data['meta']['roots'])
+    assert root_index.candidates({"1": "x"}) == ["Ids", "Any"]
+    assert root_index.candidates("hello") == ["Any"] and root_index.candidates(5) == ["Any"]
+    assert root_index.candidates({"x": "y"}) == ["Any", "Named"]
+    entry = api.load_schema(schema_data)
+    assert api.match_root(entry, {"1": "x"}) == "Ids" and api.match_root(entry, "hello") == "Any"
+
+def test_data_v_root_override():
+    data_validation = CliDataValidation("music-database.jadn", "music_library.json")
+    data_validation.validate()
+    assert data_validation.matched_root == "Library"
+
+    data_validation = CliDataValidation("music-database.jadn", "music_library.json", root="Album")
+    try:
+        data_validation.validate()
+        assert False, "data should not validate against Album"
+    except ValueError as e:
+        assert "Data Invalid" in str(e)
+
+############# TESTING: incremental XML data validation #############
+XML_TEST_SCHEMA = {
+    "meta": {"package": "http://example.com/catalog", "roots": ["Catalog", "Names"]},
+    "types": [
+        ["Catalog", "Record", [], "", [
+            [1, "name", "String", [], ""],
+            [2, "count", "Integer", ["[0"], ""],
+            [3, "entry", "Entry", [], ""]
+        ]],
+        ["Entry", "Record", [], "", [[1, "id", "Integer", [], ""]]],
+        ["Names", "ArrayOf", ["*String", "{1"], ""]
+    ]
+}
+
+def test_xml_stream_validation(tmp_path):
+    valid_xml = tmp_path / "catalog.xml"
+    valid_xml.write_text("<Catalog>\n  <name>test</name>\n  <count>3</count>\n  <entry><id>1</id></entry>\n</Catalog>")
+    results = list(XmlStreamValidation(XML_TEST_SCHEMA, str(valid_xml), ["Catalog", "Names"]).validate())
+    assert [line for line, _, _ in results] == [2, 3, 4]
+    assert all(is_valid for _, is_valid, _ in results)
+
+    invalid_xml = tmp_path / "invalid.xml"
+    invalid_xml.write_text("<Catalog>\n  <count>x</count>\n  <other>1</other>\n</Catalog>")
+    errors = [(line, error) for line, is_valid, error in XmlStreamValidation(XML_TEST_SCHEMA, str(invalid_xml), ["Catalog"]).validate() if not is_valid]
+    assert [line for line, _ in errors] == [2, 3, 4, 4]
+    assert errors[0][1].startswith("column 3, <count>:")
+    assert "Field 'name' is missing" in errors[2][1]
+
+    names_xml = tmp_path / "names.xml"
+    names_xml.write_text("<Names><item>a</item><item>b</item></Names>")
+    xml_validation = XmlStreamValidation(XML_TEST_SCHEMA, str(names_xml), ["Catalog", "Names"])
+    assert all(is_valid for _, is_valid, _ in xml_validation.validate())
+    assert xml_validation.matched_root == "Names"
+
+    broken_xml = tmp_path / "broken.xml"
+    broken_xml.write_text("<Names><item>a</item>")
+    results = list(XmlStreamValidation(XML_TEST_SCHEMA, str(broken_xml), ["Names"]).validate())
+    assert results[-1][1] is False and "Failed to parse XML" in results[-1][2]
+
+############# TESTING COMMAND: startup [module ...] #############
+def test_do_startup():
+    cli = JadnCLI()
+    cli.do_clear_log('')
+
+    cli.do_startup("texttable --runs 1")
+
+    assert cli.error_list == []
+
+def test_startup_imports_are_lazy():
+    result = measure_import_time("jadn_cli")
+    assert result['error'] is None
+
+    # The CLI module itself must not pull in the heavy libraries, the commands load them
+    loaded = subprocess.run([sys.executable, "-c", "import sys, jadn_cli; print(' '.join(sys.modules))"],
+                            capture_output=True, text=True).stdout.split()
+    for module_name in ["pandas", "jadn", "jadnschema", "jadnvalidation", "jadnxml", "jadnutils"]:
+        assert module_name not in loaded
+
+def test_bench(tmp_path):
+    assert api.validate_schema(make_synthetic_schema(300, seed=1))['valid']
+    assert make_synthetic_schema(50, seed=2) == make_synthetic_schema(50, seed=2)
+
+    # Workloads without a data file get valid records generated from their schema
+    workload = load_workload("synthetic-1k", records=3)
+    assert len(workload['data']) == 3 and workload['data'] == load_workload("synthetic-1k", records=3)['data']
+    assert all(api.validate_data(workload['schema'], data)['valid'] for data in workload['data'])
+    assert load_workload("synthetic-1k", with_data=False)['data'] is None
+
+    benchmark = Benchmark(["music"], ["schema_v", "schema_t:jidl", "data_c"], runs=1, records=10)
+    report = benchmark.run()
+    assert [result['case'] for result in report['results']] == ["schema_v", "schema_t:jidl", "data_c:compact", "data_c:concise"]
+    assert all(result['error'] is None and result['median_s'] > 0 and result['peak_kb'] for result in report['results'])
+
+    baseline = copy.deepcopy(report)
+    baseline['results'][0]['median_s'] = report['results'][0]['median_s'] / 2
+    baseline['results'][2]['records'] = 5
+    rows = compare_reports(report, baseline)
+    assert [row['status'] for row in rows][:3] == ["regression", "ok", "improvement"]
+
+    cli = JadnCLI()
+    cli.do_bench(f"music --cases schema_v --runs 1 --no-memory --save {tmp_path / 'bench.json'}")
+    assert cli.error_list == []
+    with open(tmp_path / 'bench.json') as file:
+        assert json.load(file)['results'][0]['case'] == "schema_v"
+
+def test_profile(tmp_path):
+    profiler = CommandProfiler("schema_v", "music-database.jadn", top=5, trace_memory=True, output_dir=str(tmp_path))
+    with profiler:
+        JadnCLI().do_schema_v("music-database.jadn")
+    assert pstats.Stats(profiler.stats_path).total_calls > 0
+    with open(profiler.summary_path) as file:
+        summary = file.read()
+    assert "cumulative" in summary and "do_schema_v" in summary and "Peak traced memory" in summary
+
+    cli = JadnCLI()
+    cli.onecmd("profile on --top 5")
+    assert cli.profiling and cli.profile_top == 5
+    before = set(glob.glob(os.path.join(OUTPUT_DIR_PATH, "profiles", "schema_v_*.pstats")))
+    cli.onecmd("schema_v music-database.jadn")
+    assert len(set(glob.glob(os.path.join(OUTPUT_DIR_PATH, "profiles", "schema_v_*.pstats"))) - before) == 1
+    cli.onecmd("profile off")
+    assert not cli.profiling and cli.error_list == []
+
+def test_metrics(tmp_path):
+    # Off, span hands back the same no-op context manager every time
+    assert span("parse") is span("conversion")
+
+    with open(os.path.join(SCHEMAS_DIR_PATH, "music-database.jadn"), 'r') as file:
+        entry = api.load_schema(file.read())
+    with open(os.path.join(DATA_DIR_PATH, "music_library.json"), 'r') as file:
+        raw = file.read()
+    with SpanRecorder(True) as recorder:
+        api.match_root(entry, api.decode_data(raw))
+        results = run_jobs(api.convert_data, [(entry, api.decode_data(raw))], 1)
+    assert {"parse", "root_selection", "data_validation", "conversion"} <= set(recorder.spans)
+    assert results[0]['spans']['conversion']['count'] == 1 and recorder.spans['conversion'][0] == 1
+
+    settings = {'enabled': True, 'file': str(tmp_path / "metrics.jsonl"), 'prometheus_file': str(tmp_path / "jadn_cli.prom")}
+    cli = JadnCLI()
+    for _ in range(2):
+        metrics = CommandMetrics("data_v", "music-database.jadn music_library.json", settings)
+        with metrics:
+            cli.do_data_v("music-database.jadn music_library.json")
+    with open(settings['file']) as file:
+        records = [json.loads(line) for line in file]
+    assert len(records) == 2 and records[0]['schema'] == "music-database.jadn" and "data_validation" in records[0]['spans']
+    with open(settings['prometheus_file']) as file:
+        prometheus = file.read()
+    assert 'jadn_cli_command_runs_total{command="data_v",schema="music-database.jadn",status="ok"} 2' in prometheus
+    assert 'jadn_cli_stage_seconds{command="data_v",schema="music-database.jadn",stage="data_validation"}' in prometheus
+
+    # Counters stay exact past 6 digits
+    runs = 'jadn_cli_command_runs_total{command="data_v",schema="music-database.jadn",status="ok"}'
+    with open(settings['prometheus_file'], 'w') as file:
+        file.write(f"{runs} 999999\n")
+    write_prometheus_textfile(settings['prometheus_file'], records[-1])
+    with open(settings['prometheus_file']) as file:
+        prometheus = file.read()
+    assert f"{runs} 1000000\n" in prometheus and 'stage="data_validation"} 1.0\n' in prometheus
+    assert os.path.exists(settings['prometheus_file'] + ".lock")
+
+############# TESTING: configuration #############
+def test_config_loaded_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config_file = tmp_path / "config.toml"
+    config_file.write_text('use_prompts = false\ncache_max_mb = 8\n\n[performance]\njobs = 2\n')
+
+    assert read_config() is read_config()
+    performance_config = get_performance_config()
+    assert performance_config.jobs == 2
+    assert performance_config.cache_max_mb == 8 # older top level keys still apply
+    assert performance_config.json_backend == "json"
+
+    # Only a changed file is re-read
+    config_file.write_text('use_prompts = false\n\n[performance]\njobs = 3\nstream_chunk_kb = 0\n')
+    os.utime(config_file, ns=(config_file.stat().st_mtime_ns + 10**9,) * 2)
+    assert get_performance_config().jobs == 3
+    assert get_performance_config().stream_chunk_kb == 64 # invalid, default kept
+
+    monkeypatch.setenv("JADN_CLI_JOBS", "5")
+    monkeypatch.setenv("JADN_CLI_USE_PROMPTS", "true")
+    assert get_performance_config().jobs == 5
+    assert get_config_value("use_prompts") is True
+
+def test_do_config():
+    cli = JadnCLI()
+    cli.do_clear_log('')
+
+    cli.do_config('')
+
+    assert cli.error_list == []
+
+############# TESTING: directory catalog #############
+def test_dir_catalog(tmp_path):
+    for name in ["b.json", "a.json", "c.jadn", ".hidden.json", "nested/d.json", "nested/deeper/e.json"]:
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text("{}")
+
+    catalog = DirCatalog(str(tmp_path))
+    assert catalog.files() == ["a.json", "b.json", "c.jadn"]
+    assert catalog.files(("json",)) == ["a.json", "b.json"]
+    assert catalog.exists("c.jadn") and not catalog.exists("nested")
+
+    # Unchanged directories are not rescanned, an added file is picked up
+    catalog.files(("jadn",))
+    assert catalog.scans == 1
+    (tmp_path / "0.json").write_text("{}")
+    assert catalog.files(("json",)) == ["0.json", "a.json", "b.json"]
+    assert catalog.scans == 2
+
+    recursive_catalog = DirCatalog(str(tmp_path), recursive=True)
+    assert recursive_catalog.files(pattern="**/*.json") == ["0.json", "a.json", "b.json", "nested/d.json", "nested/deeper/e.json"]
+    assert recursive_catalog.files(pattern="nested/*.json") == ["nested/d.json"]
+    assert recursive_catalog.files(pattern="[ab].json") == ["a.json", "b.json"]
+
+############# TESTING COMMAND: watch #############
+
+def test_polling_watcher(tmp_path):
+    (tmp_path / "a.json").write_text("{}")
+    watcher = PollingWatcher([str(tmp_path)], poll_interval=0.01)
+    assert wait_for_changes(watcher, 0.01, timeout=0.01) == set()
+
+    (tmp_path / "a.json").write_text('{"a": 1}')
+    (tmp_path / "b.json").write_text("{}")
+    assert wait_for_changes(watcher, 0.01) == {str(tmp_path / "a.json"), str(tmp_path / "b.json")}
+
+    (tmp_path / "b.json").unlink()
+    assert wait_for_changes(watcher, 0.01) == {str(tmp_path / "b.json")}
+
+def test_watch_process():
+    watch = CliWatch("jidl")
+    watch.bindings = {"music-database.jadn": ["music_library.json"]}
+
+    results = watch.process([os.path.join(SCHEMAS_DIR_PATH, "music-database.jadn")])
+    assert [(result['action'], result['filename']) for result in results] == [
+        ("schema_v", "music-database.jadn"), ("schema_t", "music-database.jidl"), ("data_v", "music_library.json")]
+    assert all(result['ok'] for result in results)
+
+    # A data file change only revalidates that file, an unbound file is ignored
+    results = watch.process([os.path.join(DATA_DIR_PATH, "music_library.json"), os.path.join(DATA_DIR_PATH, "music_library.cbor")])
+    assert [(result['action'], result['schema']) for result in results] == [("data_v", "music-database.jadn")]
+
+def test_do_watch_once():
+    cli = JadnCLI()
+    cli.do_clear_log('')
+
+    cli.do_watch("--formats jidl --once")
+
+    assert cli.error_list == []
+
+############# TESTING COMMAND: serve #############
+
+def test_serve(tmp_path):
+    cli = JadnCLI()
+    token_file = tmp_path / "serve.token"
+    server = create_server(cli, socket_path=str(tmp_path / "jadn.sock"), token_file=str(token_file))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    assert stat.S_IMODE(os.stat(token_file).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(tmp_path / "jadn.sock").st_mode) == 0o600
+
+    client = ServeClient(str(tmp_path / "jadn.sock"), token=token_file.read_text())
+    try:
+        with open(os.path.join(DATA_DIR_PATH, "music_library.json")) as file:
+            data = json.load(file)
+
+        status, response = client.request("/validate", {'schema': "music-database.jadn", 'data': data})
+        assert status == 200 and response['valid'] and response['root'] == "Library"
+
+        status, response = client.request("/validate", {'schema': "music-database.jadn", 'data': {"x": 1}})
+        assert status == 200 and not response['valid'] and response['error']
+
+        status, response = client.request("/command", {'command': "schema_v", 'args': "music-database.jadn", 'cwd': os.getcwd()})
+        assert status == 200 and "is valid" in response['output'] and response['errors'] == []
+
+        # The errors of a command are returned, not kept by the long running server
+        status, response = client.request("/command", {'command': "data_v", 'args': "music-database.jadn music_library.json --root Nope"})
+        assert status == 200 and len(response['errors']) == 1 and cli.error_list == []
+
+        status, response = client.request("/command", {'command': "watch", 'args': ""})
+        assert status == 400
+
+        status, response = client.request("/command", {'command': "view_file", 'args': "data music_library.json"})
+        assert status == 400
+
+        status, response = client.request("/status")
+        assert response['requests'] == 6
+    finally:
+        client.close()
+
+    # A cross-site form can only POST text/plain, a request without the token or for another Host is refused
+    body = json.dumps({'command': "schema_v", 'args': "music-database.jadn"})
+    requests = [({'Content-Type': "text/plain", TOKEN_HEADER: server.token}, 415),
+                ({'Content-Type': "application/json"}, 401),
+                ({'Content-Type': "application/json", TOKEN_HEADER: server.token, 'Host': "attacker.example"}, 403)]
+    try:
+        for headers, expected in requests:
+            connection = UnixHTTPConnection(str(tmp_path / "jadn.sock"), timeout=5)
+            connection.request("POST", "/command", body, headers)
+            response = connection.getresponse()
+            assert response.status == expected and json.loads(response.read())['error']
+            connection.close()
+        assert server.requests == 6
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert not token_file.exists()
+
+############# TESTING: in-memory API #############
+
+def test_api_in_memory():
+    with open(os.path.join(SCHEMAS_DIR_PATH, "music-database.jadn"), 'rb') as file:
+        schema_bytes = file.read()
+    with open(os.path.join(DATA_DIR_PATH, "music_library.json"), 'rb') as file:
+        data_bytes = file.read()
+
+    schema_result = api.validate_schema(schema_bytes)
+    assert schema_result['valid'] and schema_result['error'] is None
+    schema = schema_result['schema']
+    assert api.load_schema(json.loads(schema_bytes)) is not schema # keyed by content, the dict is serialized differently
+    assert api.load_schema(schema_bytes) is schema
+
+    result = api.validate_data(schema, data_bytes)
+    assert result['valid'] and result['root'] == "Library"
+    assert set(result['timings']) == {'load', 'meta_validate', 'parse', 'validate'}
+
+    result = api.validate_data(schema, {"x": 1})
+    assert not result['valid'] and result['error_type'] == "ValueError"
+
+    result = api.validate_data(schema, b"{not json")
+    assert not result['valid'] and result['error'].startswith("Failed to parse data as JSON")
+
+    converted = api.convert_data(schema, data_bytes, "compact")['converted']
+    assert converted["012345678912"][0] == ["John Michael Stipe", "vocals"]
+    assert converted == api.transcode_data(schema, data_bytes, "verbose", "compact")['converted']
+    result = api.convert_data(schema, {"x": 1}, "compact")
+    assert result['converted'] is None and result['error'].startswith("Data Invalid")
+    result = api.validate_data(schema, cbor2.dumps(json.loads(data_bytes)), "cbor")
+    assert result['valid']
+
+    result = api.translate_schema(schema, "jidl", force=True)
+    assert result['converted'] and not result['cached'] and result['error'] is None
+
+    with open(os.path.join(SCHEMAS_DIR_PATH, "music-database.jidl"), 'rb') as file:
+        result = api.reverse_translate_schema(file.read(), "jidl")
+    assert result['converted'] and result['error'] is None
+
+    assert api.validate_schema(b'{"types": 1}')['valid'] is False
+
+def test_api_off_disk(tmp_path, monkeypatch, capsys, caplog):
+    caplog.set_level(logging.WARNING)
+    with open(os.path.join(SCHEMAS_DIR_PATH, "music-database.jadn"), 'r') as file:
+        schema_data = json.load(file)
+    with open(os.path.join(DATA_DIR_PATH, "music_library.json"), 'rb') as file:
+        data_bytes = file.read()
+    # A schema not seen by the other tests, with a type definition translation fixes up
+    schema_data['meta']['title'] = "Music Library off disk"
+    schema_data['types'].append(["Label", "String", [], ""])
+
+    # No config.toml, the caches default to ./.jadn_cache
+    monkeypatch.chdir(tmp_path)
+    schema = json.dumps(schema_data)
+    assert api.validate_schema(schema)['valid']
+    assert api.validate_data(schema, data_bytes)['valid']
+    result = api.translate_schema(schema, "jidl")
+    assert result['converted'] and not result['cached']
+    assert capsys.readouterr().out == "" and os.listdir(tmp_path) == []
+    assert "Config file" in caplog.text and "Fixed malformed type definition 'Label'" in caplog.text
+
+    api.translate_schema(schema, "jidl", cache=True)
+    assert api.translate_schema(schema, "jidl", cache=True)['cached']
+
+############# TESTING: stdin / stdout pipelines #############
+
+def run_cli(args, stdin_data):
+    return subprocess.run([sys.executable, "jadn_cli.py"] + args + ["--local"], input=stdin_data, capture_output=True)
+
+def test_stdin_stdout_pipeline():
+    with open(os.path.join(SCHEMAS_DIR_PATH, "music-database.jadn"), 'rb') as file:
+        schema_bytes = file.read()
+    with open(os.path.join(DATA_DIR_PATH, "music_library.json"), 'rb') as file:
+        data_bytes = file.read()
+
+    result = run_cli(["data_v", "music-database.jadn", "-", "--stdout"], data_bytes)
+    assert result.returncode == 0
+    assert json.loads(result.stdout) == {'data': "-", 'schema': "music-database.jadn", 'valid': True, 'root': "Library", 'error': None}
+
+    result = run_cli(["data_v", "music-database.jadn", "-", "--stdout"], b'{"x": 1}')
+    assert result.returncode == 1 and json.loads(result.stdout)['valid'] is False
+
+    # Only the translation reaches stdout, the status messages go to stderr
+    result = run_cli(["schema_t", "-", "jidl", "--stdout"], schema_bytes)
+    assert result.returncode == 0
+    assert result.stdout.decode().lstrip().startswith('title: "Music Library"')
+    assert b"converted" in result.stderr
+
+    result = run_cli(["data_v", "-", "-"], b"")
+    assert result.returncode == 1